@@ -0,0 +1,267 @@
+"""Firebase ID-token authentication for private endpoints.
+
+Private routes depend on ``current_user_id``, which reads
+``Authorization: Bearer <firebase_id_token>``, verifies the token and returns
+its ``sub`` claim. Failures raise ``AuthError``, rendered by ``main`` as a 401
+error envelope.
+
+Verifying a Firebase ID token means checking an RS256 signature against one
+of Google's rotating signing keys, plus the ``aud``/``iss``/``exp`` claims.
+Done naively, every request pays for a key-set fetch (or a cache
+revalidation), for parsing the x509 certificates, and for the RSA check.
+Two caches remove almost all of that:
+
+- ``SigningKeys`` holds Google's keys as parsed public keys until the
+  ``Cache-Control: max-age`` of the key-set response runs out (less its
+  ``Age``). A token signed by a key it has not seen triggers one early refetch,
+  at most once per ``AUTH_KEYS_MIN_REFRESH_SECONDS``. If a refetch fails, the
+  keys it already has stay in use.
+- ``TokenVerifier`` keeps the claims of verified tokens in a bounded LRU until
+  each token's ``exp``. An app sends the same token for up to an hour, so
+  repeat requests skip verification entirely. Entries are keyed by the
+  token's SHA-256 digest, so the cache never holds bearer credentials.
+
+A cached token is resolved on the event loop. Only a full verification runs
+on a worker thread.
+
+PyJWT (a dependency of ``firebase-admin``) does the signature and claim
+checks. It and the HTTP client are imported on first use, so importing the app
+does not pay for them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from fastapi import Request
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# x509 certificates of the keys that sign Firebase ID tokens, keyed by "kid".
+SIGNING_KEYS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+_ISSUER_PREFIX = "https://securetoken.google.com/"
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+# (headers, body) of a GET; headers keyed by lower-case name.
+Fetch = Callable[[str], tuple[Mapping[str, str], bytes]]
+
+
+class AuthError(Exception):
+    """Missing or rejected credentials; ``code`` is the API error code."""
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class SigningKeysUnavailableError(Exception):
+    """Google's signing keys could not be fetched and none are cached."""
+
+
+def _http_get(url: str) -> tuple[Mapping[str, str], bytes]:
+    import httpx
+
+    resp = httpx.get(url, timeout=Config.AUTH_KEYS_TIMEOUT_SECONDS)
+    resp.raise_for_status()
+    return {k.lower(): v for k, v in resp.headers.items()}, resp.content
+
+
+def max_age_seconds(headers: Mapping[str, str]) -> float:
+    """Remaining freshness of a response: ``max-age`` less ``Age`` (0 without max-age)."""
+    match = _MAX_AGE.search(headers.get("cache-control", ""))
+    if match is None:
+        return 0.0
+    try:
+        age = float(headers.get("age", "0"))
+    except ValueError:
+        age = 0.0
+    return max(float(match.group(1)) - age, 0.0)
+
+
+class SigningKeys:
+    """Google's token signing keys, parsed once per key-set response."""
+
+    def __init__(
+        self,
+        url: str = SIGNING_KEYS_URL,
+        fetch: Fetch | None = None,
+        min_refresh_seconds: float | None = None,
+    ) -> None:
+        self._url = url
+        self._fetch = fetch or _http_get
+        self._min_refresh_seconds = (
+            min_refresh_seconds
+            if min_refresh_seconds is not None
+            else Config.AUTH_KEYS_MIN_REFRESH_SECONDS
+        )
+        self._keys: dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._fetched_at: float | None = None
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    def get(self, kid: str) -> Any | None:
+        """Public key for ``kid``, refreshing the key set when it has expired or lacks ``kid``."""
+        now = time.monotonic()
+        if now >= self._expires_at or kid not in self._keys:
+            with self._lock:  # one refresh at a time; the others reuse its result
+                if time.monotonic() >= self._expires_at or (
+                    kid not in self._keys and self._may_refetch()
+                ):
+                    self._refresh()
+        return self._keys.get(kid)
+
+    def _may_refetch(self) -> bool:
+        return (
+            self._fetched_at is None
+            or time.monotonic() - self._fetched_at >= self._min_refresh_seconds
+        )
+
+    def _refresh(self) -> None:
+        from cryptography.x509 import load_pem_x509_certificate
+
+        self._fetched_at = time.monotonic()
+        try:
+            headers, body = self._fetch(self._url)
+            keys = {
+                kid: load_pem_x509_certificate(pem.encode()).public_key()
+                for kid, pem in json.loads(body).items()
+            }
+        except Exception as exc:
+            if not self._keys:
+                raise SigningKeysUnavailableError(str(exc)) from exc
+            # Keep verifying with the keys we have; retry after the refetch interval.
+            logger.exception("auth_signing_keys_refresh_failed")
+            self._expires_at = self._fetched_at + self._min_refresh_seconds
+            return
+        self.fetches += 1
+        self._keys = keys
+        self._expires_at = self._fetched_at + max_age_seconds(headers)
+        logger.info(
+            "auth_signing_keys_refreshed",
+            extra={"keys": len(keys), "max_age_s": round(self._expires_at - self._fetched_at)},
+        )
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenVerifier:
+    """Firebase ID-token verification with a bounded LRU of verified claims."""
+
+    def __init__(
+        self,
+        project_id: str | None = None,
+        keys: SigningKeys | None = None,
+        cache_size: int | None = None,
+    ) -> None:
+        self.project_id = project_id or Config.FIREBASE_PROJECT_ID
+        self.keys = keys or SigningKeys()
+        self._cache_size = cache_size if cache_size is not None else Config.AUTH_CLAIMS_CACHE_SIZE
+        self._claims: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cached(self, token: str) -> dict[str, Any] | None:
+        """Claims of ``token`` if it was verified before and has not expired."""
+        digest = _digest(token)
+        with self._lock:
+            claims = self._claims.get(digest)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._claims[digest]
+                return None
+            self._claims.move_to_end(digest)
+            return claims
+
+    def verify(self, token: str) -> dict[str, Any]:
+        """Claims of ``token``, verifying it unless it is cached; raises ``AuthError``."""
+        claims = self.cached(token)
+        if claims is None:
+            claims = self._decode(token)
+            if self._cache_size:
+                with self._lock:
+                    self._claims[_digest(token)] = claims
+                    while len(self._claims) > self._cache_size:
+                        self._claims.popitem(last=False)
+        return claims
+
+    def _decode(self, token: str) -> dict[str, Any]:
+        import jwt
+
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError as exc:
+            raise AuthError("TOKEN_INVALID", "Firebase token failed validation") from exc
+        key = self.keys.get(str(header.get("kid", "")))
+        if key is None:
+            raise AuthError("TOKEN_INVALID", "Firebase token signed by an unknown key")
+        try:
+            claims: dict[str, Any] = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=_ISSUER_PREFIX + self.project_id,
+                leeway=Config.AUTH_CLOCK_SKEW_SECONDS,
+                options={"require": ["exp", "iat", "aud", "iss", "sub"]},
+            )
+        except jwt.ExpiredSignatureError as exc:
+            raise AuthError("TOKEN_EXPIRED", "Firebase token has expired") from exc
+        except jwt.InvalidTokenError as exc:
+            raise AuthError("TOKEN_INVALID", "Firebase token failed validation") from exc
+        sub = claims["sub"]
+        if not isinstance(sub, str) or not sub or len(sub) > 128:
+            raise AuthError("TOKEN_INVALID", "Firebase token has no valid subject")
+        if claims.get("auth_time", 0) > time.time() + Config.AUTH_CLOCK_SKEW_SECONDS:
+            raise AuthError("TOKEN_INVALID", "Firebase token authenticated in the future")
+        return claims
+
+
+_verifier: TokenVerifier | None = None
+
+
+def get_token_verifier() -> TokenVerifier:
+    global _verifier
+    if _verifier is None:
+        _verifier = TokenVerifier()
+    return _verifier
+
+
+def set_token_verifier(verifier: TokenVerifier | None) -> None:
+    """Override token verification (for testing). ``None`` resets to a fresh default."""
+    global _verifier
+    _verifier = verifier
+
+
+def bearer_token(request: Request) -> str:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        raise AuthError("AUTH_REQUIRED", "Authorization: Bearer <firebase_id_token> is required")
+    return token.strip()
+
+
+async def current_user_id(request: Request) -> str:
+    """FastAPI dependency: the verified ``sub`` claim of the request's ID token."""
+    token = bearer_token(request)
+    verifier = get_token_verifier()
+    claims = verifier.cached(token)
+    if claims is None:
+        # Signature checks (and the occasional key fetch) stay off the event loop.
+        claims = await asyncio.to_thread(verifier.verify, token)
+    return str(claims["sub"])
@@ -0,0 +1,166 @@
+"""Auth overhead benchmark: cost of Firebase ID-token verification per request.
+
+Tokens are signed with a local test key (``tests/conftest.py``) and the key
+set is served by a fake fetch, so no network is involved. Verification runs
+at four levels of caching:
+
+- ``uncached``: the key set is re-read and its certificates re-parsed for
+  every token, then the RS256 signature and claims are checked (what a
+  verifier without a key cache does at best, with the HTTP round trip free);
+- ``keys``: parsed signing keys reused for their max-age, signature and
+  claims checked per request;
+- ``claims``: both caches, the production setup. A repeat token is a digest
+  and an LRU lookup, answered on the event loop;
+- ``none``: no verification at all, the baseline for the load test.
+
+Part 1 times one verification call per level. Part 2 drives
+``/v1/scores/me`` through the real ASGI app with ``--concurrency`` clients,
+each sending its next request as soon as the previous one returns. The
+clients rotate over ``--users`` signed-in users, each with its own token.
+Auth overhead is latency above the ``none`` baseline.
+
+Usage (from services/api_fastapi):
+
+    uv run python -m benchmarks.bench_auth
+    uv run python -m benchmarks.bench_auth --concurrency 1 32 --users 1000 --duration 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any
+
+from auth.firebase import SigningKeys, TokenVerifier, set_token_verifier
+from benchmarks.loadtest import Results, print_table
+from config import Config
+from main import app
+from serving.personal import PRESETS
+from serving.warmup import asgi_get
+from tests.conftest import (
+    FakeFirestoreClient,
+    fake_keys_fetch,
+    install_fake_client,
+    make_forecast_doc,
+    make_id_token,
+)
+
+LEVELS = ("uncached", "keys", "claims", "none")
+
+
+class _NoVerification(TokenVerifier):
+    """Trusts the ``sub`` of any token without checking it."""
+
+    def __init__(self, tokens: dict[str, str]) -> None:
+        super().__init__(cache_size=0)
+        self._claims = {token: {"sub": sub} for token, sub in tokens.items()}
+
+    def cached(self, token: str) -> dict[str, Any] | None:
+        return self._claims[token]
+
+
+def make_verifier(level: str, tokens: dict[str, str]) -> TokenVerifier:
+    if level == "none":
+        return _NoVerification(tokens)
+    max_age = "0" if level == "uncached" else "3600"
+    keys = SigningKeys(fetch=fake_keys_fetch({"cache-control": f"max-age={max_age}"}))
+    return TokenVerifier(keys=keys, cache_size=None if level == "claims" else 0)
+
+
+def bench_calls(iterations: int) -> dict[str, float]:
+    """Mean microseconds per verification call at each caching level."""
+    token = make_id_token("bench-user")
+    out = {}
+    for level in LEVELS[:3]:
+        verifier = make_verifier(level, {token: "bench-user"})
+        verifier.verify(token)  # warm: keys loaded, claims cached
+        started = time.perf_counter()
+        for _ in range(iterations):
+            if level == "claims":
+                verifier.cached(token)
+            else:
+                verifier.verify(token)
+        out[level] = (time.perf_counter() - started) / iterations * 1e6
+    return out
+
+
+def _fake_firestore(users: list[str]) -> FakeFirestoreClient:
+    presets = list(PRESETS)
+    profiles = {
+        user: {"preferences": {"preset": presets[i % len(presets)]}, "thresholds": {}}
+        for i, user in enumerate(users)
+    }
+    return FakeFirestoreClient(
+        {"forecasts": {Config.AREA_ID: make_forecast_doc()}, "users": profiles}
+    )
+
+
+async def bench_load(level: str, concurrency: int, users: int, duration_s: float) -> Results:
+    """Closed-loop requests to /v1/scores/me at one caching level."""
+    names = [f"user-{i}" for i in range(users)]
+    tokens = {make_id_token(user): user for user in names}
+    headers = [[(b"authorization", f"Bearer {token}".encode())] for token in tokens]
+    install_fake_client(_fake_firestore(names))
+    set_token_verifier(make_verifier(level, tokens))
+    results = Results()
+    try:
+        # Load every profile and the snapshot first: only auth differs between runs.
+        for h in headers:
+            await asgi_get(app, "/v1/scores/me?days=1", h)
+        deadline = time.perf_counter() + duration_s
+        turn = iter(range(1 << 62))
+
+        async def _client() -> None:
+            while time.perf_counter() < deadline:
+                h = headers[next(turn) % len(headers)]
+                started = time.perf_counter()
+                status = await asgi_get(app, "/v1/scores/me?days=1", h)
+                results.record(level, status, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_client() for _ in range(concurrency)))
+        results.duration_s = time.perf_counter() - started
+    finally:
+        set_token_verifier(None)
+        install_fake_client(None)
+    return results
+
+
+async def main(args: argparse.Namespace) -> None:
+    print("Per-call verification cost")
+    for level, us in bench_calls(args.iterations).items():
+        print(f"  {level:<9} {us:>9.1f} us")
+    print()
+    saved = Config.ADMISSION_ENABLED
+    Config.ADMISSION_ENABLED = False  # measure auth, not load shedding
+    try:
+        for concurrency in args.concurrency:
+            summary: dict[str, dict[str, Any]] = {}
+            for level in LEVELS:
+                results = await bench_load(level, concurrency, args.users, args.duration)
+                summary.update(results.summary())
+                del summary["all"]
+            print_table(f"/v1/scores/me concurrency={concurrency} users={args.users}", summary)
+            base = summary["none"]
+            for level in LEVELS[:3]:
+                row = summary[level]
+                print(
+                    f"  auth overhead {level:<9} p50 {row['p50_ms'] - base['p50_ms']:+.3f} ms  "
+                    f"p99 {row['p99_ms'] - base['p99_ms']:+.3f} ms"
+                )
+            print()
+    finally:
+        Config.ADMISSION_ENABLED = saved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    asyncio.run(main(args))
@@ -0,0 +1,95 @@
+"""Concurrency benchmark: event-loop throughput while Firestore latency spikes.
+
+Runs the real ASGI app against the fake Firestore client with injected read
+latency. A pool of workers hammers ``/v1/public/health`` (one Firestore read per
+request) while a probe loop measures ``/`` (no Firestore). If storage calls
+blocked the event loop, probe throughput would collapse as read latency grows.
+
+Usage (from services/api_fastapi):
+
+    uv run python -m benchmarks.bench_firestore_concurrency
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+from main import app
+from serving.store import ForecastStore, set_store
+from tests.conftest import FakeFirestoreClient, install_fake_client, make_forecast_doc
+
+
+async def _hammer(client: httpx.AsyncClient, path: str, stop: asyncio.Event) -> int:
+    count = 0
+    while not stop.is_set():
+        await client.get(path)
+        count += 1
+    return count
+
+
+async def _probe(client: httpx.AsyncClient, stop: asyncio.Event) -> list[float]:
+    latencies: list[float] = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def run_scenario(latency_s: float, concurrency: int, duration_s: float) -> dict[str, float]:
+    fake = FakeFirestoreClient(
+        {"forecasts": {"tel_aviv_coast": make_forecast_doc()}}, latency_s=latency_s
+    )
+    install_fake_client(fake)
+    # Disable the TTL cache so /health keeps reading Firestore (concurrent misses
+    # still coalesce into one read).
+    set_store(ForecastStore(ttl_seconds=0))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = asyncio.Event()
+        workers = [
+            asyncio.create_task(_hammer(client, "/v1/public/health", stop))
+            for _ in range(concurrency)
+        ]
+        probe = asyncio.create_task(_probe(client, stop))
+        await asyncio.sleep(duration_s)
+        stop.set()
+        health_count = sum(await asyncio.gather(*workers))
+        probe_latencies = await probe
+    install_fake_client(None)
+
+    probe_latencies.sort()
+    p95 = probe_latencies[int(len(probe_latencies) * 0.95) - 1] if probe_latencies else 0.0
+    return {
+        "latency_ms": latency_s * 1000,
+        "health_rps": health_count / duration_s,
+        "probe_rps": len(probe_latencies) / duration_s,
+        "probe_p50_ms": statistics.median(probe_latencies) * 1000 if probe_latencies else 0.0,
+        "probe_p95_ms": p95 * 1000,
+    }
+
+
+async def main(concurrency: int, duration_s: float) -> None:
+    print(f"concurrency={concurrency} duration={duration_s}s")
+    print(f"{'fs latency':>12} {'/health rps':>12} {'/ rps':>10} {'/ p50 ms':>10} {'/ p95 ms':>10}")
+    for latency_s in (0.005, 0.05, 0.5, 2.0):
+        r = await run_scenario(latency_s, concurrency, duration_s)
+        print(
+            f"{r['latency_ms']:>10.0f}ms {r['health_rps']:>12.1f} {r['probe_rps']:>10.1f} "
+            f"{r['probe_p50_ms']:>10.2f} {r['probe_p95_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    asyncio.run(main(args.concurrency, args.duration))
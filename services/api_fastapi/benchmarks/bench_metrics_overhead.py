@@ -0,0 +1,83 @@
+"""Overhead benchmark: cost of Prometheus instrumentation per request.
+
+Measures (1) the raw cost of one ``observe_request`` call, the work the
+middleware adds per request, and (2) end-to-end latency of cached
+``/v1/public/scores?days=1`` requests through the real ASGI app with
+``METRICS_ENABLED`` on and off, interleaved to cancel out drift.
+
+Usage (from services/api_fastapi):
+
+    uv run python -m benchmarks.bench_metrics_overhead
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+from config import Config
+from main import app
+from telemetry import metrics
+from tests.conftest import FakeFirestoreClient, install_fake_client, make_forecast_doc
+
+PATH = "/v1/public/scores?area_id=tel_aviv_coast&days=1"
+
+
+def bench_observe(iterations: int) -> float:
+    """Mean microseconds per observe_request call."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        metrics.observe_request("/v1/public/scores", "GET", 200, 0.004, None)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def _timed_requests(client: httpx.AsyncClient, n: int) -> list[float]:
+    latencies = []
+    for _ in range(n):
+        started = time.perf_counter()
+        await client.get(PATH)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def bench_requests(rounds: int, per_round: int) -> tuple[float, float]:
+    """Median request latency in microseconds with metrics (on, off)."""
+    install_fake_client(FakeFirestoreClient({"forecasts": {"tel_aviv_coast": make_forecast_doc()}}))
+    transport = httpx.ASGITransport(app=app)
+    on: list[float] = []
+    off: list[float] = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await _timed_requests(client, 50)  # warm the cache and the route
+        for _ in range(rounds):
+            Config.METRICS_ENABLED = True
+            on += await _timed_requests(client, per_round)
+            Config.METRICS_ENABLED = False
+            off += await _timed_requests(client, per_round)
+    Config.METRICS_ENABLED = True
+    install_fake_client(None)
+    return statistics.median(on) * 1e6, statistics.median(off) * 1e6
+
+
+async def main(iterations: int, rounds: int, per_round: int) -> None:
+    print(f"observe_request: {bench_observe(iterations):.2f} us/call ({iterations} calls)")
+    with_metrics, without = await bench_requests(rounds, per_round)
+    delta = with_metrics - without
+    print(f"GET {PATH}")
+    print(f"  median with metrics:    {with_metrics:>9.1f} us")
+    print(f"  median without metrics: {without:>9.1f} us")
+    print(f"  overhead:               {delta:>9.1f} us ({delta / without * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--per-round", type=int, default=200)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    asyncio.run(main(args.iterations, args.rounds, args.per_round))
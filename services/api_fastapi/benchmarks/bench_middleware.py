@@ -0,0 +1,119 @@
+"""Overhead benchmark: request telemetry middleware, before and after.
+
+Times in-process ASGI requests to a trivial endpoint (a 2-byte JSON body) in
+three setups:
+
+- ``bare``: the endpoint alone;
+- ``before``: the former ``@app.middleware("http")`` function, which runs on
+  ``BaseHTTPMiddleware`` and draws a ``uuid4`` per request (kept here as a
+  reference);
+- ``after``: ``telemetry.middleware.RequestTelemetryMiddleware``.
+
+The middleware do the same work: request id, request context, metrics. The
+reported overhead is the per-request time above ``bare``. Rounds of the three
+are interleaved to cancel out drift.
+
+Usage (from services/api_fastapi):
+
+    uv run python -m benchmarks.bench_middleware
+    uv run python -m benchmarks.bench_middleware --requests 20000 --rounds 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from starlette.types import ASGIApp
+
+from config import Config
+from serving.warmup import asgi_get
+from telemetry import context as request_context
+from telemetry import metrics
+from telemetry.middleware import RequestTelemetryMiddleware
+
+
+async def _endpoint(request: Request) -> Response:
+    return JSONResponse({})
+
+
+async def _before(request: Request, call_next) -> Response:  # type: ignore[no-untyped-def]
+    """The request-id middleware as it was in main.py."""
+    request_id = str(uuid.uuid4())
+    request.state.request_id = request_id
+    timing = Config.SERVER_TIMING_ENABLED or (
+        Config.SERVER_TIMING_ALLOW_HEADER and request.headers.get("x-server-timing") == "1"
+    )
+    ctx = request_context.begin(request_id, timing=timing)
+    started = time.perf_counter()
+    response: Response = await call_next(request)
+    duration_s = time.perf_counter() - started
+    endpoint = getattr(request.scope.get("route"), "path", "unmatched")
+    if Config.METRICS_ENABLED:
+        metrics.observe_request(
+            endpoint, request.method, response.status_code, duration_s, ctx.error_code
+        )
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+def build_apps() -> dict[str, ASGIApp]:
+    routes = [Route("/bench", _endpoint)]
+    return {
+        "bare": Starlette(routes=routes),
+        "before": Starlette(routes=routes, middleware=[Middleware(BaseHTTPMiddleware, _before)]),
+        "after": Starlette(routes=routes, middleware=[Middleware(RequestTelemetryMiddleware)]),
+    }
+
+
+async def _time(app: ASGIApp, requests: int) -> float:
+    """Mean microseconds per request."""
+    started = time.perf_counter()
+    for _ in range(requests):
+        await asgi_get(app, "/bench")
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def main(args: argparse.Namespace) -> None:
+    apps = build_apps()
+    for app in apps.values():
+        assert await asgi_get(app, "/bench") == 200
+        await _time(app, 500)  # warm up
+    samples: dict[str, list[float]] = {name: [] for name in apps}
+    for _ in range(args.rounds):
+        for name, app in apps.items():
+            samples[name].append(await _time(app, args.requests))
+
+    bare = statistics.median(samples["bare"])
+    print(f"{'setup':<8} {'us/request':>11} {'overhead us':>12}")
+    for name, values in samples.items():
+        median = statistics.median(values)
+        print(f"{name:<8} {median:>11.1f} {median - bare:>12.1f}")
+    print(
+        f"\nrequest ids: uuid4 {_id_cost(lambda: str(uuid.uuid4())):.2f} us, "
+        f"counter {_id_cost(request_context.new_request_id):.2f} us"
+    )
+
+
+def _id_cost(make: Callable[[], str], n: int = 100_000) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        make()
+    return (time.perf_counter() - started) / n * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="requests per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""Memory benchmark: per-worker snapshots vs one memory-mapped snapshot file.
+
+Spawns N worker processes for each N in ``--workers``. In ``private`` mode
+each worker builds its own scored snapshot and pre-renders the default rows,
+which is what every uvicorn worker does without ``SNAPSHOT_DIR``. In
+``shared`` mode each worker maps the same snapshot file and touches every
+page of it. The benchmark reports the total proportional set size (PSS) of
+all workers, minus the same total for workers that load nothing. Shared pages
+count once in that total, split across the processes that map them. Linux
+only, since it reads ``/proc/<pid>/smaps_rollup``.
+
+The forecast is synthetic, with 7 days of hours by default. ``--days``
+enlarges it to make the difference easier to see.
+
+Usage (from services/api_fastapi):
+
+    uv run python -m benchmarks.bench_shared_memory
+    uv run python -m benchmarks.bench_shared_memory --days 60 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+WORKER = """
+import sys
+from pathlib import Path
+
+def pss_kb():
+    for line in open("/proc/self/smaps_rollup"):
+        if line.startswith("Pss:"):
+            return int(line.split()[1])
+
+from serving.shared import MappedSnapshot
+from serving.snapshot import build_snapshot
+
+mode, path = sys.argv[1], Path(sys.argv[2])
+if mode == "shared":
+    mapped = MappedSnapshot(path)
+    keep = [mapped, sum(mapped._mm[i] for i in range(0, len(mapped._mm), 4096))]
+elif mode == "private":
+    snapshot = build_snapshot("bench", MappedSnapshot(path).doc())
+    keep = [snapshot, [h.model_dump_json() for h in snapshot.scored_hours]]
+print("ready", flush=True)
+sys.stdin.readline()  # wait until every worker has loaded, so shared pages are split
+print(pss_kb(), flush=True)
+"""
+
+
+def _write_file(directory: Path, days: int) -> Path:
+    from serving.shared import write_snapshot_file
+    from serving.snapshot import build_snapshot
+    from tests.conftest import make_forecast_doc
+
+    doc = make_forecast_doc(hours_count=days * 24)
+    return write_snapshot_file(directory, build_snapshot("bench", doc))
+
+
+def measure(mode: str, workers: int, path: Path) -> int:
+    """Total PSS in KiB of ``workers`` processes once each has loaded the snapshot."""
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER, mode, str(path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        assert proc.stdout is not None and proc.stdout.readline().strip() == "ready"
+    total = 0
+    for proc in procs:
+        out, _ = proc.communicate("\n")
+        total += int(out.strip())
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_file(Path(tmp), args.days)
+        print(f"snapshot file: {path.stat().st_size / 1024:.0f} KiB ({args.days * 24} hours)")
+        print(f"{'workers':>8} {'private':>12} {'shared':>12}")
+        for n in args.workers:
+            baseline = measure("none", n, path)
+            private = measure("private", n, path) - baseline
+            shared = measure("shared", n, path) - baseline
+            print(f"{n:>8} {private / 1024:>9.1f} MiB {shared / 1024:>9.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
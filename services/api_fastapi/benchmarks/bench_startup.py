@@ -0,0 +1,124 @@
+"""Startup benchmark: process start to first successful request, and import costs.
+
+The default mode launches ``uvicorn main:app`` on a free port ``--runs`` times.
+For each run it reports the time from process spawn until ``--path`` first
+answers 200. Offline by default: Firestore listeners and the warm-up phase are
+switched off, so only interpreter start, imports and app construction are
+measured. Pass ``--live`` to keep the environment as is (real Firestore,
+warm-up on) and include the whole pre-ready phase.
+
+``--imports`` profiles ``import main`` with ``python -X importtime``. It lists
+the slowest modules by cumulative time and the self time per top-level
+package, so a new eager import of a heavy SDK shows up immediately.
+
+Usage (from services/api_fastapi):
+
+    uv run python -m benchmarks.bench_startup
+    uv run python -m benchmarks.bench_startup --imports
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+OFFLINE_ENV = {"FORECAST_PUSH_UPDATES": "false", "WARMUP_ENABLED": "false", "LOG_LEVEL": "ERROR"}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _ok(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as resp:
+            return resp.status == 200
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return False
+
+
+def time_to_first_request(path: str, live: bool, timeout_s: float) -> float:
+    """Seconds from spawning uvicorn until ``path`` returns 200."""
+    port = _free_port()
+    env = dict(os.environ) if live else {**os.environ, **OFFLINE_ENV}
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "error"]
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        while time.perf_counter() - started < timeout_s:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode}")
+            if _ok(f"http://127.0.0.1:{port}{path}"):
+                return time.perf_counter() - started
+            time.sleep(0.005)
+        raise TimeoutError(f"{path} not ready after {timeout_s}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def import_profile(module: str) -> tuple[list[tuple[str, int]], dict[str, int], int]:
+    """(slowest modules by cumulative us, self us per top-level package, total us)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "LOG_LEVEL": "ERROR"},
+        check=True,
+    )
+    cumulative: list[tuple[str, int]] = []
+    per_package: dict[str, int] = defaultdict(int)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (f.strip() for f in line[len("import time:") :].split("|"))
+        name = name.strip()
+        cumulative.append((name, int(cumulative_us)))
+        per_package[name.split(".")[0]] += int(self_us)
+        total += int(self_us)
+    cumulative.sort(key=lambda item: item[1], reverse=True)
+    return cumulative, dict(per_package), total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--imports", action="store_true", help="profile import-time cost")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--live", action="store_true", help="keep Firestore and warm-up on")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    if args.imports:
+        slowest, per_package, total = import_profile(args.module)
+        print(f"import {args.module}: {total / 1000:.1f} ms total")
+        print(f"\nslowest modules (cumulative), top {args.top}:")
+        for name, us in slowest[: args.top]:
+            print(f"  {us / 1000:>8.1f} ms  {name}")
+        print(f"\nself time per top-level package, top {args.top}:")
+        ranked = sorted(per_package.items(), key=lambda item: item[1], reverse=True)
+        for name, us in ranked[: args.top]:
+            print(f"  {us / 1000:>8.1f} ms  {name}")
+        return
+
+    samples = [time_to_first_request(args.path, args.live, args.timeout) for _ in range(args.runs)]
+    ms = sorted(s * 1000 for s in samples)
+    print(f"process start -> first 200 on {args.path} ({args.runs} runs)")
+    print(f"  min {ms[0]:.0f} ms, median {statistics.median(ms):.0f} ms, max {ms[-1]:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
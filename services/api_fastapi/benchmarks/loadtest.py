@@ -0,0 +1,301 @@
+"""Offline load test: throughput and tail latency of the public endpoints.
+
+Runs the real ASGI app, including its lifespan (listeners, warm-up), against
+the fake Firestore client from ``tests/conftest.py``. Every read sleeps for
+``--firestore-ms`` on the Firestore thread pool, and each area serves a
+synthetic forecast doc of ``--hours`` hours. Requests are plain ASGI calls
+into the app (``serving.warmup.asgi_get``), with no network and no GCP
+credentials involved. An HTTP client in the same process would compete with
+the app for the CPU and inflate the numbers it measures.
+
+Two load models:
+
+- closed loop (default): ``--concurrency`` clients, each sending its next
+  request as soon as the previous one returns;
+- open loop (``--rate``): requests arrive at a fixed rate whether or not
+  earlier ones have finished, the way a burst of app opens does. Latency
+  counts from the scheduled arrival, so a backed-up server cannot hide its
+  queueing delay.
+
+Each request picks an endpoint from ``--mix`` at random (seeded). The report
+gives requests per second and p50/p95/p99 latency per endpoint, plus a count
+of non-200 responses by status.
+
+``--admission off`` disables admission control (serving/admission.py) to
+show what it bounds. ``--cache`` picks the serving-cache setup to compare:
+
+- ``push``: snapshot listeners keep every area current (production default);
+- ``ttl``: no listeners; snapshots are reused for FORECAST_CACHE_TTL_SECONDS;
+- ``none``: no listeners and no reuse, so every request reads Firestore.
+  Concurrent misses still coalesce into one read.
+
+Usage (from services/api_fastapi):
+
+    uv run python -m benchmarks.loadtest
+    uv run python -m benchmarks.loadtest --concurrency 1 16 64 --cache none --firestore-ms 50
+    uv run python -m benchmarks.loadtest --rate 2000 --duration 5 --json
+    uv run python -m benchmarks.loadtest --rate 300 600 1200 --admission off
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from config import Config
+from main import app
+from serving.admission import set_admission
+from serving.health import HealthCache, set_health_cache
+from serving.store import ForecastStore, set_store
+from serving.warmup import asgi_get
+from tests.conftest import FakeFirestoreClient, install_fake_client, make_forecast_doc
+
+ENDPOINTS = {
+    "scores": "/v1/public/scores?area_id={area_id}",
+    "forecast": "/v1/public/forecast?area_id={area_id}",
+    "health": "/v1/public/health",
+}
+DEFAULT_MIX = "scores=6,forecast=3,health=1"
+
+
+@dataclass
+class Results:
+    duration_s: float = 0.0
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, Counter[int]] = field(default_factory=lambda: defaultdict(Counter))
+
+    def record(self, endpoint: str, status: int, latency_s: float) -> None:
+        self.latencies[endpoint].append(latency_s)
+        self.statuses[endpoint][status] += 1
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        rows: dict[str, dict[str, Any]] = {}
+        for endpoint in [*sorted(self.latencies), "all"]:
+            if endpoint == "all":
+                latencies = [x for values in self.latencies.values() for x in values]
+                statuses: Counter[int] = sum(self.statuses.values(), Counter())
+            else:
+                latencies, statuses = self.latencies[endpoint], self.statuses[endpoint]
+            latencies = sorted(latencies)
+            rows[endpoint] = {
+                "requests": len(latencies),
+                "rps": len(latencies) / self.duration_s if self.duration_s else 0.0,
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+                "errors": {str(s): n for s, n in sorted(statuses.items()) if s != 200},
+            }
+        return rows
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def area_ids(count: int) -> tuple[str, ...]:
+    return (Config.AREA_ID, *(f"area_{i}" for i in range(2, count + 1)))
+
+
+def fake_firestore(areas: tuple[str, ...], hours: int, latency_s: float) -> FakeFirestoreClient:
+    """Current forecast and health docs for every area."""
+    start = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+    forecasts, health = {}, {}
+    for area_id in areas:
+        doc = make_forecast_doc(hours_count=hours, base_time=start)
+        doc["area_id"] = area_id
+        forecasts[area_id] = doc
+        health[area_id] = {
+            "area_id": area_id,
+            "updated_at_utc": doc["updated_at_utc"],
+            "ingest_status": doc["ingest_status"],
+            "hours_count": len(doc["hours"]),
+        }
+    return FakeFirestoreClient({"forecasts": forecasts, "health": health}, latency_s=latency_s)
+
+
+@contextmanager
+def configured(areas: tuple[str, ...], cache: str, admission: bool) -> Iterator[None]:
+    """Apply the area list, cache mode and admission switch to Config, restoring it afterwards."""
+    saved = {
+        "AREA_IDS": Config.AREA_IDS,
+        "FORECAST_PUSH_UPDATES": Config.FORECAST_PUSH_UPDATES,
+        "SNAPSHOT_DIR": Config.SNAPSHOT_DIR,
+        "ADMISSION_ENABLED": Config.ADMISSION_ENABLED,
+    }
+    Config.AREA_IDS = areas
+    Config.FORECAST_PUSH_UPDATES = cache == "push"
+    Config.SNAPSHOT_DIR = ""
+    Config.ADMISSION_ENABLED = admission
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+
+
+def _targets(mix: dict[str, float], areas: tuple[str, ...], seed: int) -> Iterator[tuple[str, str]]:
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    while True:
+        name = rng.choices(names, weights)[0]
+        yield name, ENDPOINTS[name].format(area_id=rng.choice(areas))
+
+
+async def _send(results: Results, name: str, url: str, started: float) -> None:
+    try:
+        status = await asgi_get(app, url)
+    except Exception:
+        status = 0  # the app raised instead of responding
+    results.record(name, status, time.perf_counter() - started)
+
+
+async def closed_loop(
+    targets: Iterator[tuple[str, str]], concurrency: int, duration_s: float
+) -> Results:
+    results = Results()
+    deadline = time.perf_counter() + duration_s
+
+    async def _client() -> None:
+        while time.perf_counter() < deadline:
+            name, url = next(targets)
+            await _send(results, name, url, time.perf_counter())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_client() for _ in range(concurrency)))
+    results.duration_s = time.perf_counter() - started
+    return results
+
+
+async def open_loop(targets: Iterator[tuple[str, str]], rate: float, duration_s: float) -> Results:
+    results = Results()
+    tasks: list[asyncio.Task[None]] = []
+    started = time.perf_counter()
+    for i in range(int(rate * duration_s)):
+        scheduled = started + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        name, url = next(targets)
+        tasks.append(asyncio.create_task(_send(results, name, url, scheduled)))
+    await asyncio.gather(*tasks)
+    results.duration_s = time.perf_counter() - started
+    return results
+
+
+async def run(
+    *,
+    concurrency: int,
+    rate: float | None,
+    duration_s: float,
+    mix: dict[str, float],
+    areas: int,
+    hours: int,
+    firestore_ms: float,
+    cache: str,
+    admission: bool = True,
+    seed: int = 0,
+) -> Results:
+    """One load-test run against a freshly started app."""
+    ids = area_ids(areas)
+    with configured(ids, cache, admission):
+        install_fake_client(fake_firestore(ids, hours, firestore_ms / 1000))
+        set_admission(None)
+        if cache == "none":
+            set_store(ForecastStore(ttl_seconds=0))
+            set_health_cache(HealthCache(ttl_seconds=0))
+        try:
+            async with app.router.lifespan_context(app):
+                targets = _targets(mix, ids, seed)
+                if rate:
+                    return await open_loop(targets, rate, duration_s)
+                return await closed_loop(targets, concurrency, duration_s)
+        finally:
+            install_fake_client(None)
+
+
+def print_table(label: str, summary: dict[str, dict[str, Any]]) -> None:
+    print(label)
+    print(
+        f"  {'endpoint':<10} {'requests':>9} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9}  errors"
+    )
+    for endpoint, row in summary.items():
+        errors = " ".join(f"{s}x{n}" for s, n in row["errors"].items()) or "-"
+        print(
+            f"  {endpoint:<10} {row['requests']:>9} {row['rps']:>9.0f} {row['p50_ms']:>9.2f} "
+            f"{row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}  {errors}"
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    loads: list[tuple[str, int, float | None]] = (
+        [(f"rate={r:g}/s", 0, r) for r in args.rate]
+        if args.rate
+        else [(f"concurrency={c}", c, None) for c in args.concurrency]
+    )
+    report = []
+    for label, concurrency, rate in loads:
+        results = await run(
+            concurrency=concurrency,
+            rate=rate,
+            duration_s=args.duration,
+            mix=args.mix,
+            areas=args.areas,
+            hours=args.hours,
+            firestore_ms=args.firestore_ms,
+            cache=args.cache,
+            admission=args.admission == "on",
+            seed=args.seed,
+        )
+        summary = results.summary()
+        report.append({"load": label, "endpoints": summary})
+        if not args.json:
+            print_table(
+                f"{label} cache={args.cache} admission={args.admission} "
+                f"firestore={args.firestore_ms:g}ms",
+                summary,
+            )
+    if args.json:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--rate", type=float, nargs="+", help="open-loop arrivals per second")
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--areas", type=int, default=1)
+    parser.add_argument("--hours", type=int, default=168)
+    parser.add_argument("--firestore-ms", type=float, default=20.0)
+    parser.add_argument("--cache", choices=("push", "ttl", "none"), default="push")
+    parser.add_argument("--admission", choices=("on", "off"), default="on")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    asyncio.run(main(args))
@@ -18,5 +18,103 @@ class Config:
     PORT: int = int(os.environ.get("PORT", "8080"))
 
     AREA_ID: str = "tel_aviv_coast"
+    # Areas served by the public endpoints; AREA_ID is the default and health-checked area
+    AREA_IDS: tuple[str, ...] = tuple(
+        a.strip() for a in os.environ.get("AREA_IDS", AREA_ID).split(",") if a.strip()
+    )
+    # Coordinates per area for sunrise/sunset tables, as "area_id:lat:lon" entries
+    AREA_LOCATIONS: str = os.environ.get("AREA_LOCATIONS", "tel_aviv_coast:32.08:34.77")
+    BATCH_MAX_AREAS: int = int(os.environ.get("BATCH_MAX_AREAS", "20"))
+    # Local days (best windows per day, daily summaries) are bucketed in this zone
+    LOCAL_TIMEZONE: str = os.environ.get("LOCAL_TIMEZONE", "Asia/Jerusalem")
     FRESHNESS_THRESHOLD_MINUTES: int = 90
     UNHEALTHY_THRESHOLD_MINUTES: int = 180
+    # Ingest runs hourly (Cloud Scheduler "0 * * * *"); a new version is expected this long
+    # after the current one
+    INGEST_INTERVAL_MINUTES: int = int(os.environ.get("INGEST_INTERVAL_MINUTES", "60"))
+
+    # Cache-Control on public responses, derived from the forecast version (serving/caching.py)
+    CACHE_CONTROL_ENABLED: bool = os.environ.get("CACHE_CONTROL_ENABLED", "true").lower() == "true"
+    CACHE_MAX_AGE_SECONDS: int = int(os.environ.get("CACHE_MAX_AGE_SECONDS", "900"))
+    CACHE_MIN_MAX_AGE_SECONDS: int = int(os.environ.get("CACHE_MIN_MAX_AGE_SECONDS", "30"))
+    CACHE_STALE_WHILE_REVALIDATE_SECONDS: int = int(
+        os.environ.get("CACHE_STALE_WHILE_REVALIDATE_SECONDS", "60")
+    )
+    # Answer non-canonical query strings with a 308 to the canonical URL instead of
+    # rewriting them in place
+    CANONICAL_QUERY_REDIRECT: bool = (
+        os.environ.get("CANONICAL_QUERY_REDIRECT", "false").lower() == "true"
+    )
+
+    # Firestore access (sync client run on a dedicated thread pool)
+    FIRESTORE_TIMEOUT_SECONDS: float = float(os.environ.get("FIRESTORE_TIMEOUT_SECONDS", "2.0"))
+    FIRESTORE_MAX_WORKERS: int = int(os.environ.get("FIRESTORE_MAX_WORKERS", "16"))
+
+    # Serving cache: how long a loaded forecast snapshot is reused before re-reading
+    FORECAST_CACHE_TTL_SECONDS: float = float(os.environ.get("FORECAST_CACHE_TTL_SECONDS", "60"))
+    # Keep the serving cache current with Firestore snapshot listeners instead of TTL polling
+    FORECAST_PUSH_UPDATES: bool = os.environ.get("FORECAST_PUSH_UPDATES", "true").lower() == "true"
+    # Recent snapshot versions kept per area as bases for /scores?since= deltas
+    FORECAST_VERSIONS_KEPT: int = int(os.environ.get("FORECAST_VERSIONS_KEPT", "4"))
+    # Projected and windowed bodies (fields/modes/reasons/format, days) kept per forecast
+    # version; least recently used are rebuilt from the cached scores on demand
+    PROJECTION_CACHE_SIZE: int = int(os.environ.get("PROJECTION_CACHE_SIZE", "32"))
+
+    # Share scored snapshots between uvicorn workers through memory-mapped files in this
+    # directory (one worker reads Firestore and writes them); empty disables sharing
+    SNAPSHOT_DIR: str = os.environ.get("SNAPSHOT_DIR", "")
+    SNAPSHOT_POLL_SECONDS: float = float(os.environ.get("SNAPSHOT_POLL_SECONDS", "1"))
+
+    # Send the default requests through the app at startup, before taking traffic
+    WARMUP_ENABLED: bool = os.environ.get("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_TIMEOUT_SECONDS: float = float(os.environ.get("WARMUP_TIMEOUT_SECONDS", "15"))
+
+    # Admission control: cap in-flight requests, shrinking the cap while event-loop lag
+    # exceeds the target; requests over the cap get a cached response or a 503
+    ADMISSION_ENABLED: bool = os.environ.get("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MIN_IN_FLIGHT: int = int(os.environ.get("ADMISSION_MIN_IN_FLIGHT", "4"))
+    ADMISSION_MAX_IN_FLIGHT: int = int(os.environ.get("ADMISSION_MAX_IN_FLIGHT", "64"))
+    ADMISSION_TARGET_LAG_MS: float = float(os.environ.get("ADMISSION_TARGET_LAG_MS", "20"))
+    ADMISSION_STALE_SECONDS: float = float(os.environ.get("ADMISSION_STALE_SECONDS", "300"))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.environ.get("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+    ADMISSION_CACHE_SIZE: int = int(os.environ.get("ADMISSION_CACHE_SIZE", "64"))
+
+    # Firebase ID tokens: verified claims are kept until the token's exp; Google's signing
+    # keys are kept for their Cache-Control max-age, refetched early for an unknown key id
+    # at most this often
+    AUTH_CLAIMS_CACHE_SIZE: int = int(os.environ.get("AUTH_CLAIMS_CACHE_SIZE", "10000"))
+    AUTH_CLOCK_SKEW_SECONDS: int = int(os.environ.get("AUTH_CLOCK_SKEW_SECONDS", "0"))
+    AUTH_KEYS_TIMEOUT_SECONDS: float = float(os.environ.get("AUTH_KEYS_TIMEOUT_SECONDS", "5"))
+    AUTH_KEYS_MIN_REFRESH_SECONDS: float = float(
+        os.environ.get("AUTH_KEYS_MIN_REFRESH_SECONDS", "60")
+    )
+
+    # Private endpoints: profiles are reused for this long (profile writes through the API
+    # invalidate them at once); personalized scores are kept per (thresholds, version)
+    PROFILE_CACHE_TTL_SECONDS: float = float(os.environ.get("PROFILE_CACHE_TTL_SECONDS", "300"))
+    PROFILE_CACHE_SIZE: int = int(os.environ.get("PROFILE_CACHE_SIZE", "10000"))
+    PERSONAL_SCORES_CACHE_SIZE: int = int(os.environ.get("PERSONAL_SCORES_CACHE_SIZE", "32"))
+
+    # /health reuses a health/{area_id} summary read for this long
+    HEALTH_CACHE_TTL_SECONDS: float = float(os.environ.get("HEALTH_CACHE_TTL_SECONDS", "10"))
+
+    # Record Prometheus request and serving metrics
+    METRICS_ENABLED: bool = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    # Serve them on /metrics (off by default: this is the public API); with METRICS_TOKEN
+    # set, scrapes must send it as "Authorization: Bearer <token>"
+    METRICS_ENDPOINT_ENABLED: bool = (
+        os.environ.get("METRICS_ENDPOINT_ENABLED", "false").lower() == "true"
+    )
+    METRICS_TOKEN: str = os.environ.get("METRICS_TOKEN", "")
+
+    # Server-Timing header with per-stage durations: always, or per request via X-Server-Timing: 1
+    # (off by default: any caller could read internal timings and add api_request log lines)
+    SERVER_TIMING_ENABLED: bool = os.environ.get("SERVER_TIMING_ENABLED", "false").lower() == "true"
+    SERVER_TIMING_ALLOW_HEADER: bool = (
+        os.environ.get("SERVER_TIMING_ALLOW_HEADER", "false").lower() == "true"
+    )
+
+    # Server-Sent Events stream of score updates
+    SSE_HEARTBEAT_SECONDS: float = float(os.environ.get("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_BUFFER_SIZE: int = int(os.environ.get("SSE_BUFFER_SIZE", "4"))
+    SSE_MAX_STREAM_SECONDS: float = float(os.environ.get("SSE_MAX_STREAM_SECONDS", "900"))
@@ -2,48 +2,142 @@
 
 from __future__ import annotations
 
+import hmac
 import logging
-import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from auth.firebase import AuthError, SigningKeysUnavailableError
 from config import Config
+from models.schemas import ErrorDetail, ErrorResponse
+from routers.private import router as private_router
 from routers.public import router as public_router
-
-logging.basicConfig(
-    level=getattr(logging, Config.LOG_LEVEL),
-    format="%(message)s",
-)
+from serving.admission import AdmissionMiddleware, get_admission
+from serving.caching import CanonicalQueryMiddleware
+from serving.shared import SharedSnapshots, set_shared
+from serving.store import get_store
+from serving.sun import get_sun_tables
+from serving.warmup import warm_up
+from storage.firestore import FirestoreTimeoutError
+from telemetry import context as request_context
+from telemetry import logs, metrics
+from telemetry.middleware import RequestTelemetryMiddleware
+
+logs.configure(Config.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    get_sun_tables()  # sunrise/sunset for a year of dates per area, used by scoring
+    get_admission().start()
+    shared = None
+    if Config.SNAPSHOT_DIR:
+        shared = SharedSnapshots(
+            Path(Config.SNAPSHOT_DIR), Config.AREA_IDS, Config.SNAPSHOT_POLL_SECONDS
+        )
+        set_shared(shared)
+        shared.start()
+    elif Config.FORECAST_PUSH_UPDATES:
+        for area_id in Config.AREA_IDS:
+            try:
+                get_store().subscribe(area_id)
+            except Exception:
+                # Serving still works from the TTL cache; only freshness suffers.
+                logger.exception("forecast_listener_failed", extra={"area_id": area_id})
+    if Config.WARMUP_ENABLED:
+        await warm_up(app, Config.AREA_IDS)
+    if shared is not None:
+        # A leader has its first files on disk before it takes traffic.
+        await shared.flush()
+    yield
+    get_admission().close()
+    if shared is not None:
+        shared.close()
+        set_shared(None)
+    else:
+        get_store().close()
+
+
 app = FastAPI(
     title="Go Now API",
     version="1.0.0",
     description="Outdoor activity scoring API. Wave, weather, UV, AQI, rain -> 0-100 scores.",
+    lifespan=lifespan,
 )
 
+# Innermost: shed responses still get CORS headers, a request id and metrics.
+app.add_middleware(AdmissionMiddleware)
+# Equivalent queries reach the admission cache (and any fronting cache) under one key.
+app.add_middleware(CanonicalQueryMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=Config.CORS_ALLOWED_ORIGINS,
     allow_credentials=False,
-    allow_methods=["GET", "OPTIONS"],
-    allow_headers=["Content-Type"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+    allow_headers=[
+        "Authorization",
+        "Content-Type",
+        "Last-Event-ID",
+        *(["X-Server-Timing"] if Config.SERVER_TIMING_ALLOW_HEADER else []),
+    ],
+    expose_headers=["X-Request-ID", "Server-Timing"],
     max_age=3600,
 )
 
-
-@app.middleware("http")
-async def add_request_id(request: Request, call_next) -> Response:  # type: ignore[no-untyped-def]
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-    response: Response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    return response
+# Outermost: every response, CORS preflights and shed requests included, gets a
+# request id and is counted.
+app.add_middleware(RequestTelemetryMiddleware)
+
+
+@app.exception_handler(FirestoreTimeoutError)
+async def firestore_timeout_handler(request: Request, exc: FirestoreTimeoutError) -> JSONResponse:
+    request_context.note_error("UPSTREAM_TIMEOUT")
+    logger.warning(
+        "firestore_deadline_exceeded",
+        extra={"op": exc.op, "collection": exc.collection, "path": request.url.path},
+    )
+    body = ErrorResponse(
+        error=ErrorDetail(
+            code="UPSTREAM_TIMEOUT", message="Forecast store did not respond in time"
+        ),
+        request_id=request_context.request_id(),
+    )
+    return JSONResponse(status_code=503, content=body.model_dump())
+
+
+@app.exception_handler(AuthError)
+async def auth_error_handler(request: Request, exc: AuthError) -> JSONResponse:
+    request_context.note_error(exc.code)
+    body = ErrorResponse(
+        error=ErrorDetail(code=exc.code, message=exc.message),
+        request_id=request_context.request_id(),
+    )
+    return JSONResponse(
+        status_code=401, content=body.model_dump(), headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+@app.exception_handler(SigningKeysUnavailableError)
+async def signing_keys_handler(request: Request, exc: SigningKeysUnavailableError) -> JSONResponse:
+    request_context.note_error("AUTH_UNAVAILABLE")
+    logger.warning("auth_signing_keys_unavailable", extra={"error": str(exc)})
+    body = ErrorResponse(
+        error=ErrorDetail(code="AUTH_UNAVAILABLE", message="Token signing keys are unavailable"),
+        request_id=request_context.request_id(),
+    )
+    return JSONResponse(status_code=503, content=body.model_dump())
 
 
 app.include_router(public_router)
+app.include_router(private_router)
 
 
 @app.get("/")
@@ -51,6 +145,19 @@ async def root() -> dict[str, str]:
     return {"service": "go-now-api", "version": "1.0.0"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request) -> Response:
+    if not (Config.METRICS_ENABLED and Config.METRICS_ENDPOINT_ENABLED):
+        return Response(status_code=404)
+    expected = f"Bearer {Config.METRICS_TOKEN}".encode()
+    if Config.METRICS_TOKEN and not hmac.compare_digest(
+        request.headers.get("authorization", "").encode(), expected
+    ):
+        return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -97,6 +97,80 @@ class ScoredForecastResponse(BaseModel):
     daily: list[DailySunTimeResponse] = []
 
 
+class ScoresDeltaResponse(BaseModel):
+    """Scored hours that changed between two forecast versions."""
+
+    area_id: str
+    updated_at_utc: str
+    since_updated_at_utc: str
+    scoring_version: str
+    hours: list[ScoredHourResponse]  # changed or newly added hours
+    dropped_hours: list[str]  # hour_utc values no longer in the forecast
+    daily: list[DailySunTimeResponse] = []
+
+
+class ScoresVersionResponse(BaseModel):
+    area_id: str
+    updated_at_utc: str
+    scoring_version: str
+
+
+class WindowResponse(BaseModel):
+    start_utc: str
+    end_utc: str  # exclusive: start of the first hour after the window
+    duration_minutes: int
+    avg_score: int
+    peak_score: int
+    label: str
+
+
+class DayWindowsResponse(BaseModel):
+    date: str  # local date, LOCAL_TIMEZONE
+    best: WindowResponse
+    backup: WindowResponse | None = None
+
+
+class ModeWindowsResponse(BaseModel):
+    windows: list[WindowResponse]
+    days: list[DayWindowsResponse]
+
+
+class WindowsResponse(BaseModel):
+    area_id: str
+    updated_at_utc: str
+    freshness: str
+    scoring_version: str
+    min_minutes: int
+    min_score: int
+    modes: dict[str, ModeWindowsResponse]
+
+
+class DayModeSummaryResponse(BaseModel):
+    max_score: int
+    min_score: int
+    label: str  # label of max_score
+    best_hour_utc: str  # first hour reaching max_score
+    daylight_mean_score: int | None  # None when the day has no daylight hours in the horizon
+    gated_hours: int
+
+
+class LocalDaySummaryResponse(BaseModel):
+    date: str  # local date, LOCAL_TIMEZONE
+    hours_count: int
+    sunrise_utc: str
+    sunset_utc: str
+    modes: dict[str, DayModeSummaryResponse]
+
+
+class DailySummaryResponse(BaseModel):
+    area_id: str
+    updated_at_utc: str
+    freshness: str
+    scoring_version: str
+    timezone: str
+    days: list[LocalDaySummaryResponse]
+
+
 class ErrorDetail(BaseModel):
     code: str
     message: str
@@ -106,3 +180,8 @@ class ErrorDetail(BaseModel):
 class ErrorResponse(BaseModel):
     error: ErrorDetail
     request_id: str
+
+
+class BatchAreaErrorResponse(BaseModel):
+    area_id: str
+    error: ErrorDetail
@@ -0,0 +1,41 @@
+"""Helpers shared by the public and private routers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+
+from fastapi.responses import JSONResponse
+
+from config import Config
+from models.schemas import ErrorDetail, ErrorResponse
+from telemetry import context as request_context
+from telemetry import metrics
+
+SCORING_VERSION = "score_v2"
+
+
+def compute_freshness(updated_at_utc: str) -> tuple[int, str]:
+    """Compute forecast age in minutes and freshness label."""
+    updated = datetime.fromisoformat(updated_at_utc.replace("Z", "+00:00"))
+    now = datetime.now(UTC)
+    age_minutes = int((now - updated).total_seconds() / 60)
+    freshness = "fresh" if age_minutes < Config.FRESHNESS_THRESHOLD_MINUTES else "stale"
+    return age_minutes, freshness
+
+
+def error_response(status_code: int, code: str, message: str) -> JSONResponse:
+    request_context.note_error(code)
+    body = ErrorResponse(
+        error=ErrorDetail(code=code, message=message),
+        request_id=request_context.request_id(),
+    )
+    return JSONResponse(status_code=status_code, content=body.model_dump())
+
+
+@contextmanager
+def timed_encoding(fmt: str) -> Iterator[None]:
+    """Time one response encoding: serialization histogram and ``encode`` stage."""
+    with metrics.SERIALIZATION_DURATION.labels(fmt).time(), request_context.stage("encode"):
+        yield
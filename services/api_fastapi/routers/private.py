@@ -0,0 +1,116 @@
+"""Private API routes - require a Firebase ID token."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse, Response
+
+from auth.firebase import current_user_id
+from config import Config
+from models.schemas import ScoredForecastResponse
+from routers._common import SCORING_VERSION, compute_freshness, error_response, timed_encoding
+from serving.encoding import JSON
+from serving.personal import fingerprint, get_personal_scores, resolve_thresholds
+from serving.profiles import get_profile_cache, validate_profile
+from serving.store import get_store
+from telemetry import context as request_context
+
+router = APIRouter(prefix="/v1", tags=["private"])
+
+# Personalized bodies must never be stored by shared caches; the profile can
+# change at any time, so clients revalidate too.
+_PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+@router.get("/scores/me", response_model=None)
+async def get_my_scores(
+    days: int = Query(default=7, ge=1, le=7, description="Forecast horizon (1-7 days)"),
+    user_id: str = Depends(current_user_id),
+) -> JSONResponse | Response:
+    with request_context.stage("profile"):
+        profile = await get_profile_cache().get(user_id)
+    if profile is None:
+        return error_response(404, "NOT_FOUND", "Profile not found")
+
+    area_id = (profile.get("location") or {}).get("area_id") or Config.AREA_ID
+    if area_id not in Config.AREA_IDS:
+        return error_response(404, "NOT_FOUND", f"Unknown area_id: {area_id}")
+
+    with request_context.stage("cache"):
+        snapshot = await get_store().get(area_id)
+    if snapshot is None:
+        return error_response(404, "NOT_FOUND", f"No forecast data for area_id: {area_id}")
+
+    thresholds = resolve_thresholds(profile)
+    with request_context.stage("score"):
+        hours = get_personal_scores().scored_hours(snapshot, thresholds)
+    age_minutes, freshness = compute_freshness(snapshot.version)
+    model = ScoredForecastResponse(
+        area_id=area_id,
+        updated_at_utc=snapshot.version,
+        provider=snapshot.doc.get("provider", "open_meteo"),
+        freshness=freshness,
+        forecast_age_minutes=age_minutes,
+        horizon_days=snapshot.doc.get("horizon_days", 7),
+        scoring_version=SCORING_VERSION,
+        hours=hours[snapshot.window(datetime.now(UTC), days)],
+        daily=snapshot.daily,
+    )
+    with timed_encoding("json"):
+        body = model.model_dump_json()
+    return Response(
+        content=body,
+        media_type=JSON,
+        headers={
+            "Cache-Control": _PRIVATE_CACHE_CONTROL,
+            "X-Thresholds-Fingerprint": fingerprint(thresholds),
+        },
+    )
+
+
+def _profile_response(profile: dict[str, Any]) -> JSONResponse:
+    return JSONResponse(content=profile, headers={"Cache-Control": _PRIVATE_CACHE_CONTROL})
+
+
+@router.get("/profile", response_model=None)
+async def get_my_profile(user_id: str = Depends(current_user_id)) -> JSONResponse:
+    with request_context.stage("profile"):
+        profile = await get_profile_cache().get(user_id)
+    if profile is None:
+        return error_response(404, "NOT_FOUND", "Profile not found")
+    return _profile_response(profile)
+
+
+@router.post("/profile", response_model=None)
+async def put_my_profile(request: Request, user_id: str = Depends(current_user_id)) -> JSONResponse:
+    """Create or overwrite the caller's profile; ``user_id`` and ``created_at`` are the server's."""
+    try:
+        data = await request.json()
+        validate_profile(data)
+    except ValueError as exc:  # malformed JSON is a ValueError too
+        return error_response(400, "VALIDATION_ERROR", str(exc))
+
+    cache = get_profile_cache()
+    with request_context.stage("profile"):
+        existing = await cache.get(user_id)
+        now = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        profile = {
+            **data,
+            "user_id": user_id,
+            "created_at": (existing or {}).get("created_at") or now,
+            "updated_at": now,
+        }
+        await cache.put(user_id, profile, merge=False)
+    return _profile_response(profile)
+
+
+@router.delete("/profile", response_model=None)
+async def delete_my_profile(user_id: str = Depends(current_user_id)) -> Response:
+    with request_context.stage("profile"):
+        deleted = await get_profile_cache().delete(user_id)
+    if not deleted:
+        return error_response(404, "NOT_FOUND", "Profile not found")
+    return Response(status_code=204)
@@ -2,157 +2,127 @@
 
 from __future__ import annotations
 
-import math
-import uuid
-from datetime import UTC, date, datetime
-
-from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
-from scoring_engine import BALANCED_THRESHOLDS, score_hour
-from scoring_engine.engine import HourData
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from scoring_engine.engine import score_to_label
 
 from config import Config
 from models.schemas import (
-    DailySunTimeResponse,
+    BatchAreaErrorResponse,
+    DailySummaryResponse,
+    DayModeSummaryResponse,
+    DayWindowsResponse,
     ErrorDetail,
-    ErrorResponse,
     ForecastHealthDetail,
-    ForecastHourlyResponse,
     ForecastResponse,
     HealthResponse,
-    ModeScoreResponse,
-    ReasonChipResponse,
+    LocalDaySummaryResponse,
+    ModeWindowsResponse,
     ScoredForecastResponse,
-    ScoredHourResponse,
+    ScoresDeltaResponse,
+    ScoresVersionResponse,
+    WindowResponse,
+    WindowsResponse,
+)
+from routers._common import SCORING_VERSION, compute_freshness, error_response, timed_encoding
+from serving.caching import NO_STORE, cache_control
+from serving.columnar import columnar_body
+from serving.daily import daily_summaries, local_today
+from serving.encoding import JSON, MSGPACK, arrow_stream, msgpack_body, negotiate
+from serving.health import get_health_cache
+from serving.projection import (
+    Projection,
+    encode_json,
+    parse_modes,
+    parse_projection,
+    projected_rows,
 )
-from storage.firestore import get_forecast_doc
+from serving.shared import MappedSnapshot, get_shared
+from serving.snapshot import ForecastSnapshot
+from serving.store import get_store
+from serving.windows import Window, mode_windows
+from storage.firestore import FirestoreTimeoutError
+from telemetry import context as request_context
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v1/public", tags=["public"])
 
 API_VERSION = "1.0.0"
-SCORING_VERSION = "score_v2"
-
-# Tel Aviv coordinates for fallback sunset computation
-_TEL_AVIV_LAT = 32.08
-_TEL_AVIV_LON = 34.78
 
-
-def _compute_sunrise_utc(
-    target_date: date, lat: float = _TEL_AVIV_LAT, lon: float = _TEL_AVIV_LON
-) -> datetime:
-    """Compute approximate sunrise time (UTC) for a given date and location.
-
-    Symmetric to _compute_sunset_utc. Accuracy: ±5 minutes.
-    """
-    day_of_year = target_date.timetuple().tm_yday
-    declination = math.radians(-23.45 * math.cos(math.radians((360 / 365) * (day_of_year + 10))))
-    lat_rad = math.radians(lat)
-    cos_h = -math.tan(lat_rad) * math.tan(declination)
-    cos_h = max(-1.0, min(1.0, cos_h))
-    hour_angle = math.degrees(math.acos(cos_h))
-    sunrise_solar = 12.0 - hour_angle / 15.0
-    sunrise_utc_hours = sunrise_solar - lon / 15.0
-    h = int(sunrise_utc_hours)
-    m = int(round((sunrise_utc_hours - h) * 60))
-    if m == 60:
-        h, m = h + 1, 0
-    return datetime(target_date.year, target_date.month, target_date.day, h, m, 0, tzinfo=UTC)
-
-
-def _compute_sunset_utc(
-    target_date: date, lat: float = _TEL_AVIV_LAT, lon: float = _TEL_AVIV_LON
-) -> datetime:
-    """Compute approximate sunset time (UTC) for a given date and location.
-
-    Uses the standard solar declination + hour-angle formula.
-    Accuracy: ±5 minutes, sufficient for the 30-minute swim gate window.
-    """
-    day_of_year = target_date.timetuple().tm_yday
-    # Solar declination
-    declination = math.radians(-23.45 * math.cos(math.radians((360 / 365) * (day_of_year + 10))))
-    lat_rad = math.radians(lat)
-    # Hour angle at sunset
-    cos_h = -math.tan(lat_rad) * math.tan(declination)
-    cos_h = max(-1.0, min(1.0, cos_h))
-    hour_angle = math.degrees(math.acos(cos_h))
-    # Sunset in local solar time (hours after midnight)
-    sunset_solar = 12.0 + hour_angle / 15.0
-    # Convert solar time to UTC: subtract longitude offset
-    sunset_utc_hours = sunset_solar - lon / 15.0
-    h = int(sunset_utc_hours)
-    m = int(round((sunset_utc_hours - h) * 60))
-    if m == 60:
-        h, m = h + 1, 0
-    return datetime(target_date.year, target_date.month, target_date.day, h, m, 0, tzinfo=UTC)
-
-
-def _compute_freshness(updated_at_utc: str) -> tuple[int, str]:
-    """Compute forecast age in minutes and freshness label."""
-    updated = datetime.fromisoformat(updated_at_utc.replace("Z", "+00:00"))
-    now = datetime.now(UTC)
-    age_minutes = int((now - updated).total_seconds() / 60)
-    freshness = "fresh" if age_minutes < Config.FRESHNESS_THRESHOLD_MINUTES else "stale"
-    return age_minutes, freshness
-
-
-def _error_response(status_code: int, code: str, message: str) -> JSONResponse:
-    body = ErrorResponse(
-        error=ErrorDetail(code=code, message=message),
-        request_id=str(uuid.uuid4()),
-    )
-    return JSONResponse(status_code=status_code, content=body.model_dump())
+# Client reconnect delay advertised on score streams
+_SSE_RETRY_MS = 5000
 
 
 @router.get("/forecast", response_model=None)
 async def get_forecast(
+    request: Request,
     area_id: str = Query(default=None, description="Area identifier"),
     days: int = Query(default=7, ge=1, le=7, description="Forecast horizon (1-7 days)"),
-) -> ForecastResponse | JSONResponse:
+    format_: str = Query(
+        default="rows", alias="format", pattern="^(rows|columnar)$", description="Body layout"
+    ),
+) -> JSONResponse | Response:
     if not area_id:
-        return _error_response(400, "VALIDATION_ERROR", "area_id is required")
-
-    if area_id != Config.AREA_ID:
-        return _error_response(404, "NOT_FOUND", f"Unknown area_id: {area_id}")
-
-    doc = get_forecast_doc(area_id)
-    if doc is None:
-        return _error_response(404, "NOT_FOUND", f"No forecast data for area_id: {area_id}")
-
-    updated_at = doc.get("updated_at_utc", "")
-    age_minutes, freshness = _compute_freshness(updated_at)
-
-    # Filter hours to requested day range
-    hours_data = doc.get("hours", [])
-    now = datetime.now(UTC)
-    max_hours = days * 24
-    filtered_hours = []
-    for h in hours_data:
-        hour_str = h.get("hour_utc", "")
-        try:
-            hour_dt = datetime.fromisoformat(hour_str.replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
-            continue
-        if hour_dt >= now and len(filtered_hours) < max_hours:
-            filtered_hours.append(h)
-
-    hours = [ForecastHourlyResponse(**h) for h in filtered_hours]
-
-    return ForecastResponse(
-        area_id=area_id,
-        updated_at_utc=updated_at,
-        provider=doc.get("provider", "open_meteo"),
-        freshness=freshness,
-        forecast_age_minutes=age_minutes,
-        horizon_days=doc.get("horizon_days", 7),
-        hours=hours,
+        return error_response(400, "VALIDATION_ERROR", "area_id is required")
+
+    if area_id not in Config.AREA_IDS:
+        return error_response(404, "NOT_FOUND", f"Unknown area_id: {area_id}")
+
+    media_type = negotiate(request.headers.get("accept"))
+    if media_type == JSON and format_ == "rows":
+        mapped = _mapped(area_id)
+        if mapped is not None:
+            return _mapped_response(mapped, days, scored=False)
+
+    with request_context.stage("cache"):
+        snapshot = await get_store().get(area_id)
+    if snapshot is None:
+        return error_response(404, "NOT_FOUND", f"No forecast data for area_id: {area_id}")
+
+    window = snapshot.window(datetime.now(UTC), days)
+    if media_type != JSON:
+        return _binary_response(media_type, snapshot, window, None)
+    if format_ == "columnar":
+        with timed_encoding("columnar"):
+            members = columnar_body(snapshot, window)
+        return _json_bytes(_response_head(snapshot, scored=False), members)
+
+    doc = snapshot.doc
+    updated_at = snapshot.version
+    age_minutes, freshness = compute_freshness(updated_at)
+
+    hours = snapshot.forecast_hours[window]
+
+    return _model_response(
+        ForecastResponse(
+            area_id=area_id,
+            updated_at_utc=updated_at,
+            provider=doc.get("provider", "open_meteo"),
+            freshness=freshness,
+            forecast_age_minutes=age_minutes,
+            horizon_days=doc.get("horizon_days", 7),
+            hours=hours,
+        )
     )
 
 
 @router.get("/health", response_model=None)
-async def get_health() -> HealthResponse:
-    doc = get_forecast_doc(Config.AREA_ID)
+async def get_health(response: Response) -> HealthResponse:
+    # Health must reflect this instance now, never a cached copy.
+    response.headers["Cache-Control"] = NO_STORE
+    with request_context.stage("cache"):
+        summary = await get_health_cache().get(Config.AREA_ID)
 
-    if doc is None:
+    if summary is None:
         return HealthResponse(
             status="unhealthy",
             version=API_VERSION,
@@ -168,10 +138,10 @@ async def get_health() -> HealthResponse:
             timestamp_utc=datetime.now(UTC).isoformat(),
         )
 
-    updated_at = doc.get("updated_at_utc", "")
-    age_minutes, freshness = _compute_freshness(updated_at)
-    ingest_status = doc.get("ingest_status", "unknown")
-    hours_count = len(doc.get("hours", []))
+    updated_at = summary.updated_at_utc
+    age_minutes, freshness = compute_freshness(updated_at)
+    ingest_status = summary.ingest_status
+    hours_count = summary.hours_count
 
     if age_minutes < Config.FRESHNESS_THRESHOLD_MINUTES and ingest_status == "success":
         status = "healthy"
@@ -196,147 +166,476 @@ async def get_health() -> HealthResponse:
     )
 
 
-def _score_hour_data(
-    h: dict,
-    sunrise_lookup: dict[str, datetime] | None = None,
-    sunset_lookup: dict[str, datetime] | None = None,
-) -> dict[str, ModeScoreResponse]:
-    """Score a single hour's forecast data and return mode scores."""
-    hour_str = h.get("hour_utc", "")
+@router.get("/scores", response_model=None)
+async def get_scores(
+    request: Request,
+    area_id: str = Query(default=None, description="Area identifier"),
+    days: int = Query(default=7, ge=1, le=7, description="Forecast horizon (1-7 days)"),
+    fields: str | None = Query(
+        default=None, description="Comma-separated hourly metrics to include (default: all)"
+    ),
+    modes: str | None = Query(
+        default=None, description="Comma-separated activity modes to score (default: all)"
+    ),
+    reasons: str = Query(
+        default="full", pattern="^(none|top|full)$", description="Reason chips per mode"
+    ),
+    format_: str = Query(
+        default="rows", alias="format", pattern="^(rows|columnar)$", description="Body layout"
+    ),
+    since: str | None = Query(
+        default=None, description="updated_at_utc the client already has: return only changes"
+    ),
+) -> JSONResponse | Response:
+    """Scored hours for ``area_id``.
+
+    With ``since`` set to a version this instance still keeps, the body is a
+    ``ScoresDeltaResponse`` against it; for an unknown or evicted version, or a
+    non-default projection or encoding, it is the full response.
+    """
+    if not area_id:
+        return error_response(400, "VALIDATION_ERROR", "area_id is required")
+
     try:
-        hour_dt = datetime.fromisoformat(hour_str.replace("Z", "+00:00"))
-    except (ValueError, AttributeError):
-        hour_dt = datetime.now(UTC)
-
-    date_key = hour_dt.date().isoformat()
-
-    sunrise_utc = sunrise_lookup.get(date_key) if sunrise_lookup else None
-    if sunrise_utc is None:
-        sunrise_utc = _compute_sunrise_utc(hour_dt.date())
-
-    sunset_utc = sunset_lookup.get(date_key) if sunset_lookup else None
-    if sunset_utc is None:
-        sunset_utc = _compute_sunset_utc(hour_dt.date())
-
-    hour_data = HourData(
-        hour_utc=hour_dt,
-        wave_height_m=h.get("wave_height_m"),
-        feelslike_c=h.get("feelslike_c"),
-        gust_ms=h.get("gust_ms"),
-        precip_prob_pct=h.get("precip_prob_pct"),
-        precip_mm=h.get("precip_mm"),
-        uv_index=h.get("uv_index"),
-        eu_aqi=h.get("eu_aqi"),
-        sunrise_utc=sunrise_utc,
-        sunset_utc=sunset_utc,
+        projection = parse_projection(fields, modes, reasons)
+    except ValueError as exc:
+        return error_response(400, "VALIDATION_ERROR", str(exc))
+
+    if area_id not in Config.AREA_IDS:
+        return error_response(404, "NOT_FOUND", f"Unknown area_id: {area_id}")
+
+    media_type = negotiate(request.headers.get("accept"))
+    default_body = media_type == JSON and format_ == "rows" and projection.is_default
+    if default_body and not since:
+        mapped = _mapped(area_id)
+        if mapped is not None:
+            return _mapped_response(mapped, days, scored=True)
+
+    with request_context.stage("cache"):
+        snapshot = await get_store().get(area_id)
+    if snapshot is None:
+        return error_response(404, "NOT_FOUND", f"No forecast data for area_id: {area_id}")
+
+    if default_body and since:
+        base = get_store().version(area_id, since)
+        if base is not None:
+            return _model_response(_delta_response(snapshot, base, days))
+
+    window = snapshot.window(datetime.now(UTC), days)
+    if media_type != JSON:
+        return _binary_response(media_type, snapshot, window, projection)
+    if format_ == "columnar":
+        with timed_encoding("columnar"):
+            members = columnar_body(snapshot, window, projection)
+        return _json_bytes(_response_head(snapshot), members)
+    if projection.is_default:
+        return _model_response(_scored_response(snapshot, days))
+    return _projected_response(snapshot, days, projection)
+
+
+def _response_head(
+    snapshot: ForecastSnapshot | MappedSnapshot, scored: bool = True
+) -> dict[str, Any]:
+    """Top-level members shared by the row and columnar bodies."""
+    meta = snapshot.doc if isinstance(snapshot, ForecastSnapshot) else snapshot.meta
+    age_minutes, freshness = compute_freshness(snapshot.version)
+    head: dict[str, Any] = {
+        "area_id": snapshot.area_id,
+        "updated_at_utc": snapshot.version,
+        "provider": meta.get("provider", "open_meteo"),
+        "freshness": freshness,
+        "forecast_age_minutes": age_minutes,
+        "horizon_days": meta.get("horizon_days", 7),
+    }
+    if scored:
+        head["scoring_version"] = SCORING_VERSION
+    return head
+
+
+def _mapped(area_id: str) -> MappedSnapshot | None:
+    """The shared snapshot file of ``area_id``, when snapshots are shared across workers."""
+    shared = get_shared()
+    return shared.files.get(area_id) if shared is not None else None
+
+
+def _mapped_response(mapped: MappedSnapshot, days: int, scored: bool) -> Response:
+    """Default /forecast or /scores body, sliced from the pre-rendered rows in the mapping."""
+    with timed_encoding("shared"):
+        window = mapped.window(datetime.now(UTC), days)
+        rows = mapped.rows("scores" if scored else "forecast", window)
+        members = [b"".join((b'"hours":[', rows, b"]"))]
+        if scored:
+            members.append(b'"daily":' + mapped.daily)
+    return _json_bytes(_response_head(mapped, scored=scored), *members)
+
+
+def _public_headers(version: str) -> dict[str, str]:
+    """Headers of a 200 built from forecast ``version``: content negotiation and caching."""
+    headers = {"Vary": "Accept"}
+    if Config.CACHE_CONTROL_ENABLED:
+        headers["Cache-Control"] = cache_control(version)
+    return headers
+
+
+def _model_response(
+    model: ForecastResponse | ScoredForecastResponse | ScoresDeltaResponse,
+) -> Response:
+    with timed_encoding("json"):
+        body = model.model_dump_json()
+    return Response(content=body, media_type=JSON, headers=_public_headers(model.updated_at_utc))
+
+
+def _json_bytes(head: dict[str, Any], *members: bytes) -> Response:
+    """Join ``head`` with pre-encoded ``"key":value`` members into one JSON object."""
+    body = b",".join((encode_json(head)[:-1], *members)) + b"}"
+    return Response(content=body, media_type=JSON, headers=_public_headers(head["updated_at_utc"]))
+
+
+def _binary_response(
+    media_type: str, snapshot: ForecastSnapshot, window: slice, projection: Projection | None
+) -> Response:
+    """Columnar body as MessagePack or an Arrow IPC stream (``projection=None`` for /forecast)."""
+    head = _response_head(snapshot, scored=projection is not None)
+    encode, fmt = (msgpack_body, "msgpack") if media_type == MSGPACK else (arrow_stream, "arrow")
+    with timed_encoding(fmt):
+        body = encode(snapshot, window, projection, head)
+    return Response(content=body, media_type=media_type, headers=_public_headers(snapshot.version))
+
+
+def _projected_response(snapshot: ForecastSnapshot, days: int, projection: Projection) -> Response:
+    """Assemble a projected /scores body from rows encoded once per version."""
+    with timed_encoding("projected"):
+        rows = projected_rows(snapshot, projection)[snapshot.window(datetime.now(UTC), days)]
+        daily = snapshot.memo(
+            "daily_json", lambda: encode_json([d.model_dump() for d in snapshot.daily])
+        )
+        hours = b"".join((b'"hours":[', b",".join(rows), b"]"))
+    return _json_bytes(_response_head(snapshot), hours, b'"daily":' + daily)
+
+
+def _scored_response(snapshot: ForecastSnapshot, days: int) -> ScoredForecastResponse:
+    age_minutes, freshness = compute_freshness(snapshot.version)
+
+    # Hours are scored once per document version; only the time window is per-request.
+    scored_hours = snapshot.scored_hours[snapshot.window(datetime.now(UTC), days)]
+
+    return ScoredForecastResponse(
+        area_id=snapshot.area_id,
+        updated_at_utc=snapshot.version,
+        provider=snapshot.doc.get("provider", "open_meteo"),
+        freshness=freshness,
+        forecast_age_minutes=age_minutes,
+        horizon_days=snapshot.doc.get("horizon_days", 7),
+        scoring_version=SCORING_VERSION,
+        hours=scored_hours,
+        daily=snapshot.daily,
+    )
+
+
+def _delta_response(
+    snapshot: ForecastSnapshot, base: ForecastSnapshot, days: int
+) -> ScoresDeltaResponse:
+    """Hours of the ``days`` window that differ from ``base``, and hours gone since ``base``."""
+    changed, dropped = snapshot.diff(base)
+    in_window = {
+        h.hour_utc for h in snapshot.scored_hours[snapshot.window(datetime.now(UTC), days)]
+    }
+    return ScoresDeltaResponse(
+        area_id=snapshot.area_id,
+        updated_at_utc=snapshot.version,
+        since_updated_at_utc=base.version,
+        scoring_version=SCORING_VERSION,
+        hours=[h for h in changed if h.hour_utc in in_window],
+        dropped_hours=dropped,
+        daily=snapshot.daily,
     )
-    result = score_hour(hour_data, BALANCED_THRESHOLDS)
-
-    def _mode_to_response(ms) -> ModeScoreResponse:
-        return ModeScoreResponse(
-            score=ms.score,
-            label=ms.label,
-            reasons=[
-                ReasonChipResponse(
-                    factor=r.factor, text=r.text, emoji=r.emoji, penalty=r.penalty
+
+
+@router.get("/windows", response_model=None)
+async def get_windows(
+    response: Response,
+    area_id: str = Query(default=None, description="Area identifier"),
+    modes: str | None = Query(
+        default=None, description="Comma-separated activity modes (default: all)"
+    ),
+    min_minutes: int = Query(default=60, ge=60, le=1440, description="Minimum window length"),
+    min_score: int = Query(default=70, ge=0, le=100, description="Minimum hourly score"),
+) -> WindowsResponse | JSONResponse:
+    if not area_id:
+        return error_response(400, "VALIDATION_ERROR", "area_id is required")
+
+    try:
+        selected = parse_modes(modes)
+    except ValueError as exc:
+        return error_response(400, "VALIDATION_ERROR", str(exc))
+
+    if area_id not in Config.AREA_IDS:
+        return error_response(404, "NOT_FOUND", f"Unknown area_id: {area_id}")
+
+    with request_context.stage("cache"):
+        snapshot = await get_store().get(area_id)
+    if snapshot is None:
+        return error_response(404, "NOT_FOUND", f"No forecast data for area_id: {area_id}")
+
+    _, freshness = compute_freshness(snapshot.version)
+    response.headers.update(_public_headers(snapshot.version))
+    start = snapshot.window(datetime.now(UTC), 7).start
+    min_hours = -(-min_minutes // 60)
+    tz = ZoneInfo(Config.LOCAL_TIMEZONE)
+    result: dict[str, ModeWindowsResponse] = {}
+    for mode in selected:
+        windows, days = mode_windows(snapshot, mode, min_score, min_hours, start, tz)
+        result[mode] = ModeWindowsResponse(
+            windows=[_window_response(w) for w in windows],
+            days=[
+                DayWindowsResponse(
+                    date=day,
+                    best=_window_response(ranked[0]),
+                    backup=_window_response(ranked[1]) if len(ranked) > 1 else None,
                 )
-                for r in ms.reasons
+                for day, ranked in days.items()
             ],
-            hard_gated=ms.hard_gated,
         )
 
-    return {
-        "swim_solo": _mode_to_response(result.swim_solo),
-        "swim_dog": _mode_to_response(result.swim_dog),
-        "run_solo": _mode_to_response(result.run_solo),
-        "run_dog": _mode_to_response(result.run_dog),
-    }
+    return WindowsResponse(
+        area_id=area_id,
+        updated_at_utc=snapshot.version,
+        freshness=freshness,
+        scoring_version=SCORING_VERSION,
+        min_minutes=min_minutes,
+        min_score=min_score,
+        modes=result,
+    )
 
 
-@router.get("/scores", response_model=None)
-async def get_scores(
+def _window_response(window: Window) -> WindowResponse:
+    return WindowResponse(
+        start_utc=datetime.fromtimestamp(window.start, UTC).isoformat(),
+        end_utc=datetime.fromtimestamp(window.end, UTC).isoformat(),
+        duration_minutes=window.hours * 60,
+        avg_score=round(window.avg_score),
+        peak_score=window.peak_score,
+        label=window.label,
+    )
+
+
+@router.get("/daily", response_model=None)
+async def get_daily(
+    response: Response,
     area_id: str = Query(default=None, description="Area identifier"),
-    days: int = Query(default=7, ge=1, le=7, description="Forecast horizon (1-7 days)"),
-) -> ScoredForecastResponse | JSONResponse:
+    modes: str | None = Query(
+        default=None, description="Comma-separated activity modes (default: all)"
+    ),
+) -> DailySummaryResponse | JSONResponse:
     if not area_id:
-        return _error_response(400, "VALIDATION_ERROR", "area_id is required")
-
-    if area_id != Config.AREA_ID:
-        return _error_response(404, "NOT_FOUND", f"Unknown area_id: {area_id}")
-
-    doc = get_forecast_doc(area_id)
-    if doc is None:
-        return _error_response(404, "NOT_FOUND", f"No forecast data for area_id: {area_id}")
-
-    updated_at = doc.get("updated_at_utc", "")
-    age_minutes, freshness = _compute_freshness(updated_at)
-
-    # Build sunrise/sunset lookups: date_str -> utc datetime
-    # Falls back to computed astronomical times when Firestore daily data is absent.
-    sunrise_lookup: dict[str, datetime] = {}
-    sunset_lookup: dict[str, datetime] = {}
-    daily_raw = doc.get("daily", [])
-    for entry in daily_raw:
-        try:
-            sunrise_lookup[entry["date"]] = datetime.fromisoformat(
-                entry["sunrise_utc"].replace("Z", "+00:00")
-            )
-            sunset_lookup[entry["date"]] = datetime.fromisoformat(
-                entry["sunset_utc"].replace("Z", "+00:00")
-            )
-        except (KeyError, ValueError):
-            pass
-
-    hours_data = doc.get("hours", [])
-    now = datetime.now(UTC)
-    max_hours = days * 24
-    scored_hours: list[ScoredHourResponse] = []
-
-    for h in hours_data:
-        hour_str = h.get("hour_utc", "")
-        try:
-            hour_dt = datetime.fromisoformat(hour_str.replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
-            continue
-        if hour_dt >= now and len(scored_hours) < max_hours:
-            scores = _score_hour_data(h, sunrise_lookup, sunset_lookup)
-            scored_hours.append(
-                ScoredHourResponse(
-                    hour_utc=h.get("hour_utc", ""),
-                    wave_height_m=h.get("wave_height_m"),
-                    wave_period_s=h.get("wave_period_s"),
-                    air_temp_c=h.get("air_temp_c"),
-                    feelslike_c=h.get("feelslike_c"),
-                    wind_ms=h.get("wind_ms"),
-                    gust_ms=h.get("gust_ms"),
-                    precip_prob_pct=h.get("precip_prob_pct"),
-                    precip_mm=h.get("precip_mm"),
-                    uv_index=h.get("uv_index"),
-                    eu_aqi=h.get("eu_aqi"),
-                    pm10=h.get("pm10"),
-                    pm2_5=h.get("pm2_5"),
-                    scores=scores,
-                )
-            )
+        return error_response(400, "VALIDATION_ERROR", "area_id is required")
 
-    daily_response = [
-        DailySunTimeResponse(
-            date=entry["date"],
-            sunrise_utc=entry["sunrise_utc"],
-            sunset_utc=entry["sunset_utc"],
+    try:
+        selected = parse_modes(modes)
+    except ValueError as exc:
+        return error_response(400, "VALIDATION_ERROR", str(exc))
+
+    if area_id not in Config.AREA_IDS:
+        return error_response(404, "NOT_FOUND", f"Unknown area_id: {area_id}")
+
+    with request_context.stage("cache"):
+        snapshot = await get_store().get(area_id)
+    if snapshot is None:
+        return error_response(404, "NOT_FOUND", f"No forecast data for area_id: {area_id}")
+
+    _, freshness = compute_freshness(snapshot.version)
+    response.headers.update(_public_headers(snapshot.version))
+    tz = ZoneInfo(Config.LOCAL_TIMEZONE)
+    today = local_today(tz)
+    scored = snapshot.scored_hours
+    days = [
+        LocalDaySummaryResponse(
+            date=day.date.isoformat(),
+            hours_count=day.hours,
+            sunrise_utc=day.sunrise_utc,
+            sunset_utc=day.sunset_utc,
+            modes={
+                mode: DayModeSummaryResponse(
+                    max_score=stats.max_score,
+                    min_score=stats.min_score,
+                    label=score_to_label(stats.max_score),
+                    best_hour_utc=scored[stats.best_hour].hour_utc,
+                    daylight_mean_score=(
+                        None if stats.daylight_mean is None else round(stats.daylight_mean)
+                    ),
+                    gated_hours=stats.gated_hours,
+                )
+                for mode, stats in day.modes.items()
+                if mode in selected
+            },
         )
-        for entry in daily_raw
-        if "date" in entry and "sunrise_utc" in entry and "sunset_utc" in entry
+        for day in daily_summaries(snapshot, tz)
+        if day.date >= today
     ]
 
-    return ScoredForecastResponse(
+    return DailySummaryResponse(
         area_id=area_id,
-        updated_at_utc=updated_at,
-        provider=doc.get("provider", "open_meteo"),
+        updated_at_utc=snapshot.version,
         freshness=freshness,
-        forecast_age_minutes=age_minutes,
-        horizon_days=doc.get("horizon_days", 7),
         scoring_version=SCORING_VERSION,
-        hours=scored_hours,
-        daily=daily_response,
+        timezone=Config.LOCAL_TIMEZONE,
+        days=days,
+    )
+
+
+@router.get("/scores/batch", response_model=None)
+async def get_scores_batch(
+    area_ids: str = Query(default=None, description="Comma-separated area identifiers"),
+    days: int = Query(default=7, ge=1, le=7, description="Forecast horizon (1-7 days)"),
+) -> StreamingResponse | JSONResponse:
+    requested = list(dict.fromkeys(a.strip() for a in (area_ids or "").split(",") if a.strip()))
+    if not requested:
+        return error_response(400, "VALIDATION_ERROR", "area_ids is required")
+    if len(requested) > Config.BATCH_MAX_AREAS:
+        return error_response(
+            400, "VALIDATION_ERROR", f"At most {Config.BATCH_MAX_AREAS} area_ids per request"
+        )
+
+    return StreamingResponse(_batch_lines(requested, days), media_type="application/x-ndjson")
+
+
+async def _batch_line(area_id: str, days: int) -> bytes:
+    """One NDJSON line: the area's /scores body, or its error."""
+    if area_id not in Config.AREA_IDS:
+        return _batch_error(area_id, "NOT_FOUND", f"Unknown area_id: {area_id}")
+    try:
+        snapshot = await get_store().get(area_id)
+        if snapshot is None:
+            return _batch_error(area_id, "NOT_FOUND", f"No forecast data for area_id: {area_id}")
+        return _scored_response(snapshot, days).model_dump_json().encode() + b"\n"
+    except FirestoreTimeoutError:
+        return _batch_error(area_id, "UPSTREAM_TIMEOUT", "Forecast store timed out")
+    except Exception:
+        # One failing area must not end the stream for the others.
+        logger.exception("batch_area_failed", extra={"area_id": area_id})
+        return _batch_error(area_id, "INTERNAL_ERROR", "Unexpected server error")
+
+
+def _batch_error(area_id: str, code: str, message: str) -> bytes:
+    body = BatchAreaErrorResponse(area_id=area_id, error=ErrorDetail(code=code, message=message))
+    return body.model_dump_json().encode() + b"\n"
+
+
+async def _batch_lines(area_ids: list[str], days: int) -> AsyncIterator[bytes]:
+    """Fetch every area concurrently and yield each line as soon as it is ready.
+
+    Reads go through the serving cache, so cached areas answer immediately
+    and the rest share the Firestore thread pool: total latency tracks the
+    slowest area, not the sum.
+    """
+    tasks = [asyncio.ensure_future(_batch_line(area_id, days)) for area_id in area_ids]
+    try:
+        for next_line in asyncio.as_completed(tasks):
+            yield await next_line
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _sse_event(event: str, event_id: str, data: str) -> bytes:
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n".encode()
+
+
+def _delta_event(snapshot: ForecastSnapshot, base: ForecastSnapshot) -> bytes:
+    """Encode the delta from ``base`` once per version pair, shared by all subscribers."""
+
+    def _build() -> bytes:
+        changed, dropped = snapshot.diff(base)
+        body = ScoresDeltaResponse(
+            area_id=snapshot.area_id,
+            updated_at_utc=snapshot.version,
+            since_updated_at_utc=base.version,
+            scoring_version=SCORING_VERSION,
+            hours=changed,
+            dropped_hours=dropped,
+            daily=snapshot.daily,
+        )
+        return _sse_event("delta", snapshot.version, body.model_dump_json())
+
+    return snapshot.memo(("sse_delta", base.version), _build)
+
+
+def _version_event(snapshot: ForecastSnapshot) -> bytes:
+    body = ScoresVersionResponse(
+        area_id=snapshot.area_id,
+        updated_at_utc=snapshot.version,
+        scoring_version=SCORING_VERSION,
+    )
+    return _sse_event("version", snapshot.version, body.model_dump_json())
+
+
+async def _score_events(
+    snapshot: ForecastSnapshot, initial: str, last_event_id: str | None
+) -> AsyncIterator[bytes]:
+    store = get_store()
+    sub = store.updates.subscribe(snapshot.area_id, Config.SSE_BUFFER_SIZE)
+    try:
+        yield f"retry: {_SSE_RETRY_MS}\n\n".encode()
+        base = store.version(snapshot.area_id, last_event_id) if last_event_id else None
+        if base is not None and base is not snapshot:
+            yield _delta_event(snapshot, base)
+        elif base is None:
+            if initial == "version":
+                yield _version_event(snapshot)
+            else:
+                scores = _scored_response(snapshot, days=7)
+                yield _sse_event("scores", snapshot.version, scores.model_dump_json())
+
+        last_sent = snapshot
+        deadline = time.monotonic() + Config.SSE_MAX_STREAM_SECONDS
+        while (remaining := deadline - time.monotonic()) > 0:
+            nxt = await sub.next(timeout=min(Config.SSE_HEARTBEAT_SECONDS, remaining))
+            if nxt is None:
+                # Idle: look at the store too, so TTL-mode instances still notice new versions.
+                try:
+                    nxt = await store.get(snapshot.area_id)
+                except FirestoreTimeoutError:
+                    nxt = None
+                if nxt is None or nxt.version == last_sent.version:
+                    yield b": keepalive\n\n"
+                    continue
+            if nxt.version == last_sent.version:
+                continue
+            yield _delta_event(nxt, last_sent)
+            last_sent = nxt
+    finally:
+        store.updates.unsubscribe(sub)
+
+
+@router.get("/scores/stream", response_model=None)
+async def stream_scores(
+    request: Request,
+    area_id: str = Query(default=None, description="Area identifier"),
+    initial: str = Query(
+        default="full",
+        pattern="^(full|version)$",
+        description="First event: full scored horizon, or just a version marker",
+    ),
+) -> StreamingResponse | JSONResponse:
+    """Server-Sent Events: current scores once, then a delta per new forecast version.
+
+    Event ids are forecast versions (``updated_at_utc``). A reconnect carrying a
+    ``Last-Event-ID`` equal to the current version skips the initial event; one
+    carrying an older version still kept by the store starts with a delta instead.
+    """
+    if not area_id:
+        return error_response(400, "VALIDATION_ERROR", "area_id is required")
+
+    if area_id not in Config.AREA_IDS:
+        return error_response(404, "NOT_FOUND", f"Unknown area_id: {area_id}")
+
+    with request_context.stage("cache"):
+        snapshot = await get_store().get(area_id)
+    if snapshot is None:
+        return error_response(404, "NOT_FOUND", f"No forecast data for area_id: {area_id}")
+
+    return StreamingResponse(
+        _score_events(snapshot, initial, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
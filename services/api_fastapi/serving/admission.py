@@ -0,0 +1,258 @@
+"""Admission control and load shedding for bursts of traffic.
+
+Everything a worker serves runs on one event loop. When requests arrive
+faster than the loop can finish them, they queue on the loop itself, and
+every request waits behind the whole backlog. The controller measures that
+queueing delay as loop lag: a timer on the loop records how late it fires.
+
+- While the lag is above ``ADMISSION_TARGET_LAG_MS``, a request whose last
+  200 response is cached gets that response as-is, with an ``Age`` header.
+  That takes a fraction of the work of building it again, so the backlog
+  drains. Forecast data changes once per ingest, so a response a few seconds
+  or minutes old is still correct.
+- Requests in flight are capped. Under lag the cap halves on each timer
+  tick, down to ``ADMISSION_MIN_IN_FLIGHT``. Otherwise it grows back by one
+  per tick, up to ``ADMISSION_MAX_IN_FLIGHT``. A request over the cap gets
+  its cached response, or a 503 ``OVERLOADED`` envelope with ``Retry-After``
+  when nothing is cached.
+
+Health checks, metrics scrapes, score streams and warm-up requests are always
+admitted and are not counted; their responses are never cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import Config
+from models.schemas import ErrorDetail, ErrorResponse
+from serving.warmup import is_warmup
+from telemetry import context as request_context
+from telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+# Always admitted, never counted: cheap probes, and long-lived streams.
+EXEMPT_PATHS = frozenset({"/", "/metrics", "/v1/public/health", "/v1/public/scores/stream"})
+
+_PROBE_INTERVAL_S = 0.02
+_DECREASE = 0.5
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    stored_at: float
+
+
+class ResponseCache:
+    """Bounded LRU of the latest 200 response per (path, query, Accept)."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, bytes, bytes], CachedResponse] = OrderedDict()
+
+    def get(self, key: tuple[str, bytes, bytes], max_age_s: float) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.stored_at > max_age_s:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple[str, bytes, bytes], entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        min_in_flight: int | None = None,
+        max_in_flight: int | None = None,
+        target_lag_s: float | None = None,
+    ) -> None:
+        self.min_in_flight = min_in_flight or Config.ADMISSION_MIN_IN_FLIGHT
+        self.max_in_flight = max_in_flight or Config.ADMISSION_MAX_IN_FLIGHT
+        self.target_lag_s = (
+            target_lag_s if target_lag_s is not None else Config.ADMISSION_TARGET_LAG_MS / 1000
+        )
+        self.limit = float(self.max_in_flight)
+        self.in_flight = 0
+        self.lag_s = 0.0
+        self.cache = ResponseCache(Config.ADMISSION_CACHE_SIZE)
+        self._probe: asyncio.TimerHandle | None = None
+
+    @property
+    def lagging(self) -> bool:
+        return self.lag_s > self.target_lag_s
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def start(self) -> None:
+        """Start measuring loop lag on the running loop (from the app lifespan)."""
+        loop = asyncio.get_running_loop()
+        self._schedule(loop, loop.time())
+
+    def close(self) -> None:
+        if self._probe is not None:
+            self._probe.cancel()
+            self._probe = None
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop, now: float) -> None:
+        due = now + _PROBE_INTERVAL_S
+        self._probe = loop.call_at(due, self._tick, loop, due)
+
+    def _tick(self, loop: asyncio.AbstractEventLoop, due: float) -> None:
+        now = loop.time()
+        self.observe_lag(now - due)
+        self._schedule(loop, now)
+
+    def observe_lag(self, lag_s: float) -> None:
+        """Adjust the in-flight cap after one loop-lag sample."""
+        self.lag_s = lag_s
+        previous = int(self.limit)
+        if lag_s > self.target_lag_s:
+            self.limit = max(self.min_in_flight, self.limit * _DECREASE)
+        else:
+            self.limit = min(self.max_in_flight, self.limit + 1)
+        if int(self.limit) != previous and int(self.limit) in (
+            self.min_in_flight,
+            self.max_in_flight,
+        ):
+            logger.info(
+                "admission_limit",
+                extra={"limit": int(self.limit), "lag_ms": round(lag_s * 1000, 1)},
+            )
+
+
+_controller: AdmissionController | None = None
+
+
+def get_admission() -> AdmissionController:
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
+
+
+def set_admission(controller: AdmissionController | None) -> None:
+    """Override the process-wide controller (tests); ``None`` recreates it on next use."""
+    global _controller
+    _controller = controller
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying the process-wide ``AdmissionController``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not Config.ADMISSION_ENABLED
+            or scope["path"] in EXEMPT_PATHS
+            or is_warmup(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        controller = get_admission()
+        key = _cache_key(scope)
+        cached = None
+        if key is not None and controller.lagging:
+            cached = controller.cache.get(key, Config.ADMISSION_STALE_SECONDS)
+        if cached is None and not controller.try_acquire():
+            if key is not None:
+                cached = controller.cache.get(key, Config.ADMISSION_STALE_SECONDS)
+            if cached is None:
+                metrics.ADMISSION_SHED.inc()
+                await _send_overloaded(send)
+                return
+        if cached is not None:
+            metrics.ADMISSION_CACHED.inc()
+            await _send_cached(send, cached)
+            return
+
+        metrics.ADMISSION_ADMITTED.inc()
+        try:
+            if key is None:
+                await self.app(scope, receive, send)
+            else:
+                await self.app(scope, receive, _capture(send, controller.cache, key))
+        finally:
+            controller.release()
+
+
+def _cache_key(scope: Scope) -> tuple[str, bytes, bytes] | None:
+    if scope["method"] != "GET":
+        return None
+    accept = b""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return None  # personalized: never served to anyone else
+        if name == b"accept":
+            accept = value
+    return scope["path"], scope["query_string"], accept
+
+
+def _capture(send: Send, cache: ResponseCache, key: tuple[str, bytes, bytes]) -> Send:
+    """Wrap ``send`` to remember a 200 response sent as a single body message."""
+    headers: list[tuple[bytes, bytes]] | None = None
+
+    async def _send(message: Message) -> None:
+        nonlocal headers
+        if message["type"] == "http.response.start":
+            headers = list(message.get("headers", [])) if message["status"] == 200 else None
+        elif message["type"] == "http.response.body" and headers is not None:
+            if not message.get("more_body", False):
+                cache.put(key, CachedResponse(headers, message.get("body", b""), time.monotonic()))
+            headers = None  # streamed bodies are not cached
+        await send(message)
+
+    return _send
+
+
+async def _send_cached(send: Send, cached: CachedResponse) -> None:
+    age = int(time.monotonic() - cached.stored_at)
+    headers = [(k, v) for k, v in cached.headers if k != b"age"]
+    headers.append((b"age", str(age).encode()))
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    await send({"type": "http.response.body", "body": cached.body})
+
+
+async def _send_overloaded(send: Send) -> None:
+    request_context.note_error("OVERLOADED")
+    body = ErrorResponse(
+        error=ErrorDetail(code="OVERLOADED", message="Server is busy, retry shortly"),
+        request_id=request_context.request_id(),
+    )
+    content = body.model_dump_json().encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(content)).encode()),
+                (b"retry-after", str(Config.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": content})
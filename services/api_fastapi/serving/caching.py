@@ -0,0 +1,142 @@
+"""HTTP caching of public responses: Cache-Control and canonical query strings.
+
+Public bodies change only when a new forecast version is ingested, or when
+the hour window moves on at the top of each UTC hour. ``cache_control``
+therefore lets any shared cache (a CDN, a browser) reuse a response until
+the earliest of:
+
+- the next expected ingest (``updated_at_utc`` + ``INGEST_INTERVAL_MINUTES``);
+- the next hour boundary;
+- the moment the data would turn stale (``FRESHNESS_THRESHOLD_MINUTES``),
+  so a cached body never claims to be fresh when it is not;
+- ``CACHE_MAX_AGE_SECONDS``.
+
+``max-age`` never drops below ``CACHE_MIN_MAX_AGE_SECONDS``, so an overdue
+ingest still lets caches absorb bursts. ``stale-if-error`` lets a cache keep
+serving a response while the origin fails, for as long as the data stays
+fresh (or, once stale, until it would turn unhealthy).
+
+Caches key on the full URL, so ``?days=7&area_id=x``, ``?area_id=x`` and
+``?area_id=x&days=7`` would be three entries for one body.
+``CanonicalQueryMiddleware`` rewrites equivalent query strings to one form:
+known parameters only, sorted, defaults dropped, list values in canonical
+order. With ``CANONICAL_QUERY_REDIRECT`` it answers a non-canonical URL
+with a 308 to the canonical one instead, so a fronting cache stores one copy.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from urllib.parse import parse_qsl, urlencode
+
+from scoring_engine import MODES
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config import Config
+from serving.projection import HOUR_FIELDS
+
+# Cacheable endpoints: parameter -> default value ("" when it has none).
+CACHEABLE: dict[str, dict[str, str]] = {
+    "/v1/public/forecast": {"area_id": "", "days": "7", "format": "rows"},
+    "/v1/public/scores": {
+        "area_id": "",
+        "days": "7",
+        "fields": "",
+        "modes": "",
+        "reasons": "full",
+        "format": "rows",
+        "since": "",
+    },
+    "/v1/public/windows": {"area_id": "", "modes": "", "min_minutes": "60", "min_score": "70"},
+    "/v1/public/daily": {"area_id": "", "modes": ""},
+}
+_LISTS = {"fields": HOUR_FIELDS, "modes": MODES}
+
+NO_STORE = "no-store"
+
+
+def cache_control(updated_at_utc: str, now: datetime | None = None) -> str:
+    """Cache-Control for a response built from the forecast version ``updated_at_utc``."""
+    now = now or datetime.now(UTC)
+    try:
+        updated = datetime.fromisoformat(updated_at_utc.replace("Z", "+00:00"))
+    except ValueError:
+        return NO_STORE
+    age_s = (now - updated).total_seconds()
+    fresh_left_s = Config.FRESHNESS_THRESHOLD_MINUTES * 60 - age_s
+    max_age = min(
+        Config.INGEST_INTERVAL_MINUTES * 60 - age_s,
+        3600 - now.timestamp() % 3600,
+        Config.CACHE_MAX_AGE_SECONDS,
+    )
+    if fresh_left_s > 0:
+        max_age = min(max_age, fresh_left_s)
+        stale_if_error = fresh_left_s
+    else:
+        stale_if_error = max(Config.UNHEALTHY_THRESHOLD_MINUTES * 60 - age_s, 0)
+    max_age = max(int(max_age), Config.CACHE_MIN_MAX_AGE_SECONDS)
+    return (
+        f"public, max-age={max_age}, "
+        f"stale-while-revalidate={Config.CACHE_STALE_WHILE_REVALIDATE_SECONDS}, "
+        f"stale-if-error={int(stale_if_error)}"
+    )
+
+
+def _canonical_list(value: str, allowed: tuple[str, ...]) -> str:
+    requested = {v.strip() for v in value.split(",") if v.strip()}
+    if not requested <= set(allowed):
+        return value  # left for the endpoint to reject
+    return ",".join(name for name in allowed if name in requested)
+
+
+def canonical_query(path: str, query_string: bytes) -> bytes:
+    """The canonical form of ``query_string`` for ``path``; unchanged for other paths."""
+    defaults = CACHEABLE.get(path)
+    if defaults is None:
+        return query_string
+    params: dict[str, str] = {}
+    # The last occurrence wins, as it does for the endpoint itself.
+    for name, value in parse_qsl(query_string.decode("latin-1"), keep_blank_values=True):
+        if name in defaults:
+            params[name] = value
+    for name in list(params):
+        value = params[name]
+        if name in _LISTS:
+            value = params[name] = _canonical_list(value, _LISTS[name])
+        if value == defaults[name] and defaults[name]:
+            del params[name]
+    return urlencode(sorted(params.items()), safe=",").encode("latin-1")
+
+
+class CanonicalQueryMiddleware:
+    """Rewrite (or redirect) GETs to cacheable endpoints to their canonical query string."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in CACHEABLE:
+            await self.app(scope, receive, send)
+            return
+        query = scope["query_string"]
+        canonical = canonical_query(scope["path"], query)
+        if canonical == query:
+            await self.app(scope, receive, send)
+        elif Config.CANONICAL_QUERY_REDIRECT:
+            location = scope["path"] + ("?" + canonical.decode("latin-1") if canonical else "")
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 308,
+                    "headers": [
+                        (b"location", location.encode("latin-1")),
+                        (b"cache-control", b"public, max-age=86400"),
+                        (b"content-length", b"0"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+        else:
+            # In place, so outer middleware sees the route the router stores in the scope.
+            scope["query_string"] = canonical
+            await self.app(scope, receive, send)
@@ -0,0 +1,98 @@
+"""Columnar (``format=columnar``) encoding of a snapshot's hours and scores.
+
+Instead of one object per hour, every metric is a single array and every mode
+has one array per score attribute. Reason chips are dictionary-encoded: each
+hour holds indices into a per-response ``chips`` table, so the same chip text
+is sent once rather than once per hour. The schema is documented in
+docs/14_api_reference.md.
+
+Metric columns are extracted once per version; the encoded body for a given
+(projection, window) is kept in the snapshot's bounded variant cache.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from serving.projection import HOUR_FIELDS, REASON_LEVELS, Projection, encode_json
+from serving.snapshot import ForecastSnapshot
+
+
+def metric_columns(snapshot: ForecastSnapshot) -> dict[str, list[Any]]:
+    """``hour_utc`` plus every hourly metric as parallel lists, built once per version."""
+
+    def _build() -> dict[str, list[Any]]:
+        hours = snapshot.forecast_hours
+        columns: dict[str, list[Any]] = {"hour_utc": [h.hour_utc for h in hours]}
+        for name in HOUR_FIELDS:
+            columns[name] = [getattr(h, name) for h in hours]
+        return columns
+
+    return snapshot.memo("metric_columns", _build)
+
+
+def score_columns(
+    snapshot: ForecastSnapshot, projection: Projection, window: slice
+) -> tuple[dict[str, dict[str, list[Any]]], list[dict[str, Any]]]:
+    scores = snapshot.score()[window]
+    max_chips = REASON_LEVELS[projection.reasons]
+    chip_index: dict[tuple[str, str, str, int], int] = {}
+
+    def _chip(r: Any) -> int:
+        return chip_index.setdefault((r.factor, r.text, r.emoji, r.penalty), len(chip_index))
+
+    out: dict[str, dict[str, list[Any]]] = {}
+    for mode in projection.modes:
+        column: dict[str, list[Any]] = {"score": [], "label": [], "hard_gated": []}
+        if max_chips:
+            column["reasons"] = []
+        for hour in scores:
+            ms = hour[mode]
+            column["score"].append(ms.score)
+            column["label"].append(ms.label)
+            column["hard_gated"].append(ms.hard_gated)
+            if max_chips:
+                column["reasons"].append([_chip(r) for r in ms.reasons[:max_chips]])
+        out[mode] = column
+    chips = [
+        {"factor": factor, "text": text, "emoji": emoji, "penalty": penalty}
+        for factor, text, emoji, penalty in chip_index
+    ]
+    return out, chips
+
+
+def columnar_members(
+    snapshot: ForecastSnapshot, window: slice, projection: Projection | None = None
+) -> dict[str, Any]:
+    """Columnar members for ``window``, cached per version.
+
+    With ``projection=None`` (``/forecast``) only metric columns are emitted.
+    Otherwise ``scores``, ``chips`` and ``daily`` follow, restricted to the
+    projection's fields, modes and reason level.
+    """
+    start, stop, _ = window.indices(len(snapshot.hour_epochs))
+    key = ("columnar", projection.key if projection else None, start, stop)
+
+    def _build() -> dict[str, Any]:
+        all_columns = metric_columns(snapshot)
+        fields = projection.fields if projection else HOUR_FIELDS
+        columns = {name: all_columns[name][start:stop] for name in ("hour_utc", *fields)}
+        body: dict[str, Any] = {"format": "columnar", "hour_count": stop - start}
+        body["columns"] = columns
+        if projection is not None:
+            body["scores"], body["chips"] = score_columns(snapshot, projection, window)
+            body["daily"] = [d.model_dump() for d in snapshot.daily]
+        return body
+
+    return snapshot.memo_variant(key, _build)
+
+
+def columnar_body(
+    snapshot: ForecastSnapshot, window: slice, projection: Projection | None = None
+) -> bytes:
+    """JSON-encoded ``columnar_members``, without the enclosing braces."""
+    start, stop, _ = window.indices(len(snapshot.hour_epochs))
+    return snapshot.memo_variant(
+        ("columnar_json", projection.key if projection else None, start, stop),
+        lambda: encode_json(columnar_members(snapshot, window, projection))[1:-1],
+    )
@@ -0,0 +1,80 @@
+"""Per local day, per mode summaries of a snapshot's scored horizon.
+
+Hours are bucketed into local calendar days with ``zoneinfo``, so DST
+transition days simply have 23 or 25 hours. Every statistic is accumulated in
+a single pass over the horizon and memoized per (version, timezone).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, tzinfo
+
+from scoring_engine import MODES
+
+from serving.snapshot import ForecastSnapshot
+from serving.sun import sun_times
+
+
+@dataclass
+class ModeDay:
+    max_score: int = -1
+    min_score: int = 101
+    best_hour: int = 0  # index into the snapshot's hour lists
+    daylight_total: int = 0
+    daylight_hours: int = 0
+    gated_hours: int = 0
+
+    @property
+    def daylight_mean(self) -> float | None:
+        return self.daylight_total / self.daylight_hours if self.daylight_hours else None
+
+
+@dataclass
+class LocalDay:
+    date: date
+    hours: int = 0
+    sunrise_utc: str = ""
+    sunset_utc: str = ""
+    modes: dict[str, ModeDay] = field(default_factory=lambda: {m: ModeDay() for m in MODES})
+
+
+def daily_summaries(snapshot: ForecastSnapshot, tz: tzinfo) -> list[LocalDay]:
+    """Local days covered by the snapshot, in order, with per-mode statistics."""
+
+    def _build() -> list[LocalDay]:
+        days: dict[date, LocalDay] = {}
+        scores = snapshot.score()
+        for i, epoch in enumerate(snapshot.hour_epochs):
+            local_date = datetime.fromtimestamp(epoch, tz).date()
+            day = days.get(local_date)
+            if day is None:
+                day = days[local_date] = LocalDay(local_date)
+            day.hours += 1
+            hd = snapshot.hour_inputs[i]
+            daylight = hd.sunrise_utc <= hd.hour_utc < hd.sunset_utc
+            for mode, ms in scores[i].items():
+                stats = day.modes[mode]
+                if ms.score > stats.max_score:
+                    stats.max_score, stats.best_hour = ms.score, i
+                stats.min_score = min(stats.min_score, ms.score)
+                stats.gated_hours += ms.hard_gated
+                if daylight:
+                    stats.daylight_total += ms.score
+                    stats.daylight_hours += 1
+
+        sun = {d.date: d for d in snapshot.daily}
+        for day in days.values():
+            entry = sun.get(day.date.isoformat())
+            if entry is not None:
+                day.sunrise_utc, day.sunset_utc = entry.sunrise_utc, entry.sunset_utc
+            else:
+                sunrise, sunset = sun_times(snapshot.area_id, day.date)
+                day.sunrise_utc, day.sunset_utc = sunrise.isoformat(), sunset.isoformat()
+        return list(days.values())
+
+    return snapshot.memo(("daily_summaries", str(tz)), _build)
+
+
+def local_today(tz: tzinfo) -> date:
+    return datetime.now(UTC).astimezone(tz).date()
@@ -0,0 +1,145 @@
+"""Content negotiation and binary encodings of the columnar representation.
+
+JSON stays the default. ``application/msgpack`` carries the same members as
+``format=columnar``; ``application/vnd.apache.arrow.stream`` carries one
+record batch with a column per metric and per mode attribute. Both are built
+from the snapshot's cached columns, and ``msgpack``/``pyarrow`` are optional:
+when one is not installed its media type is simply not offered.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+from functools import cache
+from typing import Any
+
+from serving.columnar import columnar_members, metric_columns, score_columns
+from serving.projection import HOUR_FIELDS, Projection, encode_json
+from serving.snapshot import ForecastSnapshot
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+_MODULES = {MSGPACK: "msgpack", ARROW_STREAM: "pyarrow"}
+_INT_FIELDS = frozenset({"precip_prob_pct", "eu_aqi"})
+
+
+@cache
+def _available(media_type: str) -> bool:
+    module = _MODULES.get(media_type)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def negotiate(accept: str | None) -> str:
+    """Pick the response media type for an ``Accept`` header.
+
+    Returns the supported type with the highest quality value (earliest wins
+    ties); wildcards, unknown types and unavailable encoders fall back to JSON.
+    """
+    if not accept:
+        return JSON
+    best, best_q = JSON, 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        if media_type not in (JSON, MSGPACK, ARROW_STREAM) or not _available(media_type):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def msgpack_body(
+    snapshot: ForecastSnapshot,
+    window: slice,
+    projection: Projection | None,
+    head: dict[str, Any],
+) -> bytes:
+    """``head`` plus the columnar members as one MessagePack map.
+
+    The members are packed once per (version, projection, window) and cached
+    with the snapshot's variants; only the small ``head`` is packed per call.
+    """
+    import msgpack
+
+    start, stop, _ = window.indices(len(snapshot.hour_epochs))
+
+    def _build() -> tuple[int, bytes]:
+        members = columnar_members(snapshot, window, projection)
+        packer = msgpack.Packer()
+        return len(members), b"".join(packer.pack(k) + packer.pack(v) for k, v in members.items())
+
+    count, packed = snapshot.memo_variant(
+        ("msgpack", projection.key if projection else None, start, stop), _build
+    )
+    packer = msgpack.Packer()
+    parts = [packer.pack_map_header(count + len(head))]
+    parts.extend(packer.pack(k) + packer.pack(v) for k, v in head.items())
+    parts.append(packed)
+    return b"".join(parts)
+
+
+def arrow_table(snapshot: ForecastSnapshot, projection: Projection | None) -> Any:
+    """Full-horizon ``pyarrow.Table`` for ``projection``, cached per version.
+
+    Columns are ``hour_utc``, the projected metrics and, per mode,
+    ``<mode>.score``, ``<mode>.label`` (dictionary-encoded), ``<mode>.hard_gated``
+    and ``<mode>.reasons`` (list of indices into the ``chips`` metadata table).
+    """
+    import pyarrow as pa
+
+    def _build() -> Any:
+        columns = metric_columns(snapshot)
+        fields = projection.fields if projection else HOUR_FIELDS
+        arrays: dict[str, Any] = {"hour_utc": pa.array(columns["hour_utc"], pa.string())}
+        for name in fields:
+            kind = pa.int64() if name in _INT_FIELDS else pa.float64()
+            arrays[name] = pa.array(columns[name], kind)
+        metadata: dict[str, bytes] = {}
+        if projection is not None:
+            scores, chips = score_columns(snapshot, projection, slice(None))
+            for mode, column in scores.items():
+                arrays[f"{mode}.score"] = pa.array(column["score"], pa.int16())
+                arrays[f"{mode}.label"] = pa.array(column["label"], pa.string()).dictionary_encode()
+                arrays[f"{mode}.hard_gated"] = pa.array(column["hard_gated"], pa.bool_())
+                if "reasons" in column:
+                    arrays[f"{mode}.reasons"] = pa.array(column["reasons"], pa.list_(pa.int32()))
+            metadata["chips"] = encode_json(chips)
+            metadata["daily"] = encode_json([d.model_dump() for d in snapshot.daily])
+        return pa.table(arrays).replace_schema_metadata(metadata)
+
+    return snapshot.memo_variant(("arrow", projection.key if projection else None), _build)
+
+
+def arrow_stream(
+    snapshot: ForecastSnapshot,
+    window: slice,
+    projection: Projection | None,
+    head: dict[str, Any],
+) -> bytes:
+    """Arrow IPC stream of ``window``; ``head`` members go in the schema metadata.
+
+    The window is a zero-copy slice of the cached table; each metadata value
+    is JSON-encoded.
+    """
+    import pyarrow as pa
+
+    table = arrow_table(snapshot, projection)
+    start, stop, _ = window.indices(table.num_rows)
+    metadata = dict(table.schema.metadata or {})
+    metadata.update({key: encode_json(value) for key, value in head.items()})
+    table = table.slice(start, stop - start).replace_schema_metadata(metadata)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
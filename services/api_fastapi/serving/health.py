@@ -0,0 +1,114 @@
+"""Cheap forecast health summaries for ``/health``.
+
+Uptime checks and the status page only need ``updated_at_utc``,
+``ingest_status`` and the hour count. They are taken, in order of cost, from:
+
+1. the live pushed snapshot in the serving store, or on a shared-snapshot
+   follower the index of the mapped file (no read at all);
+2. a ``health/{area_id}`` summary read within ``Config.HEALTH_CACHE_TTL_SECONDS``;
+3. a fresh read of that small summary document, coalesced per area;
+4. the full ``forecasts/{area_id}`` document, only when no summary exists yet
+   (serving docs written before the ingest worker started writing summaries).
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from config import Config
+from serving.shared import FollowerStore, MappedSnapshot
+from serving.singleflight import SingleFlight
+from serving.snapshot import ForecastSnapshot
+from serving.store import get_store
+from storage.firestore import get_health_doc
+
+
+@dataclass(frozen=True)
+class HealthSummary:
+    updated_at_utc: str
+    ingest_status: str
+    hours_count: int
+
+
+@dataclass
+class _Entry:
+    summary: HealthSummary | None  # None = no serving doc for this area
+    loaded_at: float
+
+
+def _from_snapshot(snapshot: ForecastSnapshot) -> HealthSummary:
+    return HealthSummary(
+        updated_at_utc=snapshot.version,
+        ingest_status=snapshot.doc.get("ingest_status", "unknown"),
+        hours_count=len(snapshot.doc.get("hours", [])),
+    )
+
+
+def _from_mapped(mapped: MappedSnapshot) -> HealthSummary:
+    return HealthSummary(
+        updated_at_utc=mapped.version,
+        ingest_status=mapped.ingest_status,
+        hours_count=mapped.hours_count,
+    )
+
+
+class HealthCache:
+    """Per-area TTL cache of health summaries with single-flight reads."""
+
+    def __init__(self, ttl_seconds: float | None = None) -> None:
+        self._ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else Config.HEALTH_CACHE_TTL_SECONDS
+        )
+        self._entries: dict[str, _Entry] = {}
+        self._reads: SingleFlight[HealthSummary | None] = SingleFlight()
+
+    async def get(self, area_id: str) -> HealthSummary | None:
+        store = get_store()
+        if isinstance(store, FollowerStore):
+            mapped = store.mapped(area_id)
+            if mapped is not None:
+                return _from_mapped(mapped)
+        snapshot = store.live_snapshot(area_id)
+        if snapshot is not None:
+            return snapshot.memo("health", lambda: _from_snapshot(snapshot))
+        entry = self._entries.get(area_id)
+        if entry is not None and time.monotonic() - entry.loaded_at < self._ttl_seconds:
+            return entry.summary
+        return await self._reads.do(area_id, lambda: self._load(area_id))
+
+    def invalidate(self, area_id: str | None = None) -> None:
+        if area_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(area_id, None)
+
+    async def _load(self, area_id: str) -> HealthSummary | None:
+        doc = await get_health_doc(area_id)
+        if doc is not None:
+            summary: HealthSummary | None = HealthSummary(
+                updated_at_utc=doc.get("updated_at_utc", ""),
+                ingest_status=doc.get("ingest_status", "unknown"),
+                hours_count=int(doc.get("hours_count", 0)),
+            )
+        else:
+            snapshot = await get_store().get(area_id)
+            summary = _from_snapshot(snapshot) if snapshot is not None else None
+        self._entries[area_id] = _Entry(summary=summary, loaded_at=time.monotonic())
+        return summary
+
+
+_cache: HealthCache | None = None
+
+
+def get_health_cache() -> HealthCache:
+    global _cache
+    if _cache is None:
+        _cache = HealthCache()
+    return _cache
+
+
+def set_health_cache(cache: HealthCache | None) -> None:
+    """Override the health cache (for testing). ``None`` resets to a fresh default."""
+    global _cache
+    _cache = cache
@@ -0,0 +1,173 @@
+"""Personalized scores: a profile's effective thresholds, scored once per version.
+
+Profiles store thresholds under the names in ``docs/02_user_profile_schema.md``
+(``swim_wave_meh_m``, ``uv_warn``, ...), which the app fills from the
+canonical preset table. The engine's ``Thresholds`` are score_v2's own
+calibration of the Balanced preset. A profile value is therefore applied as
+its offset from the canonical Balanced row, added to every engine field it
+governs. A Balanced profile scores exactly like ``/v1/public/scores``, and
+Chill/Strict shift each ramp by the documented amounts.
+
+Missing or non-numeric profile values fall back to the profile's preset
+row, then Balanced.
+
+Most users keep a preset, so very few distinct thresholds exist at once.
+``PersonalScores`` keys scored hours by (threshold fingerprint, area,
+forecast version): everyone on a preset shares one scoring pass per ingest.
+The Balanced fingerprint reuses the snapshot's own scored hours.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import astuple, replace
+from typing import Any
+
+from scoring_engine import BALANCED_THRESHOLDS, Thresholds, score_modes
+
+from config import Config
+from models.schemas import ScoredHourResponse
+from serving.snapshot import ForecastSnapshot, scored_models
+
+# Canonical preset table (docs/02_user_profile_schema.md).
+PRESETS: dict[str, dict[str, float]] = {
+    "chill": {
+        "swim_wave_meh_m": 0.75,
+        "swim_wave_bad_m": 1.15,
+        "swim_dog_wave_meh_m": 0.75,
+        "swim_dog_wave_bad_m": 0.95,
+        "run_hot_feelslike_warn_c": 29.5,
+        "run_hot_feelslike_bad_c": 33.5,
+        "dog_heat_warn_feelslike_c": 27.5,
+        "dog_heat_bad_feelslike_c": 30.5,
+        "uv_warn": 7,
+        "uv_bad": 9,
+        "aqi_ok": 60,
+        "aqi_bad": 325,
+        "wind_warn_ms": 10,
+        "wind_bad_ms": 14,
+    },
+    "balanced": {
+        "swim_wave_meh_m": 0.60,
+        "swim_wave_bad_m": 1.00,
+        "swim_dog_wave_meh_m": 0.60,
+        "swim_dog_wave_bad_m": 0.80,
+        "run_hot_feelslike_warn_c": 28.0,
+        "run_hot_feelslike_bad_c": 32.0,
+        "dog_heat_warn_feelslike_c": 26.0,
+        "dog_heat_bad_feelslike_c": 29.0,
+        "uv_warn": 6,
+        "uv_bad": 8,
+        "aqi_ok": 50,
+        "aqi_bad": 300,
+        "wind_warn_ms": 10,
+        "wind_bad_ms": 14,
+    },
+    "strict": {
+        "swim_wave_meh_m": 0.45,
+        "swim_wave_bad_m": 0.85,
+        "swim_dog_wave_meh_m": 0.45,
+        "swim_dog_wave_bad_m": 0.65,
+        "run_hot_feelslike_warn_c": 26.5,
+        "run_hot_feelslike_bad_c": 30.5,
+        "dog_heat_warn_feelslike_c": 24.5,
+        "dog_heat_bad_feelslike_c": 27.5,
+        "uv_warn": 5,
+        "uv_bad": 7,
+        "aqi_ok": 40,
+        "aqi_bad": 275,
+        "wind_warn_ms": 10,
+        "wind_bad_ms": 14,
+    },
+}
+DEFAULT_PRESET = "balanced"
+
+# Profile threshold -> the engine fields it shifts.
+_ENGINE_FIELDS: dict[str, tuple[str, ...]] = {
+    "swim_wave_meh_m": ("swim_wave_ok_m",),
+    "swim_wave_bad_m": ("swim_wave_bad_m",),
+    "swim_dog_wave_meh_m": ("swim_dog_wave_ok_m",),
+    "swim_dog_wave_bad_m": ("swim_dog_wave_bad_m",),
+    "run_hot_feelslike_warn_c": ("run_heat_ok_c",),
+    "run_hot_feelslike_bad_c": ("run_heat_bad_c",),
+    "dog_heat_warn_feelslike_c": ("dog_swim_heat_ok_c", "dog_heat_compound_warn_c"),
+    "dog_heat_bad_feelslike_c": ("dog_swim_heat_bad_c", "dog_heat_gate_c"),
+    "uv_warn": ("uv_ok",),
+    "uv_bad": ("uv_bad",),
+    "aqi_ok": ("aqi_ok",),
+    "aqi_bad": ("aqi_bad",),
+    "wind_warn_ms": ("wind_ok_ms",),
+    "wind_bad_ms": ("wind_bad_ms", "wind_gate_ms"),
+}
+
+
+def resolve_thresholds(profile: dict[str, Any]) -> Thresholds:
+    """Effective engine thresholds of ``profile`` (``BALANCED_THRESHOLDS`` when unchanged)."""
+    preset = (profile.get("preferences") or {}).get("preset")
+    values = dict(PRESETS.get(preset, PRESETS[DEFAULT_PRESET]))
+    stored = profile.get("thresholds") or {}
+    for name in values:
+        value = stored.get(name)
+        if isinstance(value, int | float) and not isinstance(value, bool):
+            values[name] = value
+
+    baseline = PRESETS[DEFAULT_PRESET]
+    changes: dict[str, float] = {}
+    for name, value in values.items():
+        offset = value - baseline[name]
+        if offset:
+            for engine_field in _ENGINE_FIELDS[name]:
+                current = getattr(BALANCED_THRESHOLDS, engine_field)
+                changes[engine_field] = type(current)(round(current + offset, 4))
+    return replace(BALANCED_THRESHOLDS, **changes) if changes else BALANCED_THRESHOLDS
+
+
+def fingerprint(thresholds: Thresholds) -> str:
+    """Short stable digest of ``thresholds``; equal thresholds share one fingerprint."""
+    return hashlib.sha256(repr(astuple(thresholds)).encode()).hexdigest()[:16]
+
+
+BALANCED_FINGERPRINT = fingerprint(BALANCED_THRESHOLDS)
+
+
+class PersonalScores:
+    """Bounded LRU of scored hours per (threshold fingerprint, area, forecast version)."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self._max_entries = max_entries or Config.PERSONAL_SCORES_CACHE_SIZE
+        self._entries: OrderedDict[tuple[str, str, str], list[ScoredHourResponse]] = OrderedDict()
+        self.builds = 0
+
+    def scored_hours(
+        self, snapshot: ForecastSnapshot, thresholds: Thresholds
+    ) -> list[ScoredHourResponse]:
+        key = fingerprint(thresholds)
+        if key == BALANCED_FINGERPRINT:
+            return snapshot.scored_hours
+        cache_key = (key, snapshot.area_id, snapshot.version)
+        hours = self._entries.get(cache_key)
+        if hours is None:
+            scores = [score_modes(hd, thresholds) for hd in snapshot.hour_inputs]
+            hours = self._entries[cache_key] = scored_models(snapshot.hours, scores)
+            self.builds += 1
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(cache_key)
+        return hours
+
+
+_scores: PersonalScores | None = None
+
+
+def get_personal_scores() -> PersonalScores:
+    global _scores
+    if _scores is None:
+        _scores = PersonalScores()
+    return _scores
+
+
+def set_personal_scores(scores: PersonalScores | None) -> None:
+    """Override the personalized scores cache (for testing). ``None`` resets it."""
+    global _scores
+    _scores = scores
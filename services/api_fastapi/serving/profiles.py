@@ -0,0 +1,149 @@
+"""Cached reads of ``users/{user_id}`` profile documents.
+
+Personalized endpoints need the caller's profile on every request, but a
+profile changes only when its owner saves settings. ``ProfileCache`` keeps
+each profile for ``Config.PROFILE_CACHE_TTL_SECONDS`` in a bounded LRU, with
+concurrent reads of one user coalesced.
+
+Writes go through ``put``/``delete`` (``POST``/``DELETE /v1/profile``), which
+update Firestore and then drop the cached entry, so the writer's next read on
+this instance sees the change.
+Writes made elsewhere (another instance, the console) are picked up once the
+entry expires. A read that was already in flight when a write landed is not
+cached, so it cannot put the old profile back.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from config import Config
+from serving.personal import PRESETS
+from serving.singleflight import SingleFlight
+from storage.firestore import delete_user_profile, get_user_profile, set_user_profile
+
+SCHEMA_VERSION = "profile_v1"
+
+# Allowed range of each threshold (docs/02_user_profile_schema.md). Every
+# canonical preset row in ``PRESETS`` must fall inside these.
+THRESHOLD_RANGES: dict[str, tuple[float, float]] = {
+    "swim_wave_meh_m": (0.1, 3.0),
+    "swim_wave_bad_m": (0.2, 5.0),
+    "swim_dog_wave_meh_m": (0.1, 3.0),
+    "swim_dog_wave_bad_m": (0.2, 5.0),
+    "run_hot_feelslike_warn_c": (20, 40),
+    "run_hot_feelslike_bad_c": (25, 45),
+    "dog_heat_warn_feelslike_c": (18, 35),
+    "dog_heat_bad_feelslike_c": (22, 40),
+    "uv_warn": (1, 12),
+    "uv_bad": (3, 15),
+    "aqi_ok": (10, 200),
+    "aqi_bad": (30, 325),
+    "wind_warn_ms": (3, 20),
+    "wind_bad_ms": (5, 25),
+}
+
+
+def validate_profile(data: Any) -> None:
+    """Check a profile write body; raise ``ValueError`` naming the first problem."""
+    if not isinstance(data, dict):
+        raise ValueError("Profile must be a JSON object")
+    if data.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(f"schema_version must be {SCHEMA_VERSION!r}")
+
+    location = data.get("location")
+    if not isinstance(location, dict) or location.get("area_id") not in Config.AREA_IDS:
+        raise ValueError(f"location.area_id must be one of: {', '.join(Config.AREA_IDS)}")
+
+    preferences = data.get("preferences")
+    if not isinstance(preferences, dict) or preferences.get("preset") not in PRESETS:
+        raise ValueError(f"preferences.preset must be one of: {', '.join(PRESETS)}")
+    activities = preferences.get("activities_enabled")
+    if not isinstance(activities, dict) or not any(v is True for v in activities.values()):
+        raise ValueError("At least one activity must be enabled")
+
+    thresholds = data.get("thresholds", {})
+    if not isinstance(thresholds, dict):
+        raise ValueError("thresholds must be an object")
+    for name, (low, high) in THRESHOLD_RANGES.items():
+        if name not in thresholds:
+            continue
+        value = thresholds[name]
+        if isinstance(value, bool) or not isinstance(value, int | float):
+            raise ValueError(f"thresholds.{name} must be a number")
+        if not low <= value <= high:
+            raise ValueError(f"thresholds.{name} must be between {low} and {high}")
+
+
+@dataclass
+class _Entry:
+    profile: dict[str, Any] | None  # None = no profile (user hasn't onboarded)
+    loaded_at: float
+
+
+class ProfileCache:
+    """Per-user TTL + LRU cache of profile documents with write-through invalidation."""
+
+    def __init__(self, ttl_seconds: float | None = None, max_entries: int | None = None) -> None:
+        self._ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else Config.PROFILE_CACHE_TTL_SECONDS
+        )
+        self._max_entries = max_entries or Config.PROFILE_CACHE_SIZE
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Bumped on every write, so loads that started before one are not cached.
+        self._generation = 0
+        self._reads: SingleFlight[dict[str, Any] | None] = SingleFlight()
+
+    async def get(self, user_id: str) -> dict[str, Any] | None:
+        entry = self._entries.get(user_id)
+        if entry is not None and time.monotonic() - entry.loaded_at < self._ttl_seconds:
+            self._entries.move_to_end(user_id)
+            return entry.profile
+        generation = self._generation
+        return await self._reads.do((user_id, generation), lambda: self._load(user_id, generation))
+
+    async def put(self, user_id: str, data: dict[str, Any], merge: bool = True) -> None:
+        """Write the profile and drop the cached copy; ``merge=False`` replaces the stored doc."""
+        try:
+            await set_user_profile(user_id, data, merge=merge)
+        finally:
+            self.invalidate(user_id)
+
+    async def delete(self, user_id: str) -> bool:
+        """Delete the profile and drop the cached copy. Returns True if it existed."""
+        try:
+            return await delete_user_profile(user_id)
+        finally:
+            self.invalidate(user_id)
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+        self._generation += 1
+
+    async def _load(self, user_id: str, generation: int) -> dict[str, Any] | None:
+        profile = await get_user_profile(user_id)
+        if self._generation == generation:
+            self._entries[user_id] = _Entry(profile=profile, loaded_at=time.monotonic())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return profile
+
+
+_cache: ProfileCache | None = None
+
+
+def get_profile_cache() -> ProfileCache:
+    global _cache
+    if _cache is None:
+        _cache = ProfileCache()
+    return _cache
+
+
+def set_profile_cache(cache: ProfileCache | None) -> None:
+    """Override the profile cache (for testing). ``None`` resets to a fresh default."""
+    global _cache
+    _cache = cache
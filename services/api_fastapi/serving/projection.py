@@ -0,0 +1,110 @@
+"""Field, mode and reason-chip projections of a snapshot's scored horizon.
+
+A projection is identified by its canonical key, so ``fields=b,a`` and
+``fields=a,b`` share one cache entry. Rows are cut from the scores computed
+when the snapshot is built (``ForecastSnapshot.score``), JSON-encoded, and kept
+in the snapshot's bounded variant cache; requests only slice them.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from scoring_engine import MODES
+from scoring_engine.engine import MAX_CHIPS, ModeScore
+
+from serving.snapshot import ForecastSnapshot
+
+HOUR_FIELDS = (
+    "wave_height_m",
+    "wave_period_s",
+    "air_temp_c",
+    "feelslike_c",
+    "wind_ms",
+    "gust_ms",
+    "precip_prob_pct",
+    "precip_mm",
+    "uv_index",
+    "eu_aqi",
+    "pm10",
+    "pm2_5",
+)
+
+REASON_LEVELS = {"none": 0, "top": 1, "full": MAX_CHIPS}
+
+
+@dataclass(frozen=True)
+class Projection:
+    fields: tuple[str, ...] = HOUR_FIELDS
+    modes: tuple[str, ...] = MODES
+    reasons: str = "full"
+
+    @property
+    def key(self) -> tuple[str, tuple[str, ...], tuple[str, ...], str]:
+        return ("projection", self.fields, self.modes, self.reasons)
+
+    @property
+    def is_default(self) -> bool:
+        return self == Projection()
+
+
+def _parse_list(value: str, allowed: tuple[str, ...], param: str) -> tuple[str, ...]:
+    requested = {v.strip() for v in value.split(",") if v.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(f"Unknown {param}: {', '.join(sorted(unknown))}")
+    # Canonical order, so equivalent requests share one cache key.
+    return tuple(name for name in allowed if name in requested)
+
+
+def parse_modes(modes: str | None) -> tuple[str, ...]:
+    """Canonical mode tuple from a ``modes`` query parameter. Raises ValueError."""
+    return MODES if modes is None else _parse_list(modes, MODES, "modes")
+
+
+def parse_projection(fields: str | None, modes: str | None, reasons: str) -> Projection:
+    """Build a canonical projection from query parameters. Raises ValueError."""
+    return Projection(
+        fields=HOUR_FIELDS if fields is None else _parse_list(fields, HOUR_FIELDS, "fields"),
+        modes=parse_modes(modes),
+        reasons=reasons,
+    )
+
+
+def _mode_dict(ms: ModeScore, max_chips: int) -> dict[str, Any]:
+    out: dict[str, Any] = {"score": ms.score, "label": ms.label}
+    if max_chips:
+        # Chips are ordered by importance: the first n are what scoring with n would give.
+        out["reasons"] = [
+            {"factor": r.factor, "text": r.text, "emoji": r.emoji, "penalty": r.penalty}
+            for r in ms.reasons[:max_chips]
+        ]
+    out["hard_gated"] = ms.hard_gated
+    return out
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode like FastAPI's JSONResponse (compact, UTF-8)."""
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def projected_rows(snapshot: ForecastSnapshot, projection: Projection) -> list[bytes]:
+    """JSON-encoded hour rows for ``projection``, parallel to ``snapshot.hour_epochs``."""
+
+    def _build() -> list[bytes]:
+        max_chips = REASON_LEVELS[projection.reasons]
+        scores = snapshot.score()
+        rows = []
+        for i, h in enumerate(snapshot.hours):
+            row: dict[str, Any] = {"hour_utc": h.get("hour_utc", "")}
+            for name in projection.fields:
+                row[name] = h.get(name)
+            row["scores"] = {
+                mode: _mode_dict(scores[i][mode], max_chips) for mode in projection.modes
+            }
+            rows.append(encode_json(row))
+        return rows
+
+    return snapshot.memo_variant(projection.key, _build)
@@ -0,0 +1,415 @@
+"""Scored snapshots shared by every uvicorn worker through memory-mapped files.
+
+With ``Config.SNAPSHOT_DIR`` set, the workers elect one leader with an
+exclusive ``flock`` on ``leader.lock``. The leader alone talks to Firestore:
+it keeps the normal serving store current and writes each new version to
+``{area_id}.snap``. Every worker, leader included, maps those files read-only
+and serves the default ``/forecast`` and ``/scores`` bodies straight from the
+mapping, so those pages live once in the OS page cache whatever the worker
+count. Followers remap when the file is replaced; their ``/health`` reads the
+file index alone.
+
+Only those paths are shared. Every other endpoint (projections, deltas,
+``/daily``, ``/windows``, binary encodings, streams) needs the full
+``ForecastSnapshot``, which a follower builds from the document stored in
+the file, once per mapped version, instead of reading Firestore. That scoring
+pass and its memory are still paid per worker, on the first such request.
+
+When the leader exits its lock is released and the next follower to poll
+takes over.
+
+File layout (little-endian)::
+
+    magic "GONOWSNP" | u32 format | u32 index length | index JSON | sections
+
+The index holds the document metadata and ``{name: [offset, length]}`` for
+each section. Sections start on 8-byte boundaries:
+
+- ``doc``: the serving document as JSON
+- ``epochs``: int64 hour epochs, sorted
+- ``scores.rows`` / ``forecast.rows``: one JSON object per hour, each followed
+  by a comma, so any window of hours is one contiguous byte range
+- ``scores.offsets`` / ``forecast.offsets``: int64 start of each row, plus one
+- ``daily``: the daily sun times as a JSON array
+
+Files are written to a temporary name and renamed over the old one, so a
+reader maps either the old file or the new one, never a partial write.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from config import Config
+from serving.snapshot import ForecastSnapshot, build_snapshot
+from serving.store import ForecastStore, get_store, set_store
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"GONOWSNP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sII")
+_ALIGN = 8
+LOCK_NAME = "leader.lock"
+
+
+def snapshot_path(directory: Path, area_id: str) -> Path:
+    return directory / f"{area_id}.snap"
+
+
+def _rows_section(rows: list[bytes]) -> tuple[bytes, bytes]:
+    """Rows each followed by a comma, and their int64 start offsets (plus the end)."""
+    offsets = [0]
+    for row in rows:
+        offsets.append(offsets[-1] + len(row) + 1)
+    return b"".join(row + b"," for row in rows), struct.pack(f"<{len(offsets)}q", *offsets)
+
+
+def encode_snapshot(snapshot: ForecastSnapshot) -> bytes:
+    """The snapshot file contents for ``snapshot``."""
+    score_rows, score_offsets = _rows_section(
+        [h.model_dump_json().encode() for h in snapshot.scored_hours]
+    )
+    forecast_rows, forecast_offsets = _rows_section(
+        [h.model_dump_json().encode() for h in snapshot.forecast_hours]
+    )
+    payloads = {
+        "doc": json.dumps(snapshot.doc, separators=(",", ":")).encode(),
+        "epochs": struct.pack(f"<{len(snapshot.hour_epochs)}q", *snapshot.hour_epochs),
+        "scores.rows": score_rows,
+        "scores.offsets": score_offsets,
+        "forecast.rows": forecast_rows,
+        "forecast.offsets": forecast_offsets,
+        "daily": json.dumps(
+            [d.model_dump() for d in snapshot.daily], separators=(",", ":")
+        ).encode(),
+    }
+    meta = {
+        "area_id": snapshot.area_id,
+        "version": snapshot.version,
+        "provider": snapshot.doc.get("provider", "open_meteo"),
+        "horizon_days": snapshot.doc.get("horizon_days", 7),
+        "ingest_status": snapshot.doc.get("ingest_status", "unknown"),
+        "hours_count": len(snapshot.doc.get("hours", [])),
+    }
+
+    # Offsets depend on the index length and the index holds the offsets, so
+    # lay the sections out relative to the index end and fix up once.
+    relative: dict[str, list[int]] = {}
+    cursor = 0
+    for name, payload in payloads.items():
+        relative[name] = [cursor, len(payload)]
+        cursor += len(payload) + (-len(payload) % _ALIGN)
+
+    def _index(base: int) -> bytes:
+        sections = {name: [base + off, length] for name, (off, length) in relative.items()}
+        return json.dumps({**meta, "sections": sections}, separators=(",", ":")).encode()
+
+    index = _index(0)
+    while True:
+        body_start = _HEADER.size + len(index)
+        body_start += -body_start % _ALIGN
+        fixed = _index(body_start)
+        if len(fixed) == len(index):
+            break
+        index = fixed
+
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(fixed)), fixed]
+    parts.append(b"\0" * (body_start - _HEADER.size - len(fixed)))
+    for payload in payloads.values():
+        parts.append(payload)
+        parts.append(b"\0" * (-len(payload) % _ALIGN))
+    return b"".join(parts)
+
+
+def write_snapshot_file(directory: Path, snapshot: ForecastSnapshot) -> Path:
+    """Atomically replace ``{area_id}.snap`` in ``directory`` with ``snapshot``."""
+    path = snapshot_path(directory, snapshot.area_id)
+    data = encode_snapshot(snapshot)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{snapshot.area_id}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+class MappedSnapshot:
+    """Read-only view of one snapshot file version."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, index_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} snapshot file")
+        index = json.loads(self._mm[_HEADER.size : _HEADER.size + index_len])
+        self._sections: dict[str, tuple[int, int]] = {
+            name: (off, length) for name, (off, length) in index.pop("sections").items()
+        }
+        self.meta: dict[str, Any] = index
+        self.area_id: str = index["area_id"]
+        self.version: str = index["version"]
+        self.ingest_status: str = index["ingest_status"]
+        self.hours_count: int = index["hours_count"]
+        self.epochs = self._view("epochs").cast("q")
+        self._offsets = {
+            kind: self._view(f"{kind}.offsets").cast("q") for kind in ("scores", "forecast")
+        }
+        self._snapshot: ForecastSnapshot | None = None
+
+    def _view(self, name: str) -> memoryview:
+        off, length = self._sections[name]
+        return memoryview(self._mm)[off : off + length]
+
+    def window(self, now: datetime, days: int) -> slice:
+        """Same hours as ``ForecastSnapshot.window``."""
+        start = bisect_left(self.epochs, now.timestamp())
+        return slice(start, start + days * 24)
+
+    def rows(self, kind: str, window: slice) -> bytes:
+        """Comma-joined JSON rows of ``kind`` ("scores" or "forecast") in ``window``."""
+        start, stop, _ = window.indices(len(self.epochs))
+        if start >= stop:
+            return b""
+        offsets = self._offsets[kind]
+        base = self._sections[f"{kind}.rows"][0]
+        # Drop the comma that follows the last row.
+        return self._mm[base + offsets[start] : base + offsets[stop] - 1]
+
+    @property
+    def daily(self) -> bytes:
+        return bytes(self._view("daily"))
+
+    def doc(self) -> dict[str, Any]:
+        return json.loads(self._view("doc").tobytes())  # type: ignore[no-any-return]
+
+    def snapshot(self) -> ForecastSnapshot:
+        """This version as a full ``ForecastSnapshot``, built once per mapping."""
+        if self._snapshot is None:
+            self._snapshot = build_snapshot(self.area_id, self.doc())
+        return self._snapshot
+
+
+class SnapshotFiles:
+    """The mapped snapshot per area, remapped when its file is replaced.
+
+    A file is re-checked at most every ``poll_seconds``. The last
+    ``Config.FORECAST_VERSIONS_KEPT`` mappings of each area stay reachable
+    through ``version()``, as bases for delta responses. Older mappings are not
+    closed explicitly; they go away when the last reference does.
+    """
+
+    def __init__(
+        self, directory: Path, poll_seconds: float, versions_kept: int | None = None
+    ) -> None:
+        self.directory = directory
+        self._poll_seconds = poll_seconds
+        self._versions_kept = max(
+            1, versions_kept if versions_kept is not None else Config.FORECAST_VERSIONS_KEPT
+        )
+        self._mapped: dict[str, MappedSnapshot] = {}
+        self._checked: dict[str, float] = {}
+        self._history: dict[str, tuple[MappedSnapshot, ...]] = {}
+
+    def version(self, area_id: str, version: str) -> MappedSnapshot | None:
+        """A recently mapped version of ``area_id``, or ``None`` once evicted."""
+        for mapped in reversed(self._history.get(area_id, ())):
+            if mapped.version == version:
+                return mapped
+        return None
+
+    def get(self, area_id: str) -> MappedSnapshot | None:
+        now = time.monotonic()
+        mapped = self._mapped.get(area_id)
+        if mapped is not None and now - self._checked.get(area_id, 0.0) < self._poll_seconds:
+            return mapped
+        self._checked[area_id] = now
+        path = snapshot_path(self.directory, area_id)
+        try:
+            inode = path.stat().st_ino
+            if mapped is not None and mapped.inode == inode:
+                return mapped
+            mapped = MappedSnapshot(path)
+        except FileNotFoundError:
+            return self._mapped.get(area_id)
+        except (OSError, ValueError):
+            logger.exception("snapshot_file_unreadable", extra={"path": str(path)})
+            return self._mapped.get(area_id)
+        self._mapped[area_id] = mapped
+        kept = [m for m in self._history.get(area_id, ()) if m.version != mapped.version]
+        kept.append(mapped)
+        self._history[area_id] = tuple(kept[-self._versions_kept :])
+        logger.info(
+            "snapshot_file_mapped",
+            extra={"area_id": area_id, "version": mapped.version, "bytes": len(mapped._mm)},
+        )
+        return mapped
+
+
+class FollowerStore(ForecastStore):
+    """Serving store of a follower worker: snapshots come from the mapped files.
+
+    Falls back to reading Firestore itself only while the leader has not
+    written a file for the area yet.
+    """
+
+    def __init__(self, files: SnapshotFiles) -> None:
+        super().__init__()
+        self._files = files
+        self._published: dict[str, str] = {}
+
+    async def get(self, area_id: str) -> ForecastSnapshot | None:
+        mapped = self._files.get(area_id)
+        if mapped is None:
+            return await super().get(area_id)
+        snapshot = mapped.snapshot()
+        if self._published.get(area_id) != snapshot.version:
+            self._published[area_id] = snapshot.version
+            self.updates.publish(snapshot)
+        return snapshot
+
+    def version(self, area_id: str, version: str) -> ForecastSnapshot | None:
+        mapped = self._files.version(area_id, version)
+        if mapped is None:
+            return super().version(area_id, version)
+        return mapped.snapshot()
+
+    def mapped(self, area_id: str) -> MappedSnapshot | None:
+        """The current mapping for ``area_id``, without building its snapshot."""
+        return self._files.get(area_id)
+
+    def subscribe(self, area_id: str) -> None:
+        """Followers never listen to Firestore; the leader does."""
+
+
+class SharedSnapshots:
+    """This worker's role (leader or follower) and its view of the snapshot files."""
+
+    def __init__(self, directory: Path, area_ids: tuple[str, ...], poll_seconds: float) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.files = SnapshotFiles(directory, poll_seconds)
+        self.leader = False
+        self._area_ids = area_ids
+        self._poll_seconds = poll_seconds
+        self._lock_fd: int | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._writer: ThreadPoolExecutor | None = None
+
+    def _try_lock(self) -> bool:
+        import fcntl
+
+        fd = os.open(self.files.directory / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def _write(self, snapshot: ForecastSnapshot) -> None:
+        """Queue ``snapshot`` for writing; called from the event loop or the listener thread.
+
+        One writer thread keeps the encode and file I/O off the event loop and
+        writes versions in the order they were installed.
+        """
+        if self._writer is not None:
+            self._writer.submit(self._write_file, snapshot)
+
+    def _write_file(self, snapshot: ForecastSnapshot) -> None:
+        try:
+            path = write_snapshot_file(self.files.directory, snapshot)
+        except Exception:
+            logger.exception(
+                "snapshot_file_write_failed",
+                extra={"area_id": snapshot.area_id, "version": snapshot.version},
+            )
+            return
+        logger.info(
+            "snapshot_file_written",
+            extra={"area_id": snapshot.area_id, "version": snapshot.version, "path": str(path)},
+        )
+
+    async def flush(self) -> None:
+        """Wait until every snapshot queued so far is written."""
+        if self._writer is not None:
+            await asyncio.wrap_future(self._writer.submit(lambda: None))
+
+    def _lead(self) -> None:
+        """Become the leader: own the Firestore store and write every new version."""
+        self.leader = True
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-writer")
+        store = ForecastStore()
+        store.on_snapshot(self._write)
+        set_store(store)
+        if Config.FORECAST_PUSH_UPDATES:
+            for area_id in self._area_ids:
+                try:
+                    store.subscribe(area_id)
+                except Exception:
+                    logger.exception("forecast_listener_failed", extra={"area_id": area_id})
+        logger.info("snapshot_leader_elected", extra={"pid": os.getpid()})
+
+    async def _refresh(self) -> None:
+        """Leader: reload expired areas. Follower: take over if the leader is gone."""
+        while True:
+            if not self.leader and self._try_lock():
+                self._lead()
+            if self.leader:
+                for area_id in self._area_ids:
+                    try:
+                        await get_store().get(area_id)
+                    except Exception:
+                        logger.exception("snapshot_refresh_failed", extra={"area_id": area_id})
+            await asyncio.sleep(self._poll_seconds)
+
+    def start(self) -> None:
+        """Elect this worker's role and start its refresh loop (event loop only)."""
+        if self._try_lock():
+            self._lead()
+        else:
+            set_store(FollowerStore(self.files))
+            logger.info("snapshot_follower_started", extra={"pid": os.getpid()})
+        self._task = asyncio.get_running_loop().create_task(self._refresh())
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        get_store().close()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)  # releases the flock
+            self._lock_fd = None
+        self.leader = False
+
+
+_shared: SharedSnapshots | None = None
+
+
+def get_shared() -> SharedSnapshots | None:
+    """The shared-snapshot state, or ``None`` when ``Config.SNAPSHOT_DIR`` is unset."""
+    return _shared
+
+
+def set_shared(shared: SharedSnapshots | None) -> None:
+    global _shared
+    _shared = shared
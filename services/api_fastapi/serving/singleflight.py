@@ -0,0 +1,40 @@
+"""Single-flight coalescing of concurrent async loads.
+
+Concurrent callers asking for the same key share one in-flight task instead
+of each doing the work. The result (or exception) is delivered to every
+waiter, and nothing is remembered once the task finishes, so a failed load
+never poisons later calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[V]):
+    """Deduplicate concurrent calls by key."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task[V]] = {}
+
+    def inflight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        """Await ``fn()``, or the already-running call for ``key``."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, fn))
+            self._inflight[key] = task
+        # Shield so one waiter being cancelled does not cancel the shared load.
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        try:
+            return await fn()
+        finally:
+            self._inflight.pop(key, None)
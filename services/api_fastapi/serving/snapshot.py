@@ -0,0 +1,252 @@
+"""Scored, immutable view of one version of a forecasts/{area_id} document.
+
+A snapshot is built once per document version (``updated_at_utc``) and shared
+by every request that sees that version, so scoring runs once per ingest
+instead of once per request.
+"""
+
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, TypeVar
+
+from scoring_engine import BALANCED_THRESHOLDS, score_modes
+from scoring_engine.engine import HourData, ModeScore
+
+from config import Config
+from models.schemas import (
+    DailySunTimeResponse,
+    ForecastHourlyResponse,
+    ModeScoreResponse,
+    ReasonChipResponse,
+    ScoredHourResponse,
+)
+from serving.sun import sun_times
+from telemetry.context import stage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _parse_utc(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _mode_to_response(ms: ModeScore) -> ModeScoreResponse:
+    return ModeScoreResponse(
+        score=ms.score,
+        label=ms.label,
+        reasons=[
+            ReasonChipResponse(factor=r.factor, text=r.text, emoji=r.emoji, penalty=r.penalty)
+            for r in ms.reasons
+        ],
+        hard_gated=ms.hard_gated,
+    )
+
+
+def _hour_inputs(
+    h: dict,
+    hour_dt: datetime,
+    area_id: str,
+    sunrise_lookup: dict[str, datetime] | None = None,
+    sunset_lookup: dict[str, datetime] | None = None,
+) -> HourData:
+    """Build the scoring engine input for a single hour's forecast data."""
+    date_key = hour_dt.date().isoformat()
+
+    sunrise_utc = sunrise_lookup.get(date_key) if sunrise_lookup else None
+    sunset_utc = sunset_lookup.get(date_key) if sunset_lookup else None
+    if sunrise_utc is None or sunset_utc is None:
+        computed = sun_times(area_id, hour_dt.date())
+        sunrise_utc = sunrise_utc or computed[0]
+        sunset_utc = sunset_utc or computed[1]
+
+    return HourData(
+        hour_utc=hour_dt,
+        wave_height_m=h.get("wave_height_m"),
+        feelslike_c=h.get("feelslike_c"),
+        gust_ms=h.get("gust_ms"),
+        precip_prob_pct=h.get("precip_prob_pct"),
+        precip_mm=h.get("precip_mm"),
+        uv_index=h.get("uv_index"),
+        eu_aqi=h.get("eu_aqi"),
+        sunrise_utc=sunrise_utc,
+        sunset_utc=sunset_utc,
+    )
+
+
+@dataclass(frozen=True)
+class ForecastSnapshot:
+    """One scored version of the serving document.
+
+    ``hour_epochs``, ``hours``, ``forecast_hours`` and ``scored_hours`` are
+    parallel lists sorted by hour. Hours whose ``hour_utc`` does not parse are
+    dropped when the snapshot is built.
+    """
+
+    area_id: str
+    version: str  # updated_at_utc of the source document
+    doc: dict[str, Any]
+    hour_epochs: list[int]
+    hours: list[dict[str, Any]]
+    hour_inputs: list[HourData]
+    forecast_hours: list[ForecastHourlyResponse]
+    scored_hours: list[ScoredHourResponse]
+    daily: list[DailySunTimeResponse] = field(default_factory=list)
+    # Per-version memo of derived artifacts (deltas, encoded bodies, ...).
+    derived: dict[Hashable, Any] = field(default_factory=dict, compare=False, repr=False)
+    # Artifacts keyed by client choices (projection, window): bounded, least recently used out.
+    variants: OrderedDict[Hashable, Any] = field(
+        default_factory=OrderedDict, compare=False, repr=False
+    )
+
+    def memo(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Compute ``build()`` once per snapshot and reuse it afterwards."""
+        try:
+            return self.derived[key]  # type: ignore[no-any-return]
+        except KeyError:
+            value = self.derived[key] = build()
+            return value
+
+    def memo_variant(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Like ``memo``, keeping at most ``Config.PROJECTION_CACHE_SIZE`` entries.
+
+        For artifacts whose keys come from query parameters, which a client can
+        vary without limit.
+        """
+        try:
+            value: T = self.variants[key]
+        except KeyError:
+            value = self.variants[key] = build()
+            while len(self.variants) > Config.PROJECTION_CACHE_SIZE:
+                self.variants.popitem(last=False)
+            return value
+        self.variants.move_to_end(key)
+        return value
+
+    def score(self) -> list[dict[str, ModeScore]]:
+        """Balanced-preset scores of every mode for every hour, with all reason chips.
+
+        Computed when the snapshot is built; projections slice these rather
+        than scoring again.
+        """
+        return self.memo(
+            "scores",
+            lambda: [score_modes(hd, BALANCED_THRESHOLDS) for hd in self.hour_inputs],
+        )
+
+    def diff(self, base: ForecastSnapshot) -> tuple[list[ScoredHourResponse], list[str]]:
+        """Hours that changed or were added since ``base``, and hours it had that are gone."""
+
+        def _build() -> tuple[list[ScoredHourResponse], list[str]]:
+            base_rows = {h.hour_utc: h for h in base.scored_hours}
+            changed = [h for h in self.scored_hours if base_rows.get(h.hour_utc) != h]
+            current = {h.hour_utc for h in self.scored_hours}
+            dropped = [hour for hour in base_rows if hour not in current]
+            return changed, dropped
+
+        return self.memo(("diff", base.version), _build)
+
+    def window(self, now: datetime, days: int) -> slice:
+        """Slice of the parallel hour lists covering ``days`` from the first hour >= now."""
+        start = bisect_left(self.hour_epochs, now.timestamp())
+        return slice(start, start + days * 24)
+
+
+def scored_models(
+    hours: list[dict[str, Any]], scores: list[dict[str, ModeScore]]
+) -> list[ScoredHourResponse]:
+    return [
+        ScoredHourResponse(
+            hour_utc=h.get("hour_utc", ""),
+            wave_height_m=h.get("wave_height_m"),
+            wave_period_s=h.get("wave_period_s"),
+            air_temp_c=h.get("air_temp_c"),
+            feelslike_c=h.get("feelslike_c"),
+            wind_ms=h.get("wind_ms"),
+            gust_ms=h.get("gust_ms"),
+            precip_prob_pct=h.get("precip_prob_pct"),
+            precip_mm=h.get("precip_mm"),
+            uv_index=h.get("uv_index"),
+            eu_aqi=h.get("eu_aqi"),
+            pm10=h.get("pm10"),
+            pm2_5=h.get("pm2_5"),
+            scores={mode: _mode_to_response(ms) for mode, ms in hour_scores.items()},
+        )
+        for h, hour_scores in zip(hours, scores, strict=True)
+    ]
+
+
+def build_snapshot(area_id: str, doc: dict[str, Any]) -> ForecastSnapshot:
+    """Score every hour of ``doc`` with the Balanced preset."""
+    # Build sunrise/sunset lookups: date_str -> utc datetime
+    # Falls back to the area's solar table when Firestore daily data is absent.
+    sunrise_lookup: dict[str, datetime] = {}
+    sunset_lookup: dict[str, datetime] = {}
+    daily_raw = doc.get("daily", [])
+    for entry in daily_raw:
+        try:
+            sunrise_lookup[entry["date"]] = _parse_utc(entry["sunrise_utc"])
+            sunset_lookup[entry["date"]] = _parse_utc(entry["sunset_utc"])
+        except (KeyError, ValueError):
+            pass
+
+    parsed: list[tuple[int, datetime, dict[str, Any]]] = []
+    malformed = 0
+    with stage("parse"):
+        for h in doc.get("hours", []):
+            try:
+                hour_dt = _parse_utc(h["hour_utc"])
+            except (KeyError, ValueError, AttributeError):
+                malformed += 1
+                continue
+            if hour_dt.tzinfo is None:
+                hour_dt = hour_dt.replace(tzinfo=UTC)
+            parsed.append((int(hour_dt.timestamp()), hour_dt, h))
+        parsed.sort(key=lambda p: p[0])
+    if malformed:
+        logger.warning(
+            "snapshot_malformed_hours",
+            extra={"area_id": area_id, "version": doc.get("updated_at_utc"), "count": malformed},
+        )
+
+    hours = [h for _, _, h in parsed]
+    with stage("score"):
+        hour_inputs = [
+            _hour_inputs(h, hour_dt, area_id, sunrise_lookup, sunset_lookup)
+            for _, hour_dt, h in parsed
+        ]
+        full_scores = [score_modes(hd, BALANCED_THRESHOLDS) for hd in hour_inputs]
+    with stage("models"):
+        scored_hours = scored_models(hours, full_scores)
+        forecast_hours = [ForecastHourlyResponse(**h) for h in hours]
+
+    daily = [
+        DailySunTimeResponse(
+            date=entry["date"],
+            sunrise_utc=entry["sunrise_utc"],
+            sunset_utc=entry["sunset_utc"],
+        )
+        for entry in daily_raw
+        if "date" in entry and "sunrise_utc" in entry and "sunset_utc" in entry
+    ]
+
+    snapshot = ForecastSnapshot(
+        area_id=area_id,
+        version=doc.get("updated_at_utc", ""),
+        doc=doc,
+        hour_epochs=[epoch for epoch, _, _ in parsed],
+        hours=hours,
+        hour_inputs=hour_inputs,
+        forecast_hours=forecast_hours,
+        scored_hours=scored_hours,
+        daily=daily,
+    )
+    snapshot.derived["scores"] = full_scores
+    return snapshot
@@ -0,0 +1,202 @@
+"""In-memory serving cache of scored forecast snapshots.
+
+Areas registered with ``subscribe()`` are kept current by a Firestore snapshot
+listener: each new document version is scored on the listener thread and
+swapped in as one immutable snapshot, so request-path reads never touch
+Firestore. Other areas (or areas whose listener has dropped) fall back to a
+TTL cache of ``Config.FORECAST_CACHE_TTL_SECONDS``.
+
+Concurrent misses are coalesced: one Firestore read per area, and one scoring
+pass per (area_id, version), no matter how many requests arrive at once.
+
+The last ``Config.FORECAST_VERSIONS_KEPT`` installed versions of each area stay
+reachable through ``version()``, as bases for delta responses.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from config import Config
+from serving.singleflight import SingleFlight
+from serving.snapshot import ForecastSnapshot, build_snapshot
+from serving.updates import UpdateNotifier
+from storage.firestore import get_forecast_doc, watch_forecast_doc
+from telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    snapshot: ForecastSnapshot | None  # None = no serving doc for this area
+    loaded_at: float
+    pushed: bool = False  # delivered by a snapshot listener rather than a read
+
+
+class ForecastStore:
+    """Per-area TTL cache with single-flight loading and scoring."""
+
+    def __init__(self, ttl_seconds: float | None = None, versions_kept: int | None = None) -> None:
+        self._ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else Config.FORECAST_CACHE_TTL_SECONDS
+        )
+        # The current version always counts as kept.
+        self._versions_kept = max(
+            1, versions_kept if versions_kept is not None else Config.FORECAST_VERSIONS_KEPT
+        )
+        self._entries: dict[str, _Entry] = {}
+        self._history: dict[str, tuple[ForecastSnapshot, ...]] = {}
+        self._reads: SingleFlight[ForecastSnapshot | None] = SingleFlight()
+        self._scoring: SingleFlight[ForecastSnapshot] = SingleFlight()
+        self._watches: dict[str, Any] = {}
+        self._listeners: list[Callable[[ForecastSnapshot], None]] = []
+        self.updates = UpdateNotifier()
+
+    async def get(self, area_id: str) -> ForecastSnapshot | None:
+        """Return the current snapshot for ``area_id``, loading it on a miss."""
+        entry = self._entries.get(area_id)
+        if entry is not None:
+            if entry.pushed and self.is_live(area_id):
+                metrics.CACHE_HIT.inc()
+                return entry.snapshot
+            if time.monotonic() - entry.loaded_at < self._ttl_seconds:
+                metrics.CACHE_HIT.inc()
+                return entry.snapshot
+        metrics.CACHE_MISS.inc()
+        return await self._reads.do(area_id, lambda: self._load(area_id))
+
+    def on_snapshot(self, callback: Callable[[ForecastSnapshot], None]) -> None:
+        """Call ``callback`` with every newly installed snapshot version (any thread)."""
+        self._listeners.append(callback)
+
+    def version(self, area_id: str, version: str) -> ForecastSnapshot | None:
+        """A recently installed snapshot of ``area_id`` by version, or ``None`` once evicted."""
+        for snapshot in reversed(self._history.get(area_id, ())):
+            if snapshot.version == version:
+                return snapshot
+        return None
+
+    def _install(self, snapshot: ForecastSnapshot) -> None:
+        # Rebuilt as a new tuple and swapped in with one assignment, like _entries,
+        # so lookups from the event loop never see it half-updated.
+        kept = [s for s in self._history.get(snapshot.area_id, ()) if s.version != snapshot.version]
+        kept.append(snapshot)
+        self._history[snapshot.area_id] = tuple(kept[-self._versions_kept :])
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception:
+                logger.exception("snapshot_listener_failed", extra={"area_id": snapshot.area_id})
+        self.updates.publish(snapshot)
+
+    def live_snapshot(self, area_id: str) -> ForecastSnapshot | None:
+        """The pushed snapshot for ``area_id`` if its listener is up, without loading."""
+        entry = self._entries.get(area_id)
+        if entry is not None and entry.pushed and self.is_live(area_id):
+            return entry.snapshot
+        return None
+
+    def subscribe(self, area_id: str) -> None:
+        """Start pushing new versions of forecasts/{area_id} into the cache."""
+        if area_id in self._watches:
+            return
+        self._watches[area_id] = watch_forecast_doc(
+            area_id, lambda doc: self._on_push(area_id, doc)
+        )
+        logger.info("forecast_listener_started", extra={"area_id": area_id})
+
+    def is_live(self, area_id: str) -> bool:
+        watch = self._watches.get(area_id)
+        return watch is not None and bool(watch.is_active)
+
+    def close(self) -> None:
+        """Stop all snapshot listeners."""
+        for area_id, watch in list(self._watches.items()):
+            watch.unsubscribe()
+            logger.info("forecast_listener_stopped", extra={"area_id": area_id})
+        self._watches.clear()
+
+    def _on_push(self, area_id: str, doc: dict[str, Any] | None) -> None:
+        """Listener callback (runs on the Firestore listener thread)."""
+        if doc is None:
+            self._entries[area_id] = _Entry(snapshot=None, loaded_at=time.monotonic(), pushed=True)
+            return
+
+        version = doc.get("updated_at_utc", "")
+        current = self._entries.get(area_id)
+        if current is not None and current.snapshot is not None:
+            if current.snapshot.version == version:
+                self._entries[area_id] = _Entry(current.snapshot, time.monotonic(), pushed=True)
+                return
+
+        with metrics.SCORING_DURATION.labels(area_id).time():
+            snapshot = build_snapshot(area_id, doc)
+        # Single dict assignment: readers see either the old snapshot or the new
+        # one, never a forecast paired with another version's scores.
+        self._entries[area_id] = _Entry(snapshot=snapshot, loaded_at=time.monotonic(), pushed=True)
+        self._install(snapshot)
+        logger.info(
+            "snapshot_pushed",
+            extra={"area_id": area_id, "version": version, "hours": len(snapshot.scored_hours)},
+        )
+
+    def invalidate(self, area_id: str | None = None) -> None:
+        if area_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(area_id, None)
+
+    async def _load(self, area_id: str) -> ForecastSnapshot | None:
+        doc = await get_forecast_doc(area_id)
+        if doc is None:
+            self._entries[area_id] = _Entry(snapshot=None, loaded_at=time.monotonic())
+            return None
+
+        version = doc.get("updated_at_utc", "")
+        current = self._entries.get(area_id)
+        if current is not None and current.snapshot is not None:
+            if current.snapshot.version == version:
+                # Unchanged document: keep the scored snapshot, just extend its TTL.
+                current.loaded_at = time.monotonic()
+                return current.snapshot
+
+        async def _score() -> ForecastSnapshot:
+            started = time.perf_counter()
+            snapshot = build_snapshot(area_id, doc)
+            metrics.SCORING_DURATION.labels(area_id).observe(time.perf_counter() - started)
+            logger.info(
+                "snapshot_built",
+                extra={
+                    "area_id": area_id,
+                    "version": version,
+                    "hours": len(snapshot.scored_hours),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                },
+            )
+            return snapshot
+
+        snapshot = await self._scoring.do((area_id, version), _score)
+        self._entries[area_id] = _Entry(snapshot=snapshot, loaded_at=time.monotonic())
+        self._install(snapshot)
+        return snapshot
+
+
+_store: ForecastStore | None = None
+
+
+def get_store() -> ForecastStore:
+    global _store
+    if _store is None:
+        _store = ForecastStore()
+    return _store
+
+
+def set_store(store: ForecastStore | None) -> None:
+    """Override the serving store (for testing). ``None`` resets to a fresh default."""
+    global _store
+    _store = store
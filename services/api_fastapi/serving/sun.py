@@ -0,0 +1,82 @@
+"""Per-area sunrise and sunset tables, built once at startup.
+
+Scoring needs sunrise and sunset for every hour, and ingest does not always
+write the ``daily`` block they normally come from. The tables cover a year of
+dates for each configured area (``Config.AREA_LOCATIONS``) and are computed in
+one pass by ``scoring_engine.solar``, so a lookup is an index into a list.
+Areas without coordinates use the default area's location.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import UTC, date, datetime, timedelta
+
+from scoring_engine.solar import Location, SolarTable, solar_tables
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+TABLE_DAYS = 366
+
+
+def parse_locations(value: str) -> dict[str, Location]:
+    """Parse ``"area_id:lat:lon,area_id:lat:lon"``; malformed entries are skipped."""
+    locations: dict[str, Location] = {}
+    for entry in value.split(","):
+        try:
+            area_id, lat, lon = (part.strip() for part in entry.split(":"))
+            locations[area_id] = Location(float(lat), float(lon))
+        except ValueError:
+            if entry.strip():
+                logger.warning("area_location_invalid", extra={"entry": entry})
+    return locations
+
+
+class SunTables:
+    def __init__(self, locations: dict[str, Location], start: date, days: int = TABLE_DAYS):
+        self._tables = solar_tables(locations, start, days)
+        self._default = self._tables.get(Config.AREA_ID) or next(iter(self._tables.values()))
+
+    def table(self, area_id: str) -> SolarTable:
+        return self._tables.get(area_id, self._default)
+
+    def times(self, area_id: str, d: date) -> tuple[datetime, datetime]:
+        """(sunrise, sunset) in UTC for ``area_id`` on ``d``.
+
+        Without a sunrise or sunset (only beyond the polar circles) the whole
+        day counts as daylight.
+        """
+        sunrise, sunset = self.table(area_id).get(d)
+        midnight = datetime(d.year, d.month, d.day, tzinfo=UTC)
+        return sunrise or midnight, sunset or midnight + timedelta(days=1)
+
+
+_tables: SunTables | None = None
+
+
+def get_sun_tables() -> SunTables:
+    """Tables starting yesterday, built on first use if startup did not build them."""
+    global _tables
+    if _tables is None:
+        locations = parse_locations(Config.AREA_LOCATIONS) or {
+            Config.AREA_ID: Location(32.08, 34.77)
+        }
+        start = datetime.now(UTC).date() - timedelta(days=1)
+        _tables = SunTables(locations, start)
+        logger.info(
+            "sun_tables_built",
+            extra={"areas": sorted(locations), "start": start.isoformat(), "days": TABLE_DAYS},
+        )
+    return _tables
+
+
+def set_sun_tables(tables: SunTables | None) -> None:
+    """Override the tables (tests); ``None`` rebuilds them on next use."""
+    global _tables
+    _tables = tables
+
+
+def sun_times(area_id: str, d: date) -> tuple[datetime, datetime]:
+    return get_sun_tables().times(area_id, d)
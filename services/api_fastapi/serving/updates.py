@@ -0,0 +1,97 @@
+"""Fan-out of new forecast snapshot versions to streaming subscribers.
+
+Snapshots can be installed from the Firestore listener thread or from the
+event loop, so ``publish()`` hands each snapshot to its subscriber's loop with
+``call_soon_threadsafe``. Each subscription keeps a small bounded buffer; a
+slow consumer loses intermediate versions, never the latest one, which is
+enough because deltas are always computed from the last version it was sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import deque
+
+from serving.snapshot import ForecastSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One stream's view of new snapshot versions for an area."""
+
+    def __init__(self, area_id: str, buffer_size: int) -> None:
+        self.area_id = area_id
+        self.dropped = 0
+        self._loop = asyncio.get_running_loop()
+        self._buffer: deque[ForecastSnapshot] = deque(maxlen=buffer_size)
+        self._ready = asyncio.Event()
+
+    def offer(self, snapshot: ForecastSnapshot) -> None:
+        """Queue a snapshot (event-loop thread only)."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(snapshot)
+        self._ready.set()
+
+    def offer_threadsafe(self, snapshot: ForecastSnapshot) -> bool:
+        try:
+            self._loop.call_soon_threadsafe(self.offer, snapshot)
+        except RuntimeError:  # loop closed; the stream is gone
+            return False
+        return True
+
+    async def next(self, timeout: float) -> ForecastSnapshot | None:
+        """Next buffered snapshot, or ``None`` if none arrives within ``timeout``."""
+        if not self._buffer:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except TimeoutError:
+                return None
+        return self._buffer.popleft()
+
+
+class UpdateNotifier:
+    """Registry of subscriptions, keyed by area."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subs: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, area_id: str, buffer_size: int) -> Subscription:
+        sub = Subscription(area_id, buffer_size)
+        with self._lock:
+            self._subs.setdefault(area_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.area_id)
+            if subs is not None:
+                subs.discard(sub)
+
+    def subscriber_count(self, area_id: str | None = None) -> int:
+        with self._lock:
+            if area_id is not None:
+                return len(self._subs.get(area_id, ()))
+            return sum(len(s) for s in self._subs.values())
+
+    def publish(self, snapshot: ForecastSnapshot) -> None:
+        """Deliver ``snapshot`` to every subscriber of its area (any thread)."""
+        with self._lock:
+            subs = list(self._subs.get(snapshot.area_id, ()))
+        for sub in subs:
+            if not sub.offer_threadsafe(snapshot):
+                self.unsubscribe(sub)
+        if subs:
+            logger.info(
+                "snapshot_published",
+                extra={
+                    "area_id": snapshot.area_id,
+                    "version": snapshot.version,
+                    "subscribers": len(subs),
+                },
+            )
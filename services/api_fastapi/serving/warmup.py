@@ -0,0 +1,122 @@
+"""Cold-start warm-up, run by the app lifespan before the instance takes traffic.
+
+uvicorn only starts accepting connections once lifespan startup returns, so
+anything done here is paid before Cloud Run routes the first request. Warm-up
+sends the default requests through the app itself, in process. That creates
+the Firestore client and opens its gRPC channel, loads and scores each area's
+serving doc, and fills the per-version caches. It also runs the request path
+once: routing, query validation, middleware and response serialization.
+
+Warm-up requests carry ``WARMUP_SCOPE_KEY`` in their ASGI scope. They are
+left out of request metrics and bypass admission control, so they neither
+count as traffic nor fill the admission response cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Scope
+
+from config import Config
+from serving.encoding import ARROW_STREAM, MSGPACK, negotiate
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SCOPE_KEY = "go_now.warmup"
+HEALTH_PATH = "/v1/public/health"
+# The default request of each public endpoint, per area.
+AREA_PATHS = (
+    "/v1/public/forecast?area_id={area_id}",
+    "/v1/public/scores?area_id={area_id}",
+    "/v1/public/scores?area_id={area_id}&days=1",
+)
+
+
+def is_warmup(scope: Scope) -> bool:
+    """Whether ``scope`` belongs to a warm-up request."""
+    return bool(scope.get(WARMUP_SCOPE_KEY))
+
+
+async def asgi_get(
+    app: ASGIApp,
+    target: str,
+    headers: list[tuple[bytes, bytes]] | None = None,
+    warmup: bool = False,
+) -> int:
+    """Send one in-process GET to ``app`` (with extra ``headers``); return the response status."""
+    path, _, query = target.partition("?")
+    scope: dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"warmup"), (b"user-agent", b"go-now-warmup"), *(headers or [])],
+        "client": None,
+        "server": None,
+        WARMUP_SCOPE_KEY: warmup,
+    }
+    status = 0
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _warm_area(app: ASGIApp, area_id: str) -> dict[str, int]:
+    statuses = {}
+    for template in AREA_PATHS:
+        target = template.format(area_id=area_id)
+        statuses[target] = await asgi_get(app, target, warmup=True)
+    return statuses
+
+
+async def warm_up(app: ASGIApp, area_ids: Iterable[str]) -> dict[str, int]:
+    """Issue the default requests for ``area_ids``; return each target's status.
+
+    Areas are warmed concurrently. The whole phase is bounded by
+    ``Config.WARMUP_TIMEOUT_SECONDS``. A failed or slow warm-up is logged and
+    never blocks startup: the instance then warms on its first real requests.
+    """
+    started = time.perf_counter()
+    statuses: dict[str, int] = {}
+    # Resolve which optional encoders are installed (a filesystem scan) now.
+    negotiate(f"{MSGPACK}, {ARROW_STREAM}")
+
+    async def _run() -> None:
+        statuses[HEALTH_PATH] = await asgi_get(app, HEALTH_PATH, warmup=True)
+        for result in await asyncio.gather(*(_warm_area(app, a) for a in area_ids)):
+            statuses.update(result)
+
+    try:
+        await asyncio.wait_for(_run(), timeout=Config.WARMUP_TIMEOUT_SECONDS)
+    except Exception:
+        logger.exception(
+            "warmup_failed",
+            extra={"duration_ms": round((time.perf_counter() - started) * 1000, 2)},
+        )
+        return statuses
+    logger.info(
+        "warmup_complete",
+        extra={
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "statuses": statuses,
+        },
+    )
+    return statuses
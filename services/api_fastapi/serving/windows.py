@@ -0,0 +1,97 @@
+"""Good activity windows, following the Minimum Recommendation Window rule.
+
+A window is a run of consecutive forecast hours whose score is at least
+``min_score`` and that lasts at least ``min_hours``. Windows are ranked by
+average score, earliest start breaking ties, and the top two per local day
+become the "best" and "backup" windows (docs/04, docs/06).
+
+Windows are found over the Balanced-preset scores already held by the
+snapshot, once per (version, mode, rule, first future hour), and kept in the
+snapshot's bounded variant cache since the rule comes from the query.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, tzinfo
+
+from scoring_engine.engine import score_to_label
+
+from serving.snapshot import ForecastSnapshot
+
+_HOUR = 3600
+WINDOWS_PER_DAY = 2
+
+
+@dataclass(frozen=True)
+class Window:
+    start: int  # epoch seconds of the first hour
+    hours: int
+    avg_score: float
+    peak_score: int
+
+    @property
+    def end(self) -> int:
+        return self.start + self.hours * _HOUR
+
+    @property
+    def label(self) -> str:
+        return score_to_label(round(self.avg_score))
+
+    def rank_key(self) -> tuple[float, int]:
+        return (-self.avg_score, self.start)
+
+
+def find_windows(
+    epochs: list[int], scores: list[int], min_score: int, min_hours: int
+) -> list[Window]:
+    """Qualifying windows in chronological order. A gap in ``epochs`` ends a run."""
+    windows: list[Window] = []
+    run: list[int] = []
+    run_start = prev = 0
+
+    def _close() -> None:
+        if len(run) >= min_hours:
+            windows.append(Window(run_start, len(run), sum(run) / len(run), max(run)))
+
+    for epoch, score in zip(epochs, scores, strict=True):
+        if run and (score < min_score or epoch - prev != _HOUR):
+            _close()
+            run = []
+        if score >= min_score:
+            if not run:
+                run_start = epoch
+            run.append(score)
+        prev = epoch
+    _close()
+    return windows
+
+
+def best_per_day(windows: list[Window], tz: tzinfo) -> dict[str, list[Window]]:
+    """Top ``WINDOWS_PER_DAY`` windows per local start date, ranked best first."""
+    days: dict[str, list[Window]] = {}
+    for window in windows:
+        day = datetime.fromtimestamp(window.start, UTC).astimezone(tz).date().isoformat()
+        days.setdefault(day, []).append(window)
+    return {
+        day: sorted(candidates, key=Window.rank_key)[:WINDOWS_PER_DAY]
+        for day, candidates in days.items()
+    }
+
+
+def mode_windows(
+    snapshot: ForecastSnapshot,
+    mode: str,
+    min_score: int,
+    min_hours: int,
+    start: int,
+    tz: tzinfo,
+) -> tuple[list[Window], dict[str, list[Window]]]:
+    """Windows for ``mode`` from hour index ``start`` on, and the best two per day."""
+
+    def _build() -> tuple[list[Window], dict[str, list[Window]]]:
+        scores = [hour[mode].score for hour in snapshot.score()[start:]]
+        windows = find_windows(snapshot.hour_epochs[start:], scores, min_score, min_hours)
+        return windows, best_per_day(windows, tz)
+
+    return snapshot.memo_variant(("windows", mode, min_score, min_hours, start, str(tz)), _build)
@@ -1,20 +1,52 @@
-"""Firestore client for reading forecast and user profile documents."""
+"""Firestore client for reading forecast and user profile documents.
+
+The google-cloud-firestore ``Client`` is synchronous. Every call is run on a
+dedicated thread pool so a slow Firestore round trip never blocks the event
+loop, and each call is bounded by ``Config.FIRESTORE_TIMEOUT_SECONDS``.
+
+``google.cloud.firestore`` (and grpc beneath it) is imported on first client
+creation rather than at module import; it is the largest single import cost.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from google.cloud import firestore
+from config import Config
+from telemetry import context as request_context
+from telemetry import metrics
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 _client: firestore.Client | None = None
+_executor: ThreadPoolExecutor | None = None
+
+
+class FirestoreTimeoutError(Exception):
+    """A Firestore call did not complete within its deadline."""
+
+    def __init__(self, op: str, collection: str, timeout_s: float) -> None:
+        super().__init__(f"Firestore {op} on '{collection}' exceeded {timeout_s}s deadline")
+        self.op = op
+        self.collection = collection
+        self.timeout_s = timeout_s
 
 
 def get_client() -> firestore.Client:
     global _client
     if _client is None:
+        from google.cloud import firestore
+
         _client = firestore.Client()
     return _client
 
@@ -25,39 +57,128 @@ def set_client(client: firestore.Client) -> None:
     _client = client
 
 
-def get_forecast_doc(area_id: str) -> dict[str, Any] | None:
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=Config.FIRESTORE_MAX_WORKERS, thread_name_prefix="firestore"
+        )
+    return _executor
+
+
+async def _run(op: str, collection: str, fn: Callable[[], T]) -> T:
+    """Run a blocking Firestore call on the storage thread pool with a deadline."""
+    timeout_s = Config.FIRESTORE_TIMEOUT_SECONDS
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(_get_executor(), fn), timeout=timeout_s
+        )
+    except TimeoutError as exc:
+        status = "timeout"
+        raise FirestoreTimeoutError(op, collection, timeout_s) from exc
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        duration_s = time.perf_counter() - started
+        if op == "get":
+            metrics.FIRESTORE_READ_DURATION.labels(collection).observe(duration_s)
+        request_context.add_timing("firestore", duration_s)
+        duration_ms = duration_s * 1000
+        log = logger.warning if status != "ok" else logger.debug
+        log(
+            "firestore_call",
+            extra={
+                "op": op,
+                "collection": collection,
+                "status": status,
+                "duration_ms": round(duration_ms, 2),
+            },
+        )
+
+
+async def get_forecast_doc(area_id: str) -> dict[str, Any] | None:
     """Read the forecasts/{area_id} serving document."""
-    client = get_client()
-    doc_ref = client.collection("forecasts").document(area_id)
-    doc = doc_ref.get()
-    if not doc.exists:
-        return None
-    return doc.to_dict()
 
+    def _read() -> dict[str, Any] | None:
+        doc_ref = get_client().collection("forecasts").document(area_id)
+        doc = doc_ref.get(timeout=Config.FIRESTORE_TIMEOUT_SECONDS)
+        if not doc.exists:
+            return None
+        return doc.to_dict()
+
+    return await _run("get", "forecasts", _read)
+
+
+async def get_health_doc(area_id: str) -> dict[str, Any] | None:
+    """Read the health/{area_id} summary the ingest worker writes with each forecast."""
+
+    def _read() -> dict[str, Any] | None:
+        doc_ref = get_client().collection("health").document(area_id)
+        doc = doc_ref.get(timeout=Config.FIRESTORE_TIMEOUT_SECONDS)
+        if not doc.exists:
+            return None
+        return doc.to_dict()
+
+    return await _run("get", "health", _read)
 
-def get_user_profile(user_id: str) -> dict[str, Any] | None:
+
+def watch_forecast_doc(
+    area_id: str, on_change: Callable[[dict[str, Any] | None], None]
+) -> Any:
+    """Subscribe to snapshots of forecasts/{area_id}.
+
+    ``on_change`` receives the document dict (or ``None`` if it does not exist)
+    once with the current state and again on every change. It runs on the
+    SDK's listener thread, not the event loop. Returns the watch handle; call
+    ``unsubscribe()`` on it to stop listening.
+    """
+    doc_ref = get_client().collection("forecasts").document(area_id)
+
+    def _on_snapshot(docs: list[Any], changes: Any, read_time: Any) -> None:
+        try:
+            on_change(docs[-1].to_dict() if docs and docs[-1].exists else None)
+        except Exception:
+            logger.exception("firestore_listener_callback_failed", extra={"area_id": area_id})
+
+    return doc_ref.on_snapshot(_on_snapshot)
+
+
+async def get_user_profile(user_id: str) -> dict[str, Any] | None:
     """Read the users/{user_id} profile document."""
-    client = get_client()
-    doc_ref = client.collection("users").document(user_id)
-    doc = doc_ref.get()
-    if not doc.exists:
-        return None
-    return doc.to_dict()
 
+    def _read() -> dict[str, Any] | None:
+        doc_ref = get_client().collection("users").document(user_id)
+        doc = doc_ref.get(timeout=Config.FIRESTORE_TIMEOUT_SECONDS)
+        if not doc.exists:
+            return None
+        return doc.to_dict()
 
-def set_user_profile(user_id: str, data: dict[str, Any]) -> None:
-    """Write the users/{user_id} profile document (upsert)."""
-    client = get_client()
-    doc_ref = client.collection("users").document(user_id)
-    doc_ref.set(data, merge=True)
+    return await _run("get", "users", _read)
 
 
-def delete_user_profile(user_id: str) -> bool:
+async def set_user_profile(user_id: str, data: dict[str, Any], merge: bool = True) -> None:
+    """Write the users/{user_id} profile document (upsert; ``merge=False`` replaces it)."""
+
+    def _write() -> None:
+        doc_ref = get_client().collection("users").document(user_id)
+        doc_ref.set(data, merge=merge, timeout=Config.FIRESTORE_TIMEOUT_SECONDS)
+
+    await _run("set", "users", _write)
+
+
+async def delete_user_profile(user_id: str) -> bool:
     """Delete the users/{user_id} profile document. Returns True if existed."""
-    client = get_client()
-    doc_ref = client.collection("users").document(user_id)
-    doc = doc_ref.get()
-    if not doc.exists:
-        return False
-    doc_ref.delete()
-    return True
+
+    def _delete() -> bool:
+        doc_ref = get_client().collection("users").document(user_id)
+        doc = doc_ref.get(timeout=Config.FIRESTORE_TIMEOUT_SECONDS)
+        if not doc.exists:
+            return False
+        doc_ref.delete(timeout=Config.FIRESTORE_TIMEOUT_SECONDS)
+        return True
+
+    return await _run("delete", "users", _delete)
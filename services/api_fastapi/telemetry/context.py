@@ -0,0 +1,103 @@
+"""Per-request context shared between the middleware and route handlers.
+
+The middleware installs a fresh ``RequestContext`` before calling the app.
+Handlers, and tasks they start, run in a copy of that context, so they see
+the same object and can annotate it: the error code of the envelope they
+return, and, when timing is on, how long each serving stage took.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from types import TracebackType
+
+_current: ContextVar[RequestContext | None] = ContextVar("request_context", default=None)
+
+# Request ids are "<instance>-<counter>": a random prefix drawn once per process,
+# then a counter in hex. Unique across instances and workers, at the cost of an
+# increment instead of a uuid4 per request.
+_INSTANCE = os.urandom(6).hex()
+_sequence = itertools.count(1)
+
+
+@dataclass
+class RequestContext:
+    request_id: str
+    error_code: str | None = None
+    # Stage name -> seconds; None unless Server-Timing was requested.
+    timings: dict[str, float] | None = None
+
+
+def new_request_id() -> str:
+    return f"{_INSTANCE}-{next(_sequence):x}"
+
+
+def begin(request_id: str, timing: bool = False) -> RequestContext:
+    ctx = RequestContext(request_id=request_id, timings={} if timing else None)
+    _current.set(ctx)
+    return ctx
+
+
+def current() -> RequestContext | None:
+    return _current.get()
+
+
+def request_id() -> str:
+    """Id of the current request, or a fresh one outside a request."""
+    ctx = _current.get()
+    return ctx.request_id if ctx is not None else new_request_id()
+
+
+def note_error(code: str) -> None:
+    """Record the error envelope code of the response being built, if in a request."""
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.error_code = code
+
+
+def add_timing(name: str, seconds: float) -> None:
+    """Add ``seconds`` to stage ``name`` of the current request, if it is being timed."""
+    ctx = _current.get()
+    if ctx is not None and ctx.timings is not None:
+        ctx.timings[name] = ctx.timings.get(name, 0.0) + seconds
+
+
+class stage:  # noqa: N801 - used like a function: ``with stage("score"):``
+    """Time a block as stage ``name``. Costs one context lookup when timing is off."""
+
+    __slots__ = ("_name", "_timings", "_started")
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        ctx = _current.get()
+        self._timings = ctx.timings if ctx is not None else None
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        if self._timings is not None:
+            self._started = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._timings is not None:
+            elapsed = time.perf_counter() - self._started
+            self._timings[self._name] = self._timings.get(self._name, 0.0) + elapsed
+
+
+def timings_ms(ctx: RequestContext) -> dict[str, float]:
+    return {name: round(seconds * 1000, 2) for name, seconds in (ctx.timings or {}).items()}
+
+
+def server_timing(ctx: RequestContext, total_s: float) -> str:
+    """``Server-Timing`` header value: each recorded stage, then ``total``."""
+    parts = [f"{name};dur={ms}" for name, ms in timings_ms(ctx).items()]
+    parts.append(f"total;dur={round(total_s * 1000, 2)}")
+    return ", ".join(parts)
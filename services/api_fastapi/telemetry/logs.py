@@ -0,0 +1,55 @@
+"""JSON log lines for Cloud Logging (docs/13_observability_data_quality.md).
+
+Each record becomes one JSON object with ``severity``, ``message`` and every
+``extra={...}`` field. Records emitted while a request is being served carry
+its ``request_id``, the same value returned in the ``X-Request-ID`` header.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import UTC, datetime
+
+from telemetry import context as request_context
+
+# Attributes every LogRecord has; anything else came from ``extra``.
+_RESERVED = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request's id to records logged while serving it."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            ctx = request_context.current()
+            if ctx is not None:
+                record.request_id = ctx.request_id
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "severity": record.levelname,
+            "service": "api_fastapi",
+            "component": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((k, v) for k, v in vars(record).items() if k not in _RESERVED)
+        if record.exc_info:
+            entry["error"] = {
+                "type": record.exc_info[0].__name__ if record.exc_info[0] else "",
+                "message": str(record.exc_info[1]),
+                "stack_trace": self.formatException(record.exc_info),
+            }
+        return json.dumps(entry, default=str)
+
+
+def configure(level: str) -> None:
+    """Send JSON lines with request ids to stderr at ``level``."""
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(RequestIdFilter())
+    logging.basicConfig(level=getattr(logging, level), handlers=[handler])
@@ -0,0 +1,84 @@
+"""Prometheus metrics for the API service (docs/13_observability_data_quality.md).
+
+Metrics live in the default registry and are exposed on ``/metrics``. Counters
+are exported with the ``_total`` suffix, e.g. ``api_request_count_total``.
+Label values are bounded: ``endpoint`` is the matched route template, never
+the raw path.
+"""
+
+from __future__ import annotations
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Histogram,
+    disable_created_metrics,
+    generate_latest,
+)
+
+# The *_created series double the exposition size and carry no signal here.
+disable_created_metrics()
+
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.5, 1.0, 2.5, 5.0)
+_FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+REQUEST_DURATION = Histogram(
+    "api_request_duration_seconds",
+    "Request latency",
+    ["endpoint", "method", "status_code"],
+    buckets=_LATENCY_BUCKETS,
+)
+REQUEST_COUNT = Counter(
+    "api_request_count", "Request count", ["endpoint", "method", "status_code"]
+)
+ERROR_COUNT = Counter("api_error_count", "Error responses (4xx, 5xx)", ["endpoint", "error_code"])
+FIRESTORE_READ_DURATION = Histogram(
+    "firestore_read_duration_seconds",
+    "Firestore read latency",
+    ["collection"],
+    buckets=_LATENCY_BUCKETS,
+)
+SCORING_DURATION = Histogram(
+    "scoring_duration_seconds",
+    "Time to build and score one forecast snapshot",
+    ["area_id"],
+    buckets=_LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "forecast_cache_lookups",
+    "Serving cache lookups; hit ratio = hit / (hit + miss)",
+    ["result"],
+)
+SERIALIZATION_DURATION = Histogram(
+    "api_serialization_duration_seconds",
+    "Time to encode a response body",
+    ["format"],
+    buckets=_FAST_BUCKETS,
+)
+
+ADMISSION_DECISIONS = Counter(
+    "api_admission_decisions",
+    "Requests subject to admission control, by outcome (admitted, cached, shed)",
+    ["result"],
+)
+
+CACHE_HIT = CACHE_LOOKUPS.labels(result="hit")
+CACHE_MISS = CACHE_LOOKUPS.labels(result="miss")
+ADMISSION_ADMITTED = ADMISSION_DECISIONS.labels(result="admitted")
+ADMISSION_CACHED = ADMISSION_DECISIONS.labels(result="cached")
+ADMISSION_SHED = ADMISSION_DECISIONS.labels(result="shed")
+
+
+def observe_request(
+    endpoint: str, method: str, status_code: int, duration_s: float, error_code: str | None
+) -> None:
+    status = str(status_code)
+    REQUEST_DURATION.labels(endpoint, method, status).observe(duration_s)
+    REQUEST_COUNT.labels(endpoint, method, status).inc()
+    if status_code >= 400:
+        ERROR_COUNT.labels(endpoint, error_code or status).inc()
+
+
+def render() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,105 @@
+"""Per-request telemetry as one pure ASGI middleware.
+
+For every HTTP request it:
+
+- assigns a request id (``context.new_request_id``), exposed to handlers
+  as ``request.state.request_id`` and to clients as ``X-Request-ID``;
+- installs the ``RequestContext`` that handlers annotate with error codes
+  and stage timings;
+- on the response start, records request metrics (except for warm-up
+  requests) and, when timing is on, adds ``Server-Timing`` and logs an
+  ``api_request`` line.
+
+It only wraps ``send``: the request and response bodies pass through
+untouched, and the app runs in the same task. ``@app.middleware("http")``
+(``BaseHTTPMiddleware``) instead builds a ``Request``, runs the app in a
+separate task, and streams the body through a memory channel for every
+request.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import Config
+from serving.warmup import is_warmup
+from telemetry import context as request_context
+from telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _wants_timing(scope: Scope) -> bool:
+    if Config.SERVER_TIMING_ENABLED:
+        return True
+    if not Config.SERVER_TIMING_ALLOW_HEADER:
+        return False
+    return (b"x-server-timing", b"1") in scope["headers"]
+
+
+class RequestTelemetryMiddleware:
+    """Request id, request context, metrics and ``Server-Timing`` for each HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = request_context.new_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+        timing = _wants_timing(scope)
+        ctx = request_context.begin(request_id, timing=timing)
+        started = time.perf_counter()
+        responded = False
+
+        async def _send(message: Message) -> None:
+            nonlocal responded
+            if message["type"] == "http.response.start":
+                responded = True
+                duration_s = time.perf_counter() - started
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode()))
+                if timing:
+                    value = request_context.server_timing(ctx, duration_s)
+                    headers.append((b"server-timing", value.encode()))
+                message = {**message, "headers": headers}
+                _record(scope, message["status"], duration_s, ctx, timing)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        except Exception:
+            if not responded:  # the server answers 500 outside this middleware
+                _record(scope, 500, time.perf_counter() - started, ctx, timing)
+            raise
+
+
+def _record(
+    scope: Scope,
+    status_code: int,
+    duration_s: float,
+    ctx: request_context.RequestContext,
+    timing: bool,
+) -> None:
+    # The router stores the matched route in the shared scope; unmatched paths
+    # share one label so arbitrary URLs cannot grow the series count.
+    endpoint = getattr(scope.get("route"), "path", "unmatched")
+    if Config.METRICS_ENABLED and not is_warmup(scope):
+        metrics.observe_request(endpoint, scope["method"], status_code, duration_s, ctx.error_code)
+    if timing:
+        logger.info(
+            "api_request",
+            extra={
+                "endpoint": endpoint,
+                "method": scope["method"],
+                "status_code": status_code,
+                "duration_ms": round(duration_s * 1000, 2),
+                "stages_ms": request_context.timings_ms(ctx),
+            },
+        )
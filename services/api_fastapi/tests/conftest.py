@@ -2,14 +2,30 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import functools
+import json
+import time
+from collections.abc import Callable, Iterator, Mapping
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import jwt
 import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
 from fastapi.testclient import TestClient
 
 import storage.firestore as firestore_module
+from auth.firebase import SigningKeys, TokenVerifier, set_token_verifier
+from config import Config
 from main import app
+from serving.admission import set_admission
+from serving.health import set_health_cache
+from serving.personal import set_personal_scores
+from serving.profiles import set_profile_cache
+from serving.store import set_store
 
 
 class FakeFirestoreDoc:
@@ -23,54 +39,110 @@ class FakeFirestoreDoc:
         return self._data
 
 
+class FakeWatch:
+    """Fake snapshot listener handle (mirrors google.cloud.firestore_v1.watch.Watch)."""
+
+    def __init__(self, client: FakeFirestoreClient, key: tuple[str, str], callback: Any) -> None:
+        self._client = client
+        self._key = key
+        self.callback = callback
+        self.is_active = True
+
+    def unsubscribe(self) -> None:
+        self.is_active = False
+        self._client._listeners.get(self._key, []).remove(self)
+
+
 class FakeFirestoreDocRef:
     """Fake Firestore document reference."""
 
-    def __init__(self, data: dict[str, Any] | None = None) -> None:
-        self._data = data
+    def __init__(self, client: FakeFirestoreClient, collection: str, doc_id: str) -> None:
+        self._client = client
+        self._collection = collection
+        self._doc_id = doc_id
 
-    def get(self) -> FakeFirestoreDoc:
-        return FakeFirestoreDoc(self._data)
+    def get(self, timeout: float | None = None) -> FakeFirestoreDoc:
+        self._client.reads.append((self._collection, self._doc_id))
+        if self._client.latency_s:
+            time.sleep(self._client.latency_s)  # blocking, like the real sync client
+        docs = self._client._collections.get(self._collection, {})
+        return FakeFirestoreDoc(docs.get(self._doc_id))
 
-    def set(self, data: dict, merge: bool = False) -> None:
-        self._data = data
+    def set(self, data: dict, merge: bool = False, timeout: float | None = None) -> None:
+        self._client.push(self._collection, self._doc_id, data)
+
+    def delete(self, timeout: float | None = None) -> None:
+        self._client.push(self._collection, self._doc_id, None)
 
-    def delete(self) -> None:
-        self._data = None
+    def on_snapshot(self, callback: Any) -> FakeWatch:
+        """Register a listener; like the real SDK, it fires once with the current state."""
+        watch = FakeWatch(self._client, (self._collection, self._doc_id), callback)
+        self._client._listeners.setdefault((self._collection, self._doc_id), []).append(watch)
+        self._client._notify(watch, self._collection, self._doc_id)
+        return watch
 
 
 class FakeFirestoreCollection:
     """Fake Firestore collection."""
 
-    def __init__(self, docs: dict[str, dict[str, Any]]) -> None:
-        self._docs = docs
+    def __init__(self, client: FakeFirestoreClient, name: str) -> None:
+        self._client = client
+        self._name = name
 
     def document(self, doc_id: str) -> FakeFirestoreDocRef:
-        return FakeFirestoreDocRef(self._docs.get(doc_id))
+        return FakeFirestoreDocRef(self._client, self._name, doc_id)
 
 
 class FakeFirestoreClient:
-    """Fake Firestore client that returns pre-configured data."""
+    """Fake Firestore client that returns pre-configured data.
 
-    def __init__(self, collections: dict[str, dict[str, dict[str, Any]]]) -> None:
+    ``latency_s`` makes every document read block for that long, to simulate
+    slow Firestore round trips; ``reads`` records every (collection, doc_id)
+    read. ``push()`` writes a document and fires its
+    snapshot listeners synchronously.
+    """
+
+    def __init__(
+        self, collections: dict[str, dict[str, dict[str, Any]]], latency_s: float = 0.0
+    ) -> None:
         self._collections = collections
+        self._listeners: dict[tuple[str, str], list[FakeWatch]] = {}
+        self.latency_s = latency_s
+        self.reads: list[tuple[str, str]] = []
 
     def collection(self, name: str) -> FakeFirestoreCollection:
-        return FakeFirestoreCollection(self._collections.get(name, {}))
+        return FakeFirestoreCollection(self, name)
+
+    def push(self, collection: str, doc_id: str, data: dict[str, Any] | None) -> None:
+        docs = self._collections.setdefault(collection, {})
+        if data is None:
+            docs.pop(doc_id, None)
+        else:
+            docs[doc_id] = data
+        for watch in list(self._listeners.get((collection, doc_id), [])):
+            self._notify(watch, collection, doc_id)
+
+    def _notify(self, watch: FakeWatch, collection: str, doc_id: str) -> None:
+        data = self._collections.get(collection, {}).get(doc_id)
+        docs = [FakeFirestoreDoc(data)] if data is not None else []
+        watch.callback(docs, [], datetime.now(UTC))
 
 
 def make_forecast_doc(
     age_minutes: int = 10,
     ingest_status: str = "success",
     hours_count: int = 168,
+    base_time: datetime | None = None,
 ) -> dict[str, Any]:
-    """Create a sample forecast document."""
-    from datetime import timedelta
+    """Create a sample forecast document.
 
+    Hours start at ``base_time`` (default 2025-06-01 00:00 UTC).
+    """
     updated_at = datetime.now(UTC) - timedelta(minutes=age_minutes)
 
     hours = []
-    base_time = datetime(2025, 6, 1, 0, 0, 0, tzinfo=UTC)
+    if base_time is None:
+        base_time = datetime(2025, 6, 1, 0, 0, 0, tzinfo=UTC)
     for i in range(hours_count):
         h = base_time + timedelta(hours=i)
         hours.append(
@@ -111,6 +183,82 @@ def make_forecast_doc(
     }
 
 
+def make_current_doc(age_minutes: int = 10, hours_back: int = 3) -> dict[str, Any]:
+    """A forecast document whose hours start ``hours_back`` hours before the current hour."""
+    start = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+    return make_forecast_doc(age_minutes=age_minutes, base_time=start - timedelta(hours=hours_back))
+
+
+TEST_KEY_ID = "test-key"
+
+
+@functools.cache
+def _test_signing_key() -> tuple[rsa.RSAPrivateKey, str]:
+    """RSA key and its self-signed certificate (PEM), generated once per run."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.test")])
+    now = datetime.now(UTC)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    return key, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+def fake_keys_fetch(
+    headers: Mapping[str, str] | None = None,
+) -> Callable[[str], tuple[Mapping[str, str], bytes]]:
+    """A ``SigningKeys`` fetch serving the test certificate, like Google's key-set endpoint."""
+    body = json.dumps({TEST_KEY_ID: _test_signing_key()[1]}).encode()
+    response_headers = headers or {"cache-control": "public, max-age=3600"}
+    return lambda url: (response_headers, body)
+
+
+def make_id_token(sub: str, expires_in: float = 3600, kid: str = TEST_KEY_ID, **claims: Any) -> str:
+    """A Firebase-style ID token for ``sub``, signed with the test key."""
+    now = int(time.time())
+    payload = {
+        "iss": f"https://securetoken.google.com/{Config.FIREBASE_PROJECT_ID}",
+        "aud": Config.FIREBASE_PROJECT_ID,
+        "sub": sub,
+        "iat": now,
+        "auth_time": now,
+        "exp": now + expires_in,
+        **claims,
+    }
+    return jwt.encode(payload, _test_signing_key()[0], algorithm="RS256", headers={"kid": kid})
+
+
+def make_verifier(**kwargs: Any) -> TokenVerifier:
+    """A ``TokenVerifier`` trusting the test key instead of Google's."""
+    return TokenVerifier(keys=SigningKeys(fetch=fake_keys_fetch()), **kwargs)
+
+
+def install_fake_client(fake_client: FakeFirestoreClient | None) -> None:
+    """Point the storage layer at ``fake_client`` and drop any cached snapshots and responses."""
+    firestore_module.set_client(fake_client)  # type: ignore[arg-type]
+    set_store(None)
+    set_health_cache(None)
+    set_admission(None)
+    set_profile_cache(None)
+    set_personal_scores(None)
+    set_token_verifier(None)
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    """Test client over a current forecast document (hours from 3h ago)."""
+    install_fake_client(FakeFirestoreClient({"forecasts": {"tel_aviv_coast": make_current_doc()}}))
+    yield TestClient(app)
+    install_fake_client(None)
+
+
 @pytest.fixture
 def client_with_forecast():
     """Test client with a fresh forecast document in Firestore."""
@@ -118,9 +266,9 @@ def client_with_forecast():
     fake_client = FakeFirestoreClient(
         {"forecasts": {"tel_aviv_coast": doc}}
     )
-    firestore_module.set_client(fake_client)  # type: ignore[arg-type]
+    install_fake_client(fake_client)
     yield TestClient(app)
-    firestore_module.set_client(None)  # type: ignore[arg-type]
+    install_fake_client(None)
 
 
 @pytest.fixture
@@ -130,15 +278,15 @@ def client_with_stale_forecast():
     fake_client = FakeFirestoreClient(
         {"forecasts": {"tel_aviv_coast": doc}}
     )
-    firestore_module.set_client(fake_client)  # type: ignore[arg-type]
+    install_fake_client(fake_client)
     yield TestClient(app)
-    firestore_module.set_client(None)  # type: ignore[arg-type]
+    install_fake_client(None)
 
 
 @pytest.fixture
 def client_no_forecast():
     """Test client with no forecast document in Firestore."""
     fake_client = FakeFirestoreClient({"forecasts": {}})
-    firestore_module.set_client(fake_client)  # type: ignore[arg-type]
+    install_fake_client(fake_client)
     yield TestClient(app)
-    firestore_module.set_client(None)  # type: ignore[arg-type]
+    install_fake_client(None)
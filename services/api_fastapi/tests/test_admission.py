@@ -0,0 +1,122 @@
+"""Tests for admission control and load shedding."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Config
+from serving.admission import AdmissionController, set_admission
+
+SCORES = "/v1/public/scores?area_id=tel_aviv_coast&days=1"
+
+
+@pytest.fixture
+def controller(client: TestClient) -> Iterator[AdmissionController]:
+    # After install_fake_client, which resets the process-wide controller.
+    controller = AdmissionController(min_in_flight=1, max_in_flight=2, target_lag_s=0.02)
+    set_admission(controller)
+    yield controller
+    set_admission(None)
+
+
+def _saturate(controller: AdmissionController) -> None:
+    while controller.try_acquire():
+        pass
+
+
+class TestAdmissionController:
+    def test_caps_in_flight(self, controller: AdmissionController) -> None:
+        assert controller.try_acquire()
+        assert controller.try_acquire()
+        assert not controller.try_acquire()
+        controller.release()
+        assert controller.try_acquire()
+
+    def test_limit_shrinks_under_lag_and_recovers(self) -> None:
+        controller = AdmissionController(min_in_flight=4, max_in_flight=64, target_lag_s=0.02)
+        for _ in range(100):
+            controller.observe_lag(0.2)
+        assert int(controller.limit) == 4
+        controller.observe_lag(0.001)
+        assert int(controller.limit) == 5
+        for _ in range(100):
+            controller.observe_lag(0.001)
+        assert int(controller.limit) == 64
+
+
+class TestAdmissionMiddleware:
+    def test_sheds_with_retry_after_when_nothing_cached(
+        self, client: TestClient, controller: AdmissionController
+    ) -> None:
+        _saturate(controller)
+        resp = client.get(SCORES)
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == str(Config.ADMISSION_RETRY_AFTER_SECONDS)
+        assert resp.json()["error"]["code"] == "OVERLOADED"
+        assert resp.json()["request_id"] == resp.headers["x-request-id"]
+
+    def test_serves_cached_response_when_overloaded(
+        self, client: TestClient, controller: AdmissionController
+    ) -> None:
+        fresh = client.get(SCORES)
+        assert fresh.status_code == 200
+        _saturate(controller)
+        cached = client.get(SCORES)
+        assert cached.status_code == 200
+        assert cached.content == fresh.content
+        assert cached.headers["age"] == "0"
+        assert "x-request-id" in cached.headers
+        # Another query has no cached response of its own.
+        assert client.get(SCORES.replace("days=1", "days=2")).status_code == 503
+
+    def test_lagging_loop_serves_cached_below_the_cap(
+        self, client: TestClient, controller: AdmissionController
+    ) -> None:
+        fresh = client.get(SCORES)
+        controller.observe_lag(1.0)
+        assert controller.in_flight == 0
+        cached = client.get(SCORES)
+        assert cached.headers["age"] == "0"
+        assert cached.content == fresh.content
+        # Nothing cached: admitted while under the cap.
+        assert client.get(SCORES.replace("days=1", "days=2")).status_code == 200
+
+    def test_cached_response_expires(
+        self, client: TestClient, controller: AdmissionController, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client.get(SCORES)
+        _saturate(controller)
+        monkeypatch.setattr(Config, "ADMISSION_STALE_SECONDS", -1)
+        assert client.get(SCORES).status_code == 503
+
+    def test_errors_are_not_cached(
+        self, client: TestClient, controller: AdmissionController
+    ) -> None:
+        missing = "/v1/public/scores?area_id=nowhere"
+        assert client.get(missing).status_code == 404
+        _saturate(controller)
+        assert client.get(missing).status_code == 503
+
+    def test_health_always_admitted(
+        self, client: TestClient, controller: AdmissionController
+    ) -> None:
+        _saturate(controller)
+        assert client.get("/v1/public/health").status_code == 200
+        assert controller.in_flight == 2
+
+    def test_admitted_requests_release_their_slot(
+        self, client: TestClient, controller: AdmissionController
+    ) -> None:
+        for _ in range(5):
+            assert client.get(SCORES).status_code == 200
+        assert controller.in_flight == 0
+
+    def test_disabled(
+        self, client: TestClient, controller: AdmissionController, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "ADMISSION_ENABLED", False)
+        _saturate(controller)
+        assert client.get(SCORES).status_code == 200
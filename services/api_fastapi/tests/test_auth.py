@@ -0,0 +1,174 @@
+"""Tests for Firebase ID-token verification: signing-key and claims caching."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from collections.abc import Mapping
+
+import pytest
+from fastapi.testclient import TestClient
+
+from auth.firebase import (
+    AuthError,
+    SigningKeys,
+    SigningKeysUnavailableError,
+    TokenVerifier,
+    max_age_seconds,
+    set_token_verifier,
+)
+from tests.conftest import (
+    fake_keys_fetch,
+    make_id_token,
+    make_verifier,
+)
+
+
+class CountingFetch:
+    """Key-set fetch that records calls and can be switched to failing."""
+
+    def __init__(self, headers: Mapping[str, str] | None = None) -> None:
+        self._fetch = fake_keys_fetch(headers)
+        self.calls = 0
+        self.failing = False
+
+    def __call__(self, url: str) -> tuple[Mapping[str, str], bytes]:
+        self.calls += 1
+        if self.failing:
+            raise OSError("connection refused")
+        return self._fetch(url)
+
+
+def _verifier(fetch: CountingFetch, **kwargs: float) -> TokenVerifier:
+    return TokenVerifier(keys=SigningKeys(fetch=fetch, min_refresh_seconds=60), **kwargs)
+
+
+class TestMaxAge:
+    @pytest.mark.parametrize(
+        "headers,expected",
+        [
+            ({"cache-control": "public, max-age=19742, must-revalidate, no-transform"}, 19742),
+            ({"cache-control": "public, max-age=3600", "age": "600"}, 3000),
+            ({"cache-control": "max-age=60", "age": "120"}, 0),
+            ({"cache-control": "no-cache"}, 0),
+            ({}, 0),
+        ],
+    )
+    def test_remaining_freshness(self, headers: dict[str, str], expected: float) -> None:
+        assert max_age_seconds(headers) == expected
+
+
+class TestSigningKeys:
+    def test_keys_reused_within_max_age(self) -> None:
+        fetch = CountingFetch()
+        verifier = _verifier(fetch, cache_size=0)
+        for _ in range(5):
+            verifier.verify(make_id_token("ada"))
+        assert fetch.calls == 1
+
+    def test_refetched_once_expired(self) -> None:
+        fetch = CountingFetch({"cache-control": "public, max-age=0"})
+        verifier = _verifier(fetch, cache_size=0)
+        verifier.verify(make_id_token("ada"))
+        verifier.verify(make_id_token("ada"))
+        assert fetch.calls == 2
+
+    def test_unknown_key_refetches_at_most_once_per_interval(self) -> None:
+        fetch = CountingFetch()
+        verifier = _verifier(fetch)
+        verifier.verify(make_id_token("ada"))
+        for _ in range(3):
+            with pytest.raises(AuthError) as exc:
+                verifier.verify(make_id_token("ada", kid="rotated"))
+            assert exc.value.code == "TOKEN_INVALID"
+        assert fetch.calls == 1  # fetched just now: no early refetch yet
+
+    def test_failed_refresh_keeps_known_keys(self) -> None:
+        fetch = CountingFetch({"cache-control": "public, max-age=0"})
+        verifier = _verifier(fetch, cache_size=0)
+        verifier.verify(make_id_token("ada"))
+        fetch.failing = True
+        assert verifier.verify(make_id_token("ada"))["sub"] == "ada"
+        verifier.verify(make_id_token("ada"))
+        assert fetch.calls == 2  # the failure is not retried on every request
+
+    def test_no_keys_at_all(self) -> None:
+        fetch = CountingFetch()
+        fetch.failing = True
+        with pytest.raises(SigningKeysUnavailableError):
+            _verifier(fetch).verify(make_id_token("ada"))
+
+
+class TestTokenVerifier:
+    def test_valid_token(self) -> None:
+        claims = make_verifier().verify(make_id_token("ada", email="ada@example.com"))
+        assert claims["sub"] == "ada"
+        assert claims["email"] == "ada@example.com"
+
+    @pytest.mark.parametrize(
+        "claims,code",
+        [
+            ({"expires_in": -60}, "TOKEN_EXPIRED"),
+            ({"aud": "another-project"}, "TOKEN_INVALID"),
+            ({"iss": "https://securetoken.google.com/another-project"}, "TOKEN_INVALID"),
+            ({"iat": int(time.time()) + 3600}, "TOKEN_INVALID"),
+            ({"auth_time": int(time.time()) + 3600}, "TOKEN_INVALID"),
+        ],
+    )
+    def test_rejected(self, claims: dict, code: str) -> None:
+        with pytest.raises(AuthError) as exc:
+            make_verifier().verify(make_id_token("ada", **claims))
+        assert exc.value.code == code
+
+    def test_empty_subject_rejected(self) -> None:
+        with pytest.raises(AuthError):
+            make_verifier().verify(make_id_token(""))
+
+    def test_verified_claims_are_cached(self) -> None:
+        verifier = make_verifier()
+        token = make_id_token("ada")
+        assert verifier.cached(token) is None
+        claims = verifier.verify(token)
+        assert verifier.cached(token) is claims
+
+    def test_cached_claims_expire_with_the_token(self) -> None:
+        verifier = make_verifier()
+        token = make_id_token("ada", expires_in=1)
+        verifier.verify(token)
+        time.sleep(1.1)
+        assert verifier.cached(token) is None
+
+    def test_claims_cache_is_bounded(self) -> None:
+        verifier = make_verifier(cache_size=2)
+        tokens = [make_id_token(user) for user in ("ada", "bob", "cy")]
+        for token in tokens:
+            verifier.verify(token)
+        assert verifier.cached(tokens[0]) is None
+        assert verifier.cached(tokens[2]) is not None
+
+    def test_rejected_tokens_are_not_cached(self) -> None:
+        verifier = make_verifier()
+        token = make_id_token("ada", aud="another-project")
+        with pytest.raises(AuthError):
+            verifier.verify(token)
+        assert verifier.cached(token) is None
+
+
+class TestDependency:
+    def test_unavailable_keys_return_503(self, client: TestClient) -> None:
+        fetch = CountingFetch()
+        fetch.failing = True
+        set_token_verifier(_verifier(fetch))
+        resp = client.get(
+            "/v1/scores/me", headers={"Authorization": f"Bearer {make_id_token('ada')}"}
+        )
+        assert resp.status_code == 503
+        assert resp.json()["error"]["code"] == "AUTH_UNAVAILABLE"
+
+    def test_app_import_does_not_load_token_libraries(self) -> None:
+        code = "import sys, main; print(any(m in sys.modules for m in ('jwt', 'firebase_admin')))"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
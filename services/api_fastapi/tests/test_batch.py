@@ -0,0 +1,116 @@
+"""Tests for the multi-area /scores/batch endpoint."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Config
+from main import app
+from serving.store import get_store
+from tests.conftest import FakeFirestoreClient, install_fake_client, make_forecast_doc
+
+BATCH = "/v1/public/scores/batch"
+
+
+def _doc(area_id: str, age_minutes: int = 10) -> dict[str, Any]:
+    doc = make_forecast_doc(age_minutes=age_minutes)
+    doc["area_id"] = area_id
+    return doc
+
+
+@pytest.fixture
+def areas(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeFirestoreClient]:
+    monkeypatch.setattr(Config, "AREA_IDS", ("tel_aviv_coast", "herzliya", "bat_yam"))
+    fake = FakeFirestoreClient(
+        {
+            "forecasts": {
+                "tel_aviv_coast": _doc("tel_aviv_coast"),
+                "herzliya": _doc("herzliya", age_minutes=120),
+            }
+        }
+    )
+    install_fake_client(fake)
+    yield fake
+    install_fake_client(None)
+
+
+def _lines(resp: httpx.Response) -> dict[str, dict[str, Any]]:
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    return {line["area_id"]: line for line in lines}
+
+
+class TestBatchScores:
+    def test_returns_one_line_per_area(self, areas: FakeFirestoreClient) -> None:
+        resp = TestClient(app).get(f"{BATCH}?area_ids=tel_aviv_coast,herzliya&days=1")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = _lines(resp)
+        assert set(lines) == {"tel_aviv_coast", "herzliya"}
+        assert lines["tel_aviv_coast"]["freshness"] == "fresh"
+        assert lines["herzliya"]["freshness"] == "stale"
+        assert lines["herzliya"]["scoring_version"] == "score_v2"
+
+    def test_per_area_errors_do_not_fail_the_batch(self, areas: FakeFirestoreClient) -> None:
+        resp = TestClient(app).get(f"{BATCH}?area_ids=tel_aviv_coast,bat_yam,eilat")
+        lines = _lines(resp)
+        assert resp.status_code == 200
+        assert "hours" in lines["tel_aviv_coast"]
+        assert lines["bat_yam"]["error"]["code"] == "NOT_FOUND"
+        assert lines["eilat"]["error"]["code"] == "NOT_FOUND"
+
+    def test_unexpected_error_is_one_line(
+        self, areas: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        store = get_store()
+        real_get = store.get
+
+        async def failing_get(area_id: str):  # type: ignore[no-untyped-def]
+            if area_id == "herzliya":
+                raise RuntimeError("boom")
+            return await real_get(area_id)
+
+        monkeypatch.setattr(store, "get", failing_get)
+        resp = TestClient(app).get(f"{BATCH}?area_ids=herzliya,tel_aviv_coast")
+        lines = _lines(resp)
+        assert resp.status_code == 200
+        assert lines["herzliya"]["error"]["code"] == "INTERNAL_ERROR"
+        assert "hours" in lines["tel_aviv_coast"]
+
+    def test_duplicates_collapse(self, areas: FakeFirestoreClient) -> None:
+        resp = TestClient(app).get(f"{BATCH}?area_ids=herzliya, herzliya,herzliya")
+        assert len(resp.text.splitlines()) == 1
+
+    def test_validation(self, areas: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        client = TestClient(app)
+        assert client.get(BATCH).status_code == 400
+        assert client.get(f"{BATCH}?area_ids=,").status_code == 400
+        monkeypatch.setattr(Config, "BATCH_MAX_AREAS", 2)
+        resp = client.get(f"{BATCH}?area_ids=a,b,c")
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    async def test_reads_run_concurrently(self, areas: FakeFirestoreClient) -> None:
+        areas.latency_s = 0.2
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            start = time.perf_counter()
+            resp = await client.get(f"{BATCH}?area_ids=tel_aviv_coast,herzliya,bat_yam")
+            elapsed = time.perf_counter() - start
+        assert len(resp.text.splitlines()) == 3
+        assert elapsed < 0.4  # ~one read, not three
+
+    async def test_lines_stream_in_completion_order(self, areas: FakeFirestoreClient) -> None:
+        await get_store().get("herzliya")  # cached: answers without a read
+        areas.latency_s = 0.1
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get(f"{BATCH}?area_ids=tel_aviv_coast,herzliya")
+        first = json.loads(resp.text.splitlines()[0])
+        assert first["area_id"] == "herzliya"
@@ -0,0 +1,132 @@
+"""Tests for Cache-Control on public responses and canonical query strings."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Config
+from serving.caching import cache_control, canonical_query
+
+
+def _directives(value: str) -> dict[str, str]:
+    out = {}
+    for part in value.split(", "):
+        name, _, arg = part.partition("=")
+        out[name] = arg
+    return out
+
+
+def _at(hour: int, minute: int) -> datetime:
+    return datetime(2026, 7, 1, hour, minute, tzinfo=UTC)
+
+
+class TestCacheControl:
+    def test_fresh_version_capped_by_max_age(self) -> None:
+        d = _directives(cache_control(_at(12, 2).isoformat(), now=_at(12, 10)))
+        assert "public" in d
+        assert d["max-age"] == str(Config.CACHE_MAX_AGE_SECONDS)
+        assert d["stale-while-revalidate"] == str(Config.CACHE_STALE_WHILE_REVALIDATE_SECONDS)
+        # Usable on origin errors until the version would turn stale.
+        assert d["stale-if-error"] == str((Config.FRESHNESS_THRESHOLD_MINUTES - 8) * 60)
+
+    def test_expires_at_the_hour_boundary(self) -> None:
+        d = _directives(cache_control(_at(12, 2).isoformat(), now=_at(12, 55)))
+        assert d["max-age"] == str(5 * 60)
+
+    def test_expires_at_the_next_expected_ingest(self) -> None:
+        d = _directives(cache_control("2026-07-01T11:30:00Z", now=_at(12, 20)))
+        assert d["max-age"] == str(10 * 60)
+
+    def test_overdue_ingest_keeps_minimum_max_age(self) -> None:
+        d = _directives(cache_control(_at(11, 0).isoformat(), now=_at(12, 20)))
+        assert d["max-age"] == str(Config.CACHE_MIN_MAX_AGE_SECONDS)
+
+    def test_stale_version_served_on_error_until_unhealthy(self) -> None:
+        d = _directives(cache_control(_at(10, 0).isoformat(), now=_at(12, 0)))
+        assert d["stale-if-error"] == str((Config.UNHEALTHY_THRESHOLD_MINUTES - 120) * 60)
+
+    def test_unparseable_version_is_not_stored(self) -> None:
+        assert cache_control("not a time") == "no-store"
+
+
+class TestCanonicalQuery:
+    @pytest.mark.parametrize(
+        "query",
+        [
+            b"area_id=a&days=3",
+            b"days=3&area_id=a",
+            b"days=3&area_id=a&format=rows&reasons=full",
+            b"area_id=a&days=3&_=1719835200",
+            b"area_id=b&days=3&area_id=a",
+        ],
+    )
+    def test_equivalent_queries_share_one_form(self, query: bytes) -> None:
+        assert canonical_query("/v1/public/scores", query) == b"area_id=a&days=3"
+
+    def test_list_values_in_canonical_order(self) -> None:
+        query = b"area_id=a&modes=run_dog,swim_solo,swim_solo"
+        assert canonical_query("/v1/public/scores", query) == b"area_id=a&modes=swim_solo,run_dog"
+
+    def test_invalid_values_kept_for_the_endpoint_to_reject(self) -> None:
+        query = b"area_id=a&modes=fly,swim_solo"
+        assert canonical_query("/v1/public/scores", query) == b"area_id=a&modes=fly,swim_solo"
+
+    def test_blank_list_kept(self) -> None:
+        # fields= (no fields) differs from omitting fields (all fields).
+        assert canonical_query("/v1/public/scores", b"fields=&area_id=a") == b"area_id=a&fields="
+
+    def test_other_paths_unchanged(self) -> None:
+        assert canonical_query("/v1/public/scores/batch", b"days=7&area_ids=a") == (
+            b"days=7&area_ids=a"
+        )
+
+
+class TestPublicHeaders:
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/v1/public/forecast?area_id=tel_aviv_coast",
+            "/v1/public/scores?area_id=tel_aviv_coast",
+            "/v1/public/scores?area_id=tel_aviv_coast&format=columnar",
+            "/v1/public/scores?area_id=tel_aviv_coast&modes=swim_solo",
+            "/v1/public/windows?area_id=tel_aviv_coast",
+            "/v1/public/daily?area_id=tel_aviv_coast",
+        ],
+    )
+    def test_cacheable_endpoints(self, client: TestClient, path: str) -> None:
+        resp = client.get(path)
+        assert resp.status_code == 200
+        assert resp.headers["cache-control"].startswith("public, max-age=")
+
+    def test_health_not_stored(self, client: TestClient) -> None:
+        assert client.get("/v1/public/health").headers["cache-control"] == "no-store"
+
+    def test_errors_not_marked_cacheable(self, client: TestClient) -> None:
+        resp = client.get("/v1/public/scores?area_id=nowhere")
+        assert resp.status_code == 404
+        assert "cache-control" not in resp.headers
+
+    def test_disabled(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(Config, "CACHE_CONTROL_ENABLED", False)
+        resp = client.get("/v1/public/scores?area_id=tel_aviv_coast")
+        assert "cache-control" not in resp.headers
+
+    def test_non_canonical_query_served_in_place(self, client: TestClient) -> None:
+        canonical = client.get("/v1/public/scores?area_id=tel_aviv_coast&days=2")
+        other = client.get("/v1/public/scores?days=2&reasons=full&area_id=tel_aviv_coast&x=1")
+        assert other.status_code == 200
+        assert other.json() == canonical.json()
+
+    def test_non_canonical_query_redirected(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "CANONICAL_QUERY_REDIRECT", True)
+        resp = client.get(
+            "/v1/public/scores?days=2&area_id=tel_aviv_coast&days=7", follow_redirects=False
+        )
+        assert resp.status_code == 308
+        assert resp.headers["location"] == "/v1/public/scores?area_id=tel_aviv_coast"
+        assert client.get(resp.headers["location"]).status_code == 200
@@ -0,0 +1,103 @@
+"""Tests for format=columnar on /forecast and /scores."""
+
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Config
+from serving.columnar import columnar_body
+from serving.projection import Projection
+from serving.snapshot import build_snapshot
+from tests.conftest import (
+    make_current_doc,
+)
+
+FORECAST = "/v1/public/forecast?area_id=tel_aviv_coast"
+SCORES = "/v1/public/scores?area_id=tel_aviv_coast"
+
+
+def to_rows(body: dict[str, Any]) -> list[dict[str, Any]]:
+    """Expand a columnar body back into the row format's ``hours`` list."""
+    columns = body["columns"]
+    chips = body.get("chips", [])
+    rows = []
+    for i in range(body["hour_count"]):
+        row = {name: values[i] for name, values in columns.items()}
+        if "scores" in body:
+            row["scores"] = {}
+            for mode, column in body["scores"].items():
+                ms = {
+                    "score": column["score"][i],
+                    "label": column["label"][i],
+                    "hard_gated": column["hard_gated"][i],
+                }
+                if "reasons" in column:
+                    ms["reasons"] = [chips[c] for c in column["reasons"][i]]
+                row["scores"][mode] = ms
+        rows.append(row)
+    return rows
+
+
+class TestColumnarRoundTrip:
+    def test_scores_round_trip(self, client: TestClient) -> None:
+        rows = client.get(SCORES).json()
+        columnar = client.get(f"{SCORES}&format=columnar").json()
+        assert columnar["format"] == "columnar"
+        assert to_rows(columnar) == rows["hours"]
+        assert columnar["daily"] == rows["daily"]
+        for key in ("area_id", "updated_at_utc", "provider", "scoring_version", "horizon_days"):
+            assert columnar[key] == rows[key]
+
+    def test_forecast_round_trip(self, client: TestClient) -> None:
+        rows = client.get(f"{FORECAST}&days=2").json()
+        columnar = client.get(f"{FORECAST}&days=2&format=columnar").json()
+        assert columnar["hour_count"] == 48
+        assert "scores" not in columnar
+        assert to_rows(columnar) == rows["hours"]
+
+    def test_projection_round_trip(self, client: TestClient) -> None:
+        query = "&days=1&fields=wind_ms,uv_index&modes=swim_dog&reasons=top"
+        rows = client.get(SCORES + query).json()
+        columnar = client.get(f"{SCORES}{query}&format=columnar").json()
+        assert set(columnar["columns"]) == {"hour_utc", "wind_ms", "uv_index"}
+        assert to_rows(columnar) == rows["hours"]
+
+    def test_reasons_none_has_no_chip_column(self, client: TestClient) -> None:
+        body = client.get(f"{SCORES}&format=columnar&reasons=none").json()
+        assert body["chips"] == []
+        assert all("reasons" not in column for column in body["scores"].values())
+
+
+class TestColumnarEncoding:
+    def test_chips_are_deduplicated(self, client: TestClient) -> None:
+        body = client.get(f"{SCORES}&format=columnar").json()
+        keys = [json.dumps(c, sort_keys=True) for c in body["chips"]]
+        assert len(keys) == len(set(keys))
+        used = {i for col in body["scores"].values() for hour in col["reasons"] for i in hour}
+        assert used == set(range(len(body["chips"])))
+
+    def test_payload_is_smaller_than_rows(self, client: TestClient) -> None:
+        rows = client.get(SCORES).content
+        columnar = client.get(f"{SCORES}&format=columnar").content
+        assert len(columnar) < len(rows) / 2
+
+    def test_body_is_memoized_per_window(self) -> None:
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        window = snapshot.window(datetime.now(UTC), 1)
+        assert columnar_body(snapshot, window) is columnar_body(snapshot, window)
+
+    def test_windows_share_the_bounded_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(Config, "PROJECTION_CACHE_SIZE", 4)
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        for start in range(20):
+            columnar_body(snapshot, slice(start, start + 24), Projection())
+        assert len(snapshot.variants) == 4
+        assert all("columnar" not in str(key) for key in snapshot.derived)
+
+    def test_bad_format_is_422(self, client: TestClient) -> None:
+        assert client.get(f"{SCORES}&format=csv").status_code == 422
@@ -0,0 +1,94 @@
+"""Tests for local-day summaries and the /daily endpoint."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi.testclient import TestClient
+
+from serving.daily import daily_summaries
+from serving.snapshot import build_snapshot
+from tests.conftest import (
+    make_current_doc,
+    make_forecast_doc,
+)
+
+DAILY = "/v1/public/daily?area_id=tel_aviv_coast"
+JERUSALEM = ZoneInfo("Asia/Jerusalem")
+
+
+class TestDailySummaries:
+    def test_dst_end_day_has_25_hours(self) -> None:
+        doc = make_forecast_doc(base_time=datetime(2026, 10, 23, tzinfo=UTC))
+        days = {d.date.isoformat(): d for d in daily_summaries(build_snapshot("a", doc), JERUSALEM)}
+        assert days["2026-10-24"].hours == 24
+        assert days["2026-10-25"].hours == 25
+
+    def test_dst_start_day_has_23_hours(self) -> None:
+        doc = make_forecast_doc(base_time=datetime(2026, 3, 25, tzinfo=UTC))
+        days = {d.date.isoformat(): d for d in daily_summaries(build_snapshot("a", doc), JERUSALEM)}
+        assert days["2026-03-27"].hours == 23
+
+    def test_local_midnight_boundary(self) -> None:
+        # 21:00 UTC on 2026-07-01 is 00:00 on 2026-07-02 in Jerusalem (UTC+3).
+        doc = make_forecast_doc(base_time=datetime(2026, 7, 1, tzinfo=UTC))
+        snapshot = build_snapshot("a", doc)
+        days = daily_summaries(snapshot, JERUSALEM)
+        assert days[0].date.isoformat() == "2026-07-01"
+        assert days[0].hours == 21
+        assert sum(d.hours for d in days) == len(snapshot.hour_epochs)
+
+    def test_statistics_match_scored_hours(self) -> None:
+        doc = make_forecast_doc(base_time=datetime(2026, 7, 1, tzinfo=UTC))
+        snapshot = build_snapshot("a", doc)
+        day = daily_summaries(snapshot, JERUSALEM)[1]
+        local = [
+            (i, h)
+            for i, h in enumerate(snapshot.scored_hours)
+            if datetime.fromisoformat(h.hour_utc).astimezone(JERUSALEM).date() == day.date
+        ]
+        for mode in ("swim_solo", "run_dog"):
+            scores = [h.scores[mode].score for _, h in local]
+            stats = day.modes[mode]
+            assert stats.max_score == max(scores)
+            assert stats.min_score == min(scores)
+            assert snapshot.scored_hours[stats.best_hour].scores[mode].score == max(scores)
+            assert stats.gated_hours == sum(h.scores[mode].hard_gated for _, h in local)
+            daylight = [
+                h.scores[mode].score
+                for i, h in local
+                if snapshot.hour_inputs[i].sunrise_utc
+                <= snapshot.hour_inputs[i].hour_utc
+                < snapshot.hour_inputs[i].sunset_utc
+            ]
+            assert stats.daylight_mean == pytest.approx(sum(daylight) / len(daylight))
+
+    def test_memoized_per_version(self) -> None:
+        snapshot = build_snapshot("a", make_current_doc())
+        assert daily_summaries(snapshot, JERUSALEM) is daily_summaries(snapshot, JERUSALEM)
+
+
+class TestDailyEndpoint:
+    def test_days_start_today_local(self, client: TestClient) -> None:
+        body = client.get(DAILY).json()
+        today = datetime.now(UTC).astimezone(JERUSALEM).date().isoformat()
+        assert body["timezone"] == "Asia/Jerusalem"
+        assert body["days"][0]["date"] == today
+        assert set(body["days"][0]["modes"]) == {"swim_solo", "swim_dog", "run_solo", "run_dog"}
+        day = body["days"][1]
+        assert day["sunrise_utc"] < day["sunset_utc"]
+        run = day["modes"]["run_solo"]
+        assert run["min_score"] <= run["max_score"]
+        best = datetime.fromisoformat(run["best_hour_utc"]).astimezone(JERUSALEM)
+        assert best.date().isoformat() == day["date"]
+
+    def test_modes_filter(self, client: TestClient) -> None:
+        body = client.get(f"{DAILY}&modes=swim_dog").json()
+        assert all(set(d["modes"]) == {"swim_dog"} for d in body["days"])
+
+    def test_validation(self, client: TestClient) -> None:
+        assert client.get("/v1/public/daily").status_code == 400
+        assert client.get(f"{DAILY}&modes=kite").status_code == 400
+        assert client.get("/v1/public/daily?area_id=haifa").status_code == 404
@@ -0,0 +1,128 @@
+"""Tests for delta responses: /v1/public/scores?since= and stream resumes."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from routers.public import _score_events
+from serving.store import ForecastStore, get_store, set_store
+from tests.conftest import (
+    FakeFirestoreClient,
+    install_fake_client,
+    make_current_doc,
+)
+from tests.test_stream import _parse
+
+URL = "/v1/public/scores"
+AREA = {"area_id": "tel_aviv_coast"}
+
+
+@pytest.fixture
+def fake_client() -> Iterator[FakeFirestoreClient]:
+    fake = FakeFirestoreClient({"forecasts": {"tel_aviv_coast": make_current_doc(hours_back=0)}})
+    install_fake_client(fake)
+    set_store(ForecastStore(ttl_seconds=60, versions_kept=2))
+    get_store().subscribe("tel_aviv_coast")
+    yield fake
+    get_store().close()
+    install_fake_client(None)
+
+
+def _push_update(fake: FakeFirestoreClient, age_minutes: int, hour: int = 30) -> dict:
+    """Push a version that changes one hour's inputs and drops the first (current) hour."""
+    doc = make_current_doc(hours_back=0, age_minutes=age_minutes)
+    doc["hours"][hour]["wave_height_m"] = 1.4
+    doc["hours"] = doc["hours"][1:]
+    fake.push("forecasts", "tel_aviv_coast", doc)
+    return doc
+
+
+def _first_hour() -> str:
+    return make_current_doc(hours_back=0)["hours"][0]["hour_utc"]
+
+
+class TestScoresSince:
+    def test_changed_and_dropped_hours_only(self, fake_client: FakeFirestoreClient) -> None:
+        client = TestClient(app)
+        base = client.get(URL, params=AREA).json()
+        new_doc = _push_update(fake_client, age_minutes=0)
+
+        resp = client.get(URL, params={**AREA, "since": base["updated_at_utc"]})
+        assert resp.status_code == 200
+        assert "public" in resp.headers["cache-control"]
+        body = resp.json()
+        assert body["updated_at_utc"] == new_doc["updated_at_utc"]
+        assert body["since_updated_at_utc"] == base["updated_at_utc"]
+        assert [h["hour_utc"] for h in body["hours"]] == [new_doc["hours"][29]["hour_utc"]]
+        assert body["dropped_hours"] == [_first_hour()]
+        assert body["daily"]
+
+    def test_current_version_is_an_empty_delta(self, fake_client: FakeFirestoreClient) -> None:
+        client = TestClient(app)
+        version = client.get(URL, params=AREA).json()["updated_at_utc"]
+        body = client.get(URL, params={**AREA, "since": version}).json()
+        assert body["since_updated_at_utc"] == version
+        assert body["hours"] == []
+        assert body["dropped_hours"] == []
+
+    def test_changes_outside_the_window_are_left_out(
+        self, fake_client: FakeFirestoreClient
+    ) -> None:
+        client = TestClient(app)
+        base = client.get(URL, params=AREA).json()
+        _push_update(fake_client, age_minutes=0, hour=100)
+        body = client.get(URL, params={**AREA, "days": 1, "since": base["updated_at_utc"]}).json()
+        assert body["hours"] == []
+        assert body["dropped_hours"] == [_first_hour()]
+
+    @pytest.mark.parametrize("since", ["2020-01-01T00:00:00Z", "evicted"])
+    def test_unknown_base_falls_back_to_full(
+        self, fake_client: FakeFirestoreClient, since: str
+    ) -> None:
+        client = TestClient(app)
+        oldest = client.get(URL, params=AREA).json()["updated_at_utc"]
+        _push_update(fake_client, age_minutes=5)
+        _push_update(fake_client, age_minutes=0)  # only two versions kept
+        if since == "evicted":
+            since = oldest
+        body = client.get(URL, params={**AREA, "since": since}).json()
+        assert "since_updated_at_utc" not in body
+        assert len(body["hours"]) > 100
+
+    def test_projection_returns_full_response(self, fake_client: FakeFirestoreClient) -> None:
+        client = TestClient(app)
+        version = client.get(URL, params=AREA).json()["updated_at_utc"]
+        body = client.get(URL, params={**AREA, "modes": "swim_solo", "since": version}).json()
+        assert "since_updated_at_utc" not in body
+        assert body["hours"]
+
+
+class TestStreamResume:
+    async def test_older_last_event_id_starts_with_a_delta(
+        self, fake_client: FakeFirestoreClient
+    ) -> None:
+        base = await get_store().get("tel_aviv_coast")
+        new_doc = _push_update(fake_client, age_minutes=0)
+        snapshot = await get_store().get("tel_aviv_coast")
+        assert base is not None and snapshot is not None
+
+        events = _score_events(snapshot, "full", base.version)
+        await anext(events)  # retry hint
+        first = _parse(await anext(events))
+        assert first["event"] == "delta"
+        assert first["id"] == new_doc["updated_at_utc"]
+        await events.aclose()
+
+    async def test_unknown_last_event_id_gets_full_scores(
+        self, fake_client: FakeFirestoreClient
+    ) -> None:
+        snapshot = await get_store().get("tel_aviv_coast")
+        assert snapshot is not None
+        events = _score_events(snapshot, "full", "2020-01-01T00:00:00Z")
+        await anext(events)
+        assert _parse(await anext(events))["event"] == "scores"
+        await events.aclose()
@@ -0,0 +1,129 @@
+"""Tests for MessagePack and Arrow IPC content negotiation."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+import serving.encoding as encoding
+from config import Config
+from serving.encoding import ARROW_STREAM, JSON, MSGPACK, negotiate
+from serving.projection import HOUR_FIELDS, Projection, parse_projection
+from serving.snapshot import build_snapshot
+from tests.conftest import (
+    make_current_doc,
+)
+
+FORECAST = "/v1/public/forecast?area_id=tel_aviv_coast"
+SCORES = "/v1/public/scores?area_id=tel_aviv_coast"
+
+
+class TestNegotiate:
+    def test_default_is_json(self) -> None:
+        assert negotiate(None) == JSON
+        assert negotiate("*/*") == JSON
+        assert negotiate("text/html, application/xml;q=0.9") == JSON
+
+    def test_binary_types(self) -> None:
+        assert negotiate("application/msgpack") == MSGPACK
+        assert negotiate("application/vnd.apache.arrow.stream") == ARROW_STREAM
+
+    def test_quality_values(self) -> None:
+        accept = "application/json;q=0.5, application/msgpack;q=0.9"
+        assert negotiate(accept) == MSGPACK
+        assert negotiate("application/msgpack;q=0.4, application/json") == JSON
+
+    def test_unavailable_encoder_falls_back(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(encoding, "_available", lambda media_type: media_type == JSON)
+        assert negotiate("application/msgpack") == JSON
+
+
+class TestMsgpack:
+    def test_matches_columnar_json(self, client: TestClient) -> None:
+        msgpack = pytest.importorskip("msgpack")
+        resp = client.get(f"{SCORES}&days=2", headers={"Accept": MSGPACK})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == MSGPACK
+        assert "Accept" in resp.headers["vary"]
+        body = msgpack.unpackb(resp.content)
+        columnar = client.get(f"{SCORES}&days=2&format=columnar").json()
+        assert body == columnar
+
+    def test_forecast(self, client: TestClient) -> None:
+        msgpack = pytest.importorskip("msgpack")
+        resp = client.get(FORECAST, headers={"Accept": MSGPACK})
+        body = msgpack.unpackb(resp.content)
+        assert "scores" not in body and "scoring_version" not in body
+        assert body == client.get(f"{FORECAST}&format=columnar").json()
+
+    def test_packed_members_share_the_bounded_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pytest.importorskip("msgpack")
+        monkeypatch.setattr(Config, "PROJECTION_CACHE_SIZE", 4)
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        for start in range(10):
+            encoding.msgpack_body(snapshot, slice(start, start + 24), Projection(), {})
+            encoding.arrow_table(snapshot, parse_projection(HOUR_FIELDS[start], None, "none"))
+        assert len(snapshot.variants) == 4
+        assert all("msgpack" not in str(k) and "arrow" not in str(k) for k in snapshot.derived)
+
+
+class TestArrow:
+    def _read(self, content: bytes) -> Any:
+        pa = pytest.importorskip("pyarrow")
+        return pa.ipc.open_stream(content).read_all()
+
+    def test_scores_columns_match_json(self, client: TestClient) -> None:
+        pytest.importorskip("pyarrow")
+        resp = client.get(f"{SCORES}&days=1", headers={"Accept": ARROW_STREAM})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == ARROW_STREAM
+        table = self._read(resp.content)
+        rows = client.get(f"{SCORES}&days=1").json()
+        assert table.num_rows == 24
+        assert table.column("hour_utc").to_pylist() == [h["hour_utc"] for h in rows["hours"]]
+        assert table.column("wave_height_m").to_pylist() == [
+            h["wave_height_m"] for h in rows["hours"]
+        ]
+        assert table.column("run_dog.score").to_pylist() == [
+            h["scores"]["run_dog"]["score"] for h in rows["hours"]
+        ]
+
+        metadata = table.schema.metadata
+        assert json.loads(metadata[b"updated_at_utc"]) == rows["updated_at_utc"]
+        chips = json.loads(metadata[b"chips"])
+        reasons = table.column("swim_solo.reasons").to_pylist()
+        assert [[chips[i] for i in r] for r in reasons] == [
+            h["scores"]["swim_solo"]["reasons"] for h in rows["hours"]
+        ]
+
+    def test_projection_limits_columns(self, client: TestClient) -> None:
+        pytest.importorskip("pyarrow")
+        resp = client.get(
+            f"{SCORES}&fields=uv_index&modes=run_solo&reasons=none",
+            headers={"Accept": ARROW_STREAM},
+        )
+        table = self._read(resp.content)
+        assert table.column_names == [
+            "hour_utc",
+            "uv_index",
+            "run_solo.score",
+            "run_solo.label",
+            "run_solo.hard_gated",
+        ]
+
+    def test_window_is_a_slice_of_the_cached_table(self, client: TestClient) -> None:
+        pytest.importorskip("pyarrow")
+        one = self._read(client.get(f"{FORECAST}&days=1", headers={"Accept": ARROW_STREAM}).content)
+        two = self._read(client.get(f"{FORECAST}&days=2", headers={"Accept": ARROW_STREAM}).content)
+        assert two.slice(0, 24).equals(one)
+
+
+class TestJsonDefault:
+    def test_json_responses_vary_on_accept(self, client: TestClient) -> None:
+        resp = client.get(SCORES)
+        assert resp.headers["content-type"] == JSON
+        assert "Accept" in resp.headers["vary"]
+        assert "Accept" in client.get(FORECAST).headers["vary"]
@@ -0,0 +1,98 @@
+"""Tests for the cheap /health path: summary docs, live snapshots and the TTL cache."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from serving.health import HealthCache
+from serving.store import get_store
+from tests.conftest import FakeFirestoreClient, install_fake_client, make_forecast_doc
+
+
+def _health_doc(forecast: dict) -> dict:
+    return {
+        "area_id": "tel_aviv_coast",
+        "updated_at_utc": forecast["updated_at_utc"],
+        "ingest_status": forecast["ingest_status"],
+        "hours_count": len(forecast["hours"]),
+    }
+
+
+@pytest.fixture
+def fake_client() -> Iterator[FakeFirestoreClient]:
+    forecast = make_forecast_doc(age_minutes=10)
+    fake = FakeFirestoreClient(
+        {
+            "forecasts": {"tel_aviv_coast": forecast},
+            "health": {"tel_aviv_coast": _health_doc(forecast)},
+        }
+    )
+    install_fake_client(fake)
+    yield fake
+    install_fake_client(None)
+
+
+class TestHealthCache:
+    async def test_reads_summary_not_forecast(self, fake_client: FakeFirestoreClient) -> None:
+        summary = await HealthCache(ttl_seconds=60).get("tel_aviv_coast")
+        assert summary is not None
+        assert summary.hours_count == 168
+        assert summary.ingest_status == "success"
+        assert fake_client.reads == [("health", "tel_aviv_coast")]
+
+    async def test_summary_is_reused_within_ttl(self, fake_client: FakeFirestoreClient) -> None:
+        cache = HealthCache(ttl_seconds=60)
+        await asyncio.gather(*(cache.get("tel_aviv_coast") for _ in range(10)))
+        await cache.get("tel_aviv_coast")
+        assert fake_client.reads == [("health", "tel_aviv_coast")]
+
+    async def test_expired_summary_is_reread(self, fake_client: FakeFirestoreClient) -> None:
+        cache = HealthCache(ttl_seconds=0)
+        await cache.get("tel_aviv_coast")
+        await cache.get("tel_aviv_coast")
+        assert fake_client.reads == [("health", "tel_aviv_coast")] * 2
+
+    async def test_falls_back_to_forecast_without_summary(
+        self, fake_client: FakeFirestoreClient
+    ) -> None:
+        fake_client.push("health", "tel_aviv_coast", None)
+        summary = await HealthCache(ttl_seconds=60).get("tel_aviv_coast")
+        assert summary is not None
+        assert summary.hours_count == 168
+        assert fake_client.reads == [("health", "tel_aviv_coast"), ("forecasts", "tel_aviv_coast")]
+
+    async def test_missing_area_is_cached(self, fake_client: FakeFirestoreClient) -> None:
+        cache = HealthCache(ttl_seconds=60)
+        assert await cache.get("haifa_coast") is None
+        assert await cache.get("haifa_coast") is None
+        assert fake_client.reads == [("health", "haifa_coast"), ("forecasts", "haifa_coast")]
+
+    async def test_live_snapshot_needs_no_read(self, fake_client: FakeFirestoreClient) -> None:
+        store = get_store()
+        store.subscribe("tel_aviv_coast")
+        try:
+            new_doc = make_forecast_doc(age_minutes=0, hours_count=24)
+            fake_client.push("forecasts", "tel_aviv_coast", new_doc)
+            summary = await HealthCache(ttl_seconds=60).get("tel_aviv_coast")
+        finally:
+            store.close()
+        assert summary is not None
+        assert summary.updated_at_utc == new_doc["updated_at_utc"]
+        assert summary.hours_count == 24
+        assert fake_client.reads == []
+
+
+class TestHealthEndpoint:
+    def test_served_from_summary(self, fake_client: FakeFirestoreClient) -> None:
+        client = TestClient(app)
+        for _ in range(3):
+            resp = client.get("/v1/public/health")
+            assert resp.status_code == 200
+            assert resp.json()["status"] == "healthy"
+            assert resp.json()["forecast"]["hours_count"] == 168
+        assert fake_client.reads == [("health", "tel_aviv_coast")]
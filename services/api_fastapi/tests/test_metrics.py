@@ -0,0 +1,112 @@
+"""Tests for the Prometheus /metrics endpoint and request instrumentation."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from config import Config
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestRequestMetrics:
+    def test_metrics_endpoint_exposes_documented_names(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "METRICS_ENDPOINT_ENABLED", True)
+        client.get("/v1/public/health")
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        for name in (
+            "api_request_duration_seconds",
+            "api_request_count_total",
+            "firestore_read_duration_seconds",
+            "scoring_duration_seconds",
+            "forecast_cache_lookups_total",
+        ):
+            assert name in resp.text
+
+    def test_requests_are_labeled_by_route_template(self, client: TestClient) -> None:
+        labels = {"endpoint": "/v1/public/scores", "method": "GET", "status_code": "200"}
+        before = _sample("api_request_count_total", **labels)
+        client.get("/v1/public/scores?area_id=tel_aviv_coast&days=1")
+        client.get("/v1/public/scores?area_id=tel_aviv_coast&days=2")
+        assert _sample("api_request_count_total", **labels) == before + 2
+        assert _sample("api_request_duration_seconds_count", **labels) >= 2
+
+    def test_unmatched_paths_share_one_label(self, client: TestClient) -> None:
+        labels = {"endpoint": "unmatched", "method": "GET", "status_code": "404"}
+        before = _sample("api_request_count_total", **labels)
+        client.get("/nope/1")
+        client.get("/nope/2")
+        assert _sample("api_request_count_total", **labels) == before + 2
+
+    def test_errors_counted_by_envelope_code(self, client: TestClient) -> None:
+        endpoint = "/v1/public/forecast"
+        before = _sample("api_error_count_total", endpoint=endpoint, error_code="NOT_FOUND")
+        client.get("/v1/public/forecast?area_id=haifa")
+        after = _sample("api_error_count_total", endpoint=endpoint, error_code="NOT_FOUND")
+        assert after == before + 1
+
+    def test_framework_errors_fall_back_to_status(self, client: TestClient) -> None:
+        endpoint = "/v1/public/forecast"
+        before = _sample("api_error_count_total", endpoint=endpoint, error_code="422")
+        client.get("/v1/public/forecast?area_id=tel_aviv_coast&days=99")
+        assert _sample("api_error_count_total", endpoint=endpoint, error_code="422") == before + 1
+
+
+class TestServingMetrics:
+    def test_cache_and_firestore(self, client: TestClient) -> None:
+        hits = _sample("forecast_cache_lookups_total", result="hit")
+        misses = _sample("forecast_cache_lookups_total", result="miss")
+        reads = _sample("firestore_read_duration_seconds_count", collection="forecasts")
+        scored = _sample("scoring_duration_seconds_count", area_id="tel_aviv_coast")
+        client.get("/v1/public/scores?area_id=tel_aviv_coast")
+        client.get("/v1/public/scores?area_id=tel_aviv_coast")
+        assert _sample("forecast_cache_lookups_total", result="miss") == misses + 1
+        assert _sample("forecast_cache_lookups_total", result="hit") == hits + 1
+        assert _sample("firestore_read_duration_seconds_count", collection="forecasts") == reads + 1
+        assert _sample("scoring_duration_seconds_count", area_id="tel_aviv_coast") == scored + 1
+
+    def test_serialization_by_format(self, client: TestClient) -> None:
+        json_before = _sample("api_serialization_duration_seconds_count", format="json")
+        col_before = _sample("api_serialization_duration_seconds_count", format="columnar")
+        client.get("/v1/public/scores?area_id=tel_aviv_coast")
+        client.get("/v1/public/scores?area_id=tel_aviv_coast&format=columnar")
+        json_after = _sample("api_serialization_duration_seconds_count", format="json")
+        col_after = _sample("api_serialization_duration_seconds_count", format="columnar")
+        assert (json_after, col_after) == (json_before + 1, col_before + 1)
+
+
+class TestEndpointAccess:
+    def test_not_served_by_default(self, client: TestClient) -> None:
+        assert client.get("/metrics").status_code == 404
+
+    def test_token_required_when_set(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "METRICS_ENDPOINT_ENABLED", True)
+        monkeypatch.setattr(Config, "METRICS_TOKEN", "s3cret")
+        assert client.get("/metrics").status_code == 401
+        wrong = client.get("/metrics", headers={"Authorization": "Bearer nope"})
+        assert wrong.status_code == 401
+        ok = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+        assert ok.status_code == 200
+
+
+class TestDisabled:
+    def test_disabled_hides_endpoint_and_skips_recording(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "METRICS_ENABLED", False)
+        monkeypatch.setattr(Config, "METRICS_ENDPOINT_ENABLED", True)
+        labels = {"endpoint": "/", "method": "GET", "status_code": "200"}
+        before = _sample("api_request_count_total", **labels)
+        client.get("/")
+        assert _sample("api_request_count_total", **labels) == before
+        assert client.get("/metrics").status_code == 404
@@ -0,0 +1,88 @@
+"""Tests for the request telemetry middleware: request ids, metrics and context."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from starlette.types import Receive, Scope, Send
+
+from serving.warmup import asgi_get
+from telemetry import context as request_context
+from telemetry.middleware import RequestTelemetryMiddleware
+
+REQUEST_ID = re.compile(r"^[0-9a-f]{12}-[0-9a-f]+$")
+
+
+def _count(**labels: str) -> float:
+    return REGISTRY.get_sample_value("api_request_count_total", labels) or 0.0
+
+
+class TestRequestIds:
+    def test_instance_prefix_and_counter(self) -> None:
+        first, second = request_context.new_request_id(), request_context.new_request_id()
+        assert REQUEST_ID.match(first)
+        assert first.split("-")[0] == second.split("-")[0]
+        assert int(second.split("-")[1], 16) == int(first.split("-")[1], 16) + 1
+
+    def test_each_response_gets_its_own(self, client: TestClient) -> None:
+        ids = {client.get("/v1/public/health").headers["x-request-id"] for _ in range(3)}
+        assert len(ids) == 3
+        assert all(REQUEST_ID.match(i) for i in ids)
+
+    def test_error_envelope_carries_the_header_id(self, client: TestClient) -> None:
+        resp = client.get("/v1/public/scores?area_id=nowhere")
+        assert resp.status_code == 404
+        assert resp.json()["request_id"] == resp.headers["x-request-id"]
+
+    def test_cors_preflight(self, client: TestClient) -> None:
+        resp = client.options(
+            "/v1/public/scores",
+            headers={"Origin": "http://localhost:3000", "Access-Control-Request-Method": "GET"},
+        )
+        assert resp.status_code == 200
+        assert REQUEST_ID.match(resp.headers["x-request-id"])
+
+    def test_cors_preflight_rejects_timing_header_by_default(self, client: TestClient) -> None:
+        resp = client.options(
+            "/v1/public/scores",
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": "GET",
+                "Access-Control-Request-Headers": "x-server-timing",
+            },
+        )
+        assert resp.status_code == 400
+
+
+class TestRequestMetrics:
+    def test_rewritten_query_keeps_its_route_label(self, client: TestClient) -> None:
+        labels = {"endpoint": "/v1/public/scores", "method": "GET", "status_code": "200"}
+        before = _count(**labels)
+        client.get("/v1/public/scores?days=1&area_id=tel_aviv_coast&x=1")
+        assert _count(**labels) == before + 1
+
+    async def test_unhandled_exception_counted_as_500(self) -> None:
+        async def failing(scope: Scope, receive: Receive, send: Send) -> None:
+            raise RuntimeError("boom")
+
+        labels = {"endpoint": "unmatched", "method": "GET", "status_code": "500"}
+        before = _count(**labels)
+        with pytest.raises(RuntimeError):
+            await asgi_get(RequestTelemetryMiddleware(failing), "/boom")
+        assert _count(**labels) == before + 1
+
+    async def test_request_context_visible_to_the_app(self) -> None:
+        seen = []
+
+        async def inner(scope: Scope, receive: Receive, send: Send) -> None:
+            ctx = request_context.current()
+            seen.append((ctx.request_id if ctx else None, scope["state"]["request_id"]))
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        assert await asgi_get(RequestTelemetryMiddleware(inner), "/") == 204
+        assert seen[0][0] == seen[0][1]
+        assert REQUEST_ID.match(seen[0][0])
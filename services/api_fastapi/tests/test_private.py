@@ -0,0 +1,305 @@
+"""Tests for /v1/scores/me and /v1/profile: auth, profile caching and personalized thresholds."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from scoring_engine import BALANCED_THRESHOLDS
+
+from auth.firebase import set_token_verifier
+from main import app
+from serving.personal import PRESETS, fingerprint, get_personal_scores, resolve_thresholds
+from serving.profiles import ProfileCache, get_profile_cache, validate_profile
+from serving.store import get_store
+from tests.conftest import (
+    FakeFirestoreClient,
+    install_fake_client,
+    make_forecast_doc,
+    make_id_token,
+    make_verifier,
+)
+
+ME = "/v1/scores/me?days=1"
+PROFILE = "/v1/profile"
+
+
+def _profile(preset: str = "balanced", **thresholds: float) -> dict[str, Any]:
+    return {
+        "schema_version": "profile_v1",
+        "preferences": {"preset": preset},
+        "thresholds": {**PRESETS[preset], **thresholds},
+        "location": {"area_id": "tel_aviv_coast", "lat": 32.08, "lon": 34.77},
+    }
+
+
+def _auth(user_id: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {make_id_token(user_id)}"}
+
+
+def _forecast(age_minutes: int = 10) -> dict[str, Any]:
+    start = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+    return make_forecast_doc(age_minutes=age_minutes, base_time=start)
+
+
+@pytest.fixture
+def fake_client() -> Iterator[FakeFirestoreClient]:
+    fake = FakeFirestoreClient(
+        {
+            "forecasts": {"tel_aviv_coast": _forecast()},
+            "users": {
+                "ada": _profile("chill"),
+                "bob": _profile("chill"),
+                "cy": _profile("strict"),
+                "dee": _profile("balanced"),
+            },
+        }
+    )
+    install_fake_client(fake)
+    set_token_verifier(make_verifier())
+    yield fake
+    set_token_verifier(None)
+    install_fake_client(None)
+
+
+@pytest.fixture
+def client(fake_client: FakeFirestoreClient) -> TestClient:
+    return TestClient(app)
+
+
+def _swim_scores(resp: Any) -> list[int]:
+    return [h["scores"]["swim_solo"]["score"] for h in resp.json()["hours"]]
+
+
+class TestAuth:
+    def test_missing_token(self, client: TestClient) -> None:
+        resp = client.get(ME)
+        assert resp.status_code == 401
+        assert resp.json()["error"]["code"] == "AUTH_REQUIRED"
+        assert resp.headers["www-authenticate"] == "Bearer"
+
+    def test_not_a_bearer_token(self, client: TestClient) -> None:
+        resp = client.get(ME, headers={"Authorization": "Basic ada"})
+        assert resp.json()["error"]["code"] == "AUTH_REQUIRED"
+
+    @pytest.mark.parametrize(
+        "token,code",
+        [
+            (make_id_token("ada", expires_in=-60), "TOKEN_EXPIRED"),
+            ("not-a-jwt", "TOKEN_INVALID"),
+        ],
+    )
+    def test_rejected_token(self, client: TestClient, token: str, code: str) -> None:
+        resp = client.get(ME, headers={"Authorization": f"Bearer {token}"})
+        assert resp.status_code == 401
+        assert resp.json()["error"]["code"] == code
+        assert resp.json()["request_id"] == resp.headers["x-request-id"]
+
+
+class TestResolveThresholds:
+    def test_balanced_profile_is_the_engine_baseline(self) -> None:
+        assert resolve_thresholds(_profile("balanced")) is BALANCED_THRESHOLDS
+        assert resolve_thresholds({}) is BALANCED_THRESHOLDS
+
+    def test_presets_shift_by_the_documented_offsets(self) -> None:
+        chill = resolve_thresholds(_profile("chill"))
+        strict = resolve_thresholds(_profile("strict"))
+        base = BALANCED_THRESHOLDS
+        assert chill.swim_wave_ok_m == pytest.approx(base.swim_wave_ok_m + 0.15)
+        assert strict.run_heat_bad_c == pytest.approx(base.run_heat_bad_c - 1.5)
+        assert chill.aqi_bad == base.aqi_bad + 25
+        assert chill.uv_ok == base.uv_ok + 1
+        assert chill.dog_heat_gate_c == base.dog_heat_gate_c + 1.5
+        assert chill.wind_gate_ms == strict.wind_gate_ms == base.wind_gate_ms
+
+    def test_missing_threshold_falls_back_to_preset(self) -> None:
+        profile = _profile("chill")
+        del profile["thresholds"]["uv_warn"]
+        profile["thresholds"]["uv_bad"] = "high"
+        assert resolve_thresholds(profile) == resolve_thresholds(_profile("chill"))
+
+    def test_custom_value(self) -> None:
+        t = resolve_thresholds(_profile("balanced", uv_warn=9))
+        assert t.uv_ok == BALANCED_THRESHOLDS.uv_ok + 3
+        assert fingerprint(t) != fingerprint(BALANCED_THRESHOLDS)
+
+    def test_equal_thresholds_share_a_fingerprint(self) -> None:
+        assert fingerprint(resolve_thresholds(_profile("chill"))) == fingerprint(
+            resolve_thresholds({"preferences": {"preset": "chill"}})
+        )
+
+
+class TestScoresMe:
+    def test_balanced_matches_public_scores(self, client: TestClient) -> None:
+        mine = client.get(ME, headers=_auth("dee"))
+        public = client.get("/v1/public/scores?area_id=tel_aviv_coast&days=1")
+        assert mine.status_code == 200
+        assert mine.json()["hours"] == public.json()["hours"]
+        assert mine.headers["cache-control"] == "private, no-cache"
+
+    def test_presets_change_scores(self, client: TestClient) -> None:
+        chill = _swim_scores(client.get(ME, headers=_auth("ada")))
+        balanced = _swim_scores(client.get(ME, headers=_auth("dee")))
+        strict = _swim_scores(client.get(ME, headers=_auth("cy")))
+        assert all(c >= b >= s for c, b, s in zip(chill, balanced, strict, strict=True))
+        assert chill != strict
+
+    def test_same_preset_shares_one_scoring_pass(self, client: TestClient) -> None:
+        ada = client.get(ME, headers=_auth("ada"))
+        bob = client.get(ME, headers=_auth("bob"))
+        assert ada.json() == bob.json()
+        assert ada.headers["x-thresholds-fingerprint"] == bob.headers["x-thresholds-fingerprint"]
+        client.get(ME, headers=_auth("dee"))  # Balanced reuses the snapshot's scores
+        assert get_personal_scores().builds == 1
+
+    def test_new_version_is_rescored(
+        self, client: TestClient, fake_client: FakeFirestoreClient
+    ) -> None:
+        client.get(ME, headers=_auth("ada"))
+        fake_client.push("forecasts", "tel_aviv_coast", _forecast(age_minutes=1))
+        get_store().invalidate("tel_aviv_coast")
+        client.get(ME, headers=_auth("ada"))
+        assert get_personal_scores().builds == 2
+
+    def test_no_profile(self, client: TestClient) -> None:
+        resp = client.get(ME, headers=_auth("nobody"))
+        assert resp.status_code == 404
+        assert resp.json()["error"]["code"] == "NOT_FOUND"
+
+    def test_never_served_from_the_admission_cache(self, client: TestClient) -> None:
+        from serving.admission import get_admission
+
+        client.get(ME, headers=_auth("ada"))
+        get_admission().observe_lag(1.0)  # lagging: cached copies are preferred
+        assert _swim_scores(client.get(ME, headers=_auth("cy"))) != _swim_scores(
+            client.get(ME, headers=_auth("ada"))
+        )
+
+
+class TestProfileCache:
+    async def test_profile_read_once_within_ttl(self, fake_client: FakeFirestoreClient) -> None:
+        cache = ProfileCache(ttl_seconds=60)
+        await cache.get("ada")
+        await cache.get("ada")
+        assert fake_client.reads.count(("users", "ada")) == 1
+
+    async def test_missing_profile_is_cached(self, fake_client: FakeFirestoreClient) -> None:
+        cache = ProfileCache(ttl_seconds=60)
+        assert await cache.get("nobody") is None
+        assert await cache.get("nobody") is None
+        assert fake_client.reads.count(("users", "nobody")) == 1
+
+    async def test_write_invalidates(self, fake_client: FakeFirestoreClient) -> None:
+        cache = ProfileCache(ttl_seconds=60)
+        await cache.get("ada")
+        await cache.put("ada", _profile("strict"))
+        profile = await cache.get("ada")
+        assert profile is not None
+        assert profile["preferences"]["preset"] == "strict"
+
+    async def test_delete_invalidates(self, fake_client: FakeFirestoreClient) -> None:
+        cache = ProfileCache(ttl_seconds=60)
+        await cache.get("ada")
+        assert await cache.delete("ada")
+        assert await cache.get("ada") is None
+
+    async def test_bounded(self, fake_client: FakeFirestoreClient) -> None:
+        cache = ProfileCache(ttl_seconds=60, max_entries=2)
+        for user_id in ("ada", "bob", "cy", "ada"):
+            await cache.get(user_id)
+        assert fake_client.reads.count(("users", "ada")) == 2
+
+    def test_profile_change_reaches_scores(self, client: TestClient) -> None:
+        import asyncio
+
+        before = _swim_scores(client.get(ME, headers=_auth("ada")))
+        asyncio.run(get_profile_cache().put("ada", _profile("strict")))
+        after = _swim_scores(client.get(ME, headers=_auth("ada")))
+        assert after == _swim_scores(client.get(ME, headers=_auth("cy")))
+        assert after != before
+
+
+class TestProfileRoutes:
+    def _body(self, preset: str = "strict") -> dict[str, Any]:
+        return {
+            **_profile(preset),
+            "preferences": {"preset": preset, "activities_enabled": {"swim": True, "run": False}},
+        }
+
+    def test_get(self, client: TestClient) -> None:
+        resp = client.get(PROFILE, headers=_auth("ada"))
+        assert resp.status_code == 200
+        assert resp.headers["cache-control"] == "private, no-cache"
+        assert resp.json()["preferences"]["preset"] == "chill"
+
+    def test_requires_auth(self, client: TestClient) -> None:
+        assert client.post(PROFILE, json=self._body()).status_code == 401
+
+    def test_create_sets_server_fields(self, client: TestClient) -> None:
+        body = {**self._body(), "user_id": "someone-else", "created_at": "2020-01-01T00:00:00Z"}
+        resp = client.post(PROFILE, json=body, headers=_auth("new"))
+        assert resp.status_code == 200
+        profile = resp.json()
+        assert profile["user_id"] == "new"
+        assert profile["created_at"] == profile["updated_at"] != "2020-01-01T00:00:00Z"
+
+    def test_update_keeps_created_at(
+        self, client: TestClient, fake_client: FakeFirestoreClient
+    ) -> None:
+        fake_client._collections["users"]["ada"]["created_at"] = "2025-06-01T10:00:00Z"
+        resp = client.post(PROFILE, json=self._body(), headers=_auth("ada"))
+        assert resp.json()["created_at"] == "2025-06-01T10:00:00Z"
+
+    def test_update_reaches_scores_at_once(self, client: TestClient) -> None:
+        before = _swim_scores(client.get(ME, headers=_auth("ada")))
+        assert client.post(PROFILE, json=self._body(), headers=_auth("ada")).status_code == 200
+        after = _swim_scores(client.get(ME, headers=_auth("ada")))
+        assert after == _swim_scores(client.get(ME, headers=_auth("cy")))
+        assert after != before
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"schema_version": "profile_v0"},
+            {"location": {"area_id": "haifa"}},
+            {"preferences": {"preset": "extreme", "activities_enabled": {"swim": True}}},
+            {"preferences": {"preset": "strict", "activities_enabled": {"swim": False}}},
+            {"thresholds": {**PRESETS["strict"], "uv_bad": 40}},
+            {"thresholds": {**PRESETS["strict"], "uv_bad": "high"}},
+        ],
+    )
+    def test_invalid_body(self, client: TestClient, change: dict[str, Any]) -> None:
+        resp = client.post(PROFILE, json={**self._body(), **change}, headers=_auth("ada"))
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    @pytest.mark.parametrize("preset", sorted(PRESETS))
+    def test_every_preset_is_valid(self, preset: str) -> None:
+        validate_profile(self._body(preset))
+
+    def test_malformed_json(self, client: TestClient) -> None:
+        headers = {**_auth("ada"), "Content-Type": "application/json"}
+        resp = client.post(PROFILE, content=b"{not json", headers=headers)
+        assert resp.status_code == 400
+
+    @pytest.mark.parametrize("method", ["POST", "DELETE"])
+    def test_cors_preflight(self, client: TestClient, method: str) -> None:
+        resp = client.options(
+            PROFILE,
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": method,
+                "Access-Control-Request-Headers": "authorization, content-type",
+            },
+        )
+        assert resp.status_code == 200
+        assert method in resp.headers["access-control-allow-methods"]
+
+    def test_delete(self, client: TestClient) -> None:
+        client.get(ME, headers=_auth("ada"))
+        assert client.delete(PROFILE, headers=_auth("ada")).status_code == 204
+        assert client.get(ME, headers=_auth("ada")).status_code == 404
+        assert client.delete(PROFILE, headers=_auth("ada")).status_code == 404
@@ -0,0 +1,123 @@
+"""Tests for field, mode and reason-chip projections on /scores."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from scoring_engine import MODES
+
+from config import Config
+from serving import snapshot as snapshot_module
+from serving.projection import HOUR_FIELDS, REASON_LEVELS, parse_projection, projected_rows
+from serving.snapshot import build_snapshot
+from tests.conftest import (
+    make_current_doc,
+)
+
+SCORES = "/v1/public/scores?area_id=tel_aviv_coast"
+
+
+class TestParseProjection:
+    def test_defaults(self) -> None:
+        assert parse_projection(None, None, "full").is_default
+
+    def test_order_is_canonical(self) -> None:
+        a = parse_projection("wind_ms,wave_height_m", "swim_solo,run_solo", "top")
+        b = parse_projection("wave_height_m, wind_ms", "run_solo,swim_solo", "top")
+        assert a.key == b.key
+        assert a.fields == ("wave_height_m", "wind_ms")
+
+    def test_unknown_field_rejected(self) -> None:
+        with pytest.raises(ValueError, match="Unknown fields: bogus"):
+            parse_projection("bogus,wind_ms", None, "full")
+
+    def test_unknown_mode_rejected(self) -> None:
+        with pytest.raises(ValueError, match="Unknown modes: kite"):
+            parse_projection(None, "kite", "full")
+
+
+class TestProjectedRows:
+    def test_projections_do_not_rescore(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+
+        def no_scoring(*args: Any, **kwargs: Any) -> None:
+            raise AssertionError("projection rescored the forecast")
+
+        monkeypatch.setattr(snapshot_module, "score_modes", no_scoring)
+        for reasons in REASON_LEVELS:
+            rows = projected_rows(snapshot, parse_projection("wave_height_m", "run_solo", reasons))
+            assert len(rows) == len(snapshot.hour_epochs)
+
+    def test_top_reason_is_first_full_reason(self) -> None:
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        top = projected_rows(snapshot, parse_projection(None, None, "top"))
+        for row, hour in zip(top, snapshot.scored_hours, strict=True):
+            for mode, ms in json.loads(row)["scores"].items():
+                full = [r.model_dump() for r in hour.scores[mode].reasons]
+                assert ms["reasons"] == full[:1]
+
+    def test_variant_cache_is_bounded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(Config, "PROJECTION_CACHE_SIZE", 3)
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        for name in HOUR_FIELDS[:5]:
+            projected_rows(snapshot, parse_projection(name, None, "full"))
+        assert len(snapshot.variants) == 3
+        assert parse_projection(HOUR_FIELDS[4], None, "full").key in snapshot.variants
+        assert parse_projection(HOUR_FIELDS[0], None, "full").key not in snapshot.variants
+
+    def test_rows_are_memoized_per_projection(self) -> None:
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        first = projected_rows(snapshot, parse_projection("wind_ms,uv_index", None, "top"))
+        again = projected_rows(snapshot, parse_projection("uv_index,wind_ms", None, "top"))
+        assert first is again
+
+
+class TestScoresProjectionEndpoint:
+    def test_default_response_unchanged(self, client: TestClient) -> None:
+        body = client.get(f"{SCORES}&days=1").json()
+        hour = body["hours"][0]
+        assert set(HOUR_FIELDS) <= set(hour)
+        assert set(hour["scores"]) == set(MODES)
+        assert "reasons" in hour["scores"]["run_solo"]
+
+    def test_fields_and_modes_subset(self, client: TestClient) -> None:
+        resp = client.get(f"{SCORES}&days=1&fields=wave_height_m,uv_index&modes=swim_solo")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["hours"]) == 24
+        hour = body["hours"][0]
+        assert set(hour) == {"hour_utc", "wave_height_m", "uv_index", "scores"}
+        assert set(hour["scores"]) == {"swim_solo"}
+        assert body["scoring_version"] == "score_v2"
+        assert body["daily"]
+
+    def test_projected_scores_match_default(self, client: TestClient) -> None:
+        full = client.get(f"{SCORES}&days=1").json()["hours"]
+        proj = client.get(f"{SCORES}&days=1&modes=run_solo&fields=wind_ms").json()["hours"]
+        for f, p in zip(full, proj, strict=True):
+            assert p["hour_utc"] == f["hour_utc"]
+            assert p["wind_ms"] == f["wind_ms"]
+            assert p["scores"]["run_solo"] == f["scores"]["run_solo"]
+
+    def test_reasons_none_omits_chips(self, client: TestClient) -> None:
+        hours = client.get(f"{SCORES}&days=1&reasons=none").json()["hours"]
+        assert all("reasons" not in ms for h in hours for ms in h["scores"].values())
+
+    def test_reasons_top_keeps_one_chip(self, client: TestClient) -> None:
+        hours = client.get(f"{SCORES}&days=1&reasons=top").json()["hours"]
+        assert all(len(ms["reasons"]) <= 1 for h in hours for ms in h["scores"].values())
+
+    def test_empty_modes_returns_metrics_only(self, client: TestClient) -> None:
+        hours = client.get(f"{SCORES}&days=1&modes=").json()["hours"]
+        assert all(h["scores"] == {} for h in hours)
+
+    def test_unknown_field_is_400(self, client: TestClient) -> None:
+        resp = client.get(f"{SCORES}&fields=wave_height_m,nope")
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_bad_reasons_is_422(self, client: TestClient) -> None:
+        assert client.get(f"{SCORES}&reasons=some").status_code == 422
@@ -0,0 +1,252 @@
+"""Tests for the serving cache: single-flight loads and per-version snapshots."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+import serving.store as store_module
+from main import app
+from serving.singleflight import SingleFlight
+from serving.snapshot import build_snapshot
+from serving.store import ForecastStore
+from tests.conftest import (
+    FakeFirestoreClient,
+    install_fake_client,
+    make_current_doc,
+    make_forecast_doc,
+)
+
+
+class CountingReader:
+    """Stand-in for storage.firestore.get_forecast_doc that counts reads."""
+
+    def __init__(self, doc: dict[str, Any] | None, delay_s: float = 0.05) -> None:
+        self.doc = doc
+        self.delay_s = delay_s
+        self.calls = 0
+        self.fail_next = 0
+
+    async def __call__(self, area_id: str) -> dict[str, Any] | None:
+        self.calls += 1
+        await asyncio.sleep(self.delay_s)
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError("firestore unavailable")
+        return self.doc
+
+
+@pytest.fixture
+def reader(monkeypatch: pytest.MonkeyPatch) -> CountingReader:
+    fake = CountingReader(make_forecast_doc())
+    monkeypatch.setattr(store_module, "get_forecast_doc", fake)
+    return fake
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_execution(self) -> None:
+        flight: SingleFlight[int] = SingleFlight()
+        calls = 0
+
+        async def load() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return 42
+
+        results = await asyncio.gather(*(flight.do("k", load) for _ in range(20)))
+        assert results == [42] * 20
+        assert calls == 1
+        assert not flight.inflight("k")
+
+    async def test_error_reaches_every_waiter(self) -> None:
+        flight: SingleFlight[int] = SingleFlight()
+
+        async def boom() -> int:
+            await asyncio.sleep(0.01)
+            raise ValueError("nope")
+
+        results = await asyncio.gather(
+            *(flight.do("k", boom) for _ in range(5)), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        assert not flight.inflight("k")
+
+
+class TestForecastStore:
+    async def test_burst_of_misses_reads_and_scores_once(
+        self, reader: CountingReader, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        builds = 0
+        real_build = store_module.build_snapshot
+
+        def counting_build(area_id: str, doc: dict[str, Any]):  # type: ignore[no-untyped-def]
+            nonlocal builds
+            builds += 1
+            return real_build(area_id, doc)
+
+        monkeypatch.setattr(store_module, "build_snapshot", counting_build)
+        store = ForecastStore(ttl_seconds=60)
+        snapshots = await asyncio.gather(*(store.get("tel_aviv_coast") for _ in range(50)))
+        assert reader.calls == 1
+        assert builds == 1
+        assert all(s is snapshots[0] for s in snapshots)
+
+    async def test_error_propagates_and_is_not_cached(self, reader: CountingReader) -> None:
+        reader.fail_next = 1
+        store = ForecastStore(ttl_seconds=60)
+        results = await asyncio.gather(
+            *(store.get("tel_aviv_coast") for _ in range(10)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert reader.calls == 1
+
+        snapshot = await store.get("tel_aviv_coast")
+        assert snapshot is not None
+        assert reader.calls == 2
+
+    async def test_unchanged_version_is_not_rescored(self, reader: CountingReader) -> None:
+        store = ForecastStore(ttl_seconds=0)
+        first = await store.get("tel_aviv_coast")
+        second = await store.get("tel_aviv_coast")
+        assert reader.calls == 2
+        assert first is second
+
+    async def test_new_version_replaces_snapshot(self, reader: CountingReader) -> None:
+        store = ForecastStore(ttl_seconds=0)
+        first = await store.get("tel_aviv_coast")
+        reader.doc = make_forecast_doc(age_minutes=1)
+        second = await store.get("tel_aviv_coast")
+        assert first is not None and second is not None
+        assert second.version != first.version
+
+    async def test_recent_versions_kept_for_deltas(self, reader: CountingReader) -> None:
+        store = ForecastStore(ttl_seconds=0, versions_kept=2)
+        versions = []
+        for minutes in (3, 2, 1):
+            reader.doc = make_forecast_doc(age_minutes=minutes)
+            snapshot = await store.get("tel_aviv_coast")
+            assert snapshot is not None
+            versions.append(snapshot.version)
+        assert store.version("tel_aviv_coast", versions[0]) is None
+        assert store.version("tel_aviv_coast", versions[1]) is not None
+        assert store.version("tel_aviv_coast", versions[2]) is await store.get("tel_aviv_coast")
+        assert store.version("haifa", versions[2]) is None
+
+    async def test_missing_doc_is_cached_as_none(self, reader: CountingReader) -> None:
+        reader.doc = None
+        store = ForecastStore(ttl_seconds=60)
+        assert await store.get("tel_aviv_coast") is None
+        assert await store.get("tel_aviv_coast") is None
+        assert reader.calls == 1
+
+
+class TestSnapshotListener:
+    @pytest.fixture
+    def fake_client(self) -> Iterator[FakeFirestoreClient]:
+        fake = FakeFirestoreClient({"forecasts": {"tel_aviv_coast": make_forecast_doc()}})
+        install_fake_client(fake)
+        yield fake
+        install_fake_client(None)
+
+    async def test_pushed_snapshot_serves_without_reads(
+        self, fake_client: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        reads = CountingReader(None)
+        monkeypatch.setattr(store_module, "get_forecast_doc", reads)
+        store = ForecastStore(ttl_seconds=0)
+        store.subscribe("tel_aviv_coast")
+
+        snapshot = await store.get("tel_aviv_coast")
+        assert snapshot is not None
+        assert snapshot.area_id == "tel_aviv_coast"
+        assert reads.calls == 0
+        store.close()
+
+    async def test_new_version_swaps_forecast_and_scores_together(
+        self, fake_client: FakeFirestoreClient
+    ) -> None:
+        store = ForecastStore(ttl_seconds=0)
+        store.subscribe("tel_aviv_coast")
+        before = await store.get("tel_aviv_coast")
+
+        new_doc = make_forecast_doc(age_minutes=0, hours_count=24)
+        fake_client.push("forecasts", "tel_aviv_coast", new_doc)
+        after = await store.get("tel_aviv_coast")
+
+        assert before is not None and after is not None
+        assert after.version == new_doc["updated_at_utc"]
+        assert after.doc is new_doc
+        assert len(after.scored_hours) == 24
+        # The old snapshot is untouched for requests still holding it.
+        assert len(before.scored_hours) == 168
+        store.close()
+
+    async def test_deleted_doc_is_pushed_as_none(self, fake_client: FakeFirestoreClient) -> None:
+        store = ForecastStore(ttl_seconds=0)
+        store.subscribe("tel_aviv_coast")
+        fake_client.push("forecasts", "tel_aviv_coast", None)
+        assert await store.get("tel_aviv_coast") is None
+        store.close()
+
+    async def test_closed_listener_falls_back_to_reads(
+        self, fake_client: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        store = ForecastStore(ttl_seconds=0)
+        store.subscribe("tel_aviv_coast")
+        store.close()
+        assert not store.is_live("tel_aviv_coast")
+
+        reads = CountingReader(make_forecast_doc())
+        monkeypatch.setattr(store_module, "get_forecast_doc", reads)
+        await store.get("tel_aviv_coast")
+        assert reads.calls == 1
+
+    def test_app_lifespan_subscribes_configured_area(
+        self, fake_client: FakeFirestoreClient
+    ) -> None:
+        with TestClient(app) as client:
+            new_doc = make_forecast_doc(age_minutes=5)
+            fake_client.push("forecasts", "tel_aviv_coast", new_doc)
+            resp = client.get("/v1/public/health")
+            assert resp.json()["forecast"]["updated_at_utc"] == new_doc["updated_at_utc"]
+
+
+class TestHourIndex:
+    def test_epochs_are_sorted_and_parallel(self) -> None:
+        doc = make_current_doc()
+        doc["hours"].reverse()
+        snapshot = build_snapshot("tel_aviv_coast", doc)
+        assert snapshot.hour_epochs == sorted(snapshot.hour_epochs)
+        assert len(snapshot.hour_epochs) == len(snapshot.scored_hours) == 168
+        first = datetime.fromisoformat(snapshot.scored_hours[0].hour_utc)
+        assert int(first.timestamp()) == snapshot.hour_epochs[0]
+
+    def test_window_starts_at_first_hour_not_before_now(self) -> None:
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        now = datetime.now(UTC)
+        hours = snapshot.scored_hours[snapshot.window(now, 1)]
+        assert len(hours) == 24
+        first = datetime.fromisoformat(hours[0].hour_utc)
+        assert first >= now
+        assert first - timedelta(hours=1) < now
+
+    def test_malformed_hours_dropped_once_at_build(self) -> None:
+        doc = make_current_doc()
+        doc["hours"][5]["hour_utc"] = "not-a-date"
+        del doc["hours"][6]["hour_utc"]
+        snapshot = build_snapshot("tel_aviv_coast", doc)
+        assert len(snapshot.hour_epochs) == 166
+        assert all(h["hour_utc"] != "not-a-date" for h in snapshot.hours if "hour_utc" in h)
+
+    def test_scores_endpoint_slices_days(self, client_with_forecast: TestClient) -> None:
+        fake = FakeFirestoreClient({"forecasts": {"tel_aviv_coast": make_current_doc()}})
+        install_fake_client(fake)
+        resp = client_with_forecast.get("/v1/public/scores?area_id=tel_aviv_coast&days=2")
+        assert resp.status_code == 200
+        assert len(resp.json()["hours"]) == 48
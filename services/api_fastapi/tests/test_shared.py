@@ -0,0 +1,269 @@
+"""Tests for snapshots shared across workers through memory-mapped files."""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Config
+from main import app
+from serving import shared as shared_module
+from serving.health import HealthCache, HealthSummary
+from serving.shared import (
+    FollowerStore,
+    MappedSnapshot,
+    SharedSnapshots,
+    SnapshotFiles,
+    get_shared,
+    set_shared,
+    snapshot_path,
+    write_snapshot_file,
+)
+from serving.snapshot import ForecastSnapshot, build_snapshot
+from serving.store import get_store, set_store
+from tests.conftest import (
+    FakeFirestoreClient,
+    install_fake_client,
+    make_current_doc,
+)
+
+URL = "/v1/public/scores"
+AREA = {"area_id": "tel_aviv_coast"}
+
+
+@pytest.fixture
+def fake_client() -> Iterator[FakeFirestoreClient]:
+    fake = FakeFirestoreClient({"forecasts": {"tel_aviv_coast": make_current_doc()}})
+    install_fake_client(fake)
+    yield fake
+    install_fake_client(None)
+
+
+class TestSnapshotFile:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        mapped = MappedSnapshot(write_snapshot_file(tmp_path, snapshot))
+        assert mapped.version == snapshot.version
+        assert list(mapped.epochs) == snapshot.hour_epochs
+        assert mapped.doc() == snapshot.doc
+        assert mapped.snapshot().scored_hours == snapshot.scored_hours
+
+    def test_window_rows_match_models(self, tmp_path: Path) -> None:
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        mapped = MappedSnapshot(write_snapshot_file(tmp_path, snapshot))
+        now = datetime.now(UTC)
+        window = mapped.window(now, 2)
+        assert window == snapshot.window(now, 2)
+        rows = json.loads(b"[" + mapped.rows("scores", window) + b"]")
+        assert rows == [h.model_dump() for h in snapshot.scored_hours[window]]
+        forecast = json.loads(b"[" + mapped.rows("forecast", window) + b"]")
+        assert forecast == [h.model_dump() for h in snapshot.forecast_hours[window]]
+
+    def test_empty_window(self, tmp_path: Path) -> None:
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        mapped = MappedSnapshot(write_snapshot_file(tmp_path, snapshot))
+        assert mapped.rows("scores", slice(500, 524)) == b""
+
+    def test_rejects_foreign_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "tel_aviv_coast.snap"
+        path.write_bytes(b"not a snapshot file at all")
+        with pytest.raises(ValueError):
+            MappedSnapshot(path)
+
+    def test_replaced_file_is_remapped_after_poll(self, tmp_path: Path) -> None:
+        files = SnapshotFiles(tmp_path, poll_seconds=0)
+        write_snapshot_file(tmp_path, build_snapshot("tel_aviv_coast", make_current_doc(30)))
+        old = files.get("tel_aviv_coast")
+        new_doc = make_current_doc(5)
+        write_snapshot_file(tmp_path, build_snapshot("tel_aviv_coast", new_doc))
+        new = files.get("tel_aviv_coast")
+        assert old is not None and new is not None
+        assert new.version == new_doc["updated_at_utc"]
+        # The old mapping stays readable for requests still using it.
+        assert old.rows("scores", slice(0, 1))
+
+
+class TestFollowerVersions:
+    def _write(self, directory: Path, age_minutes: int) -> dict:
+        doc = make_current_doc(hours_back=0, age_minutes=age_minutes)
+        doc["hours"][30]["wave_height_m"] = 1.4 + age_minutes / 100
+        write_snapshot_file(directory, build_snapshot("tel_aviv_coast", doc))
+        return doc
+
+    async def test_mapped_versions_are_kept(
+        self, tmp_path: Path, fake_client: FakeFirestoreClient
+    ) -> None:
+        follower = FollowerStore(SnapshotFiles(tmp_path, poll_seconds=0, versions_kept=2))
+        docs = []
+        for age in (30, 20, 10):
+            docs.append(self._write(tmp_path, age))
+            await follower.get("tel_aviv_coast")
+        versions = [d["updated_at_utc"] for d in docs]
+        assert follower.version("tel_aviv_coast", versions[0]) is None
+        for version in versions[1:]:
+            base = follower.version("tel_aviv_coast", version)
+            assert base is not None and base.version == version
+        assert fake_client.reads == []
+
+    def test_scores_since_on_a_follower(
+        self, tmp_path: Path, fake_client: FakeFirestoreClient
+    ) -> None:
+        shared = SharedSnapshots(tmp_path, ("tel_aviv_coast",), poll_seconds=0)
+        set_shared(shared)
+        set_store(FollowerStore(shared.files))
+        try:
+            client = TestClient(app)
+            self._write(tmp_path, 30)
+            base = client.get(URL, params=AREA).json()
+            new_doc = self._write(tmp_path, 10)
+            body = client.get(URL, params={**AREA, "since": base["updated_at_utc"]}).json()
+        finally:
+            set_shared(None)
+            set_store(None)
+        assert body["updated_at_utc"] == new_doc["updated_at_utc"]
+        assert body["since_updated_at_utc"] == base["updated_at_utc"]
+        assert [h["hour_utc"] for h in body["hours"]] == [new_doc["hours"][30]["hour_utc"]]
+        assert fake_client.reads == []
+
+
+class TestFollowerSharing:
+    def test_only_default_bodies_and_health_skip_the_build(
+        self, tmp_path: Path, fake_client: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        builds: list[str] = []
+
+        def _build(area_id: str, doc: dict) -> ForecastSnapshot:
+            builds.append(area_id)
+            return build_snapshot(area_id, doc)
+
+        write_snapshot_file(tmp_path, build_snapshot("tel_aviv_coast", make_current_doc()))
+        monkeypatch.setattr(shared_module, "build_snapshot", _build)
+        shared = SharedSnapshots(tmp_path, ("tel_aviv_coast",), poll_seconds=60)
+        set_shared(shared)
+        set_store(FollowerStore(shared.files))
+        try:
+            client = TestClient(app)
+            for path in ("/v1/public/scores", "/v1/public/forecast"):
+                assert client.get(path, params=AREA).status_code == 200
+            assert client.get("/v1/public/health").status_code == 200
+            assert builds == []
+
+            # Any other endpoint builds the snapshot, once per mapped version.
+            for _ in range(2):
+                assert client.get("/v1/public/daily", params=AREA).status_code == 200
+            assert builds == ["tel_aviv_coast"]
+        finally:
+            set_shared(None)
+            set_store(None)
+        assert fake_client.reads == []
+
+
+class TestElection:
+    async def test_one_leader_and_takeover(
+        self, tmp_path: Path, fake_client: FakeFirestoreClient
+    ) -> None:
+        first = SharedSnapshots(tmp_path, ("tel_aviv_coast",), poll_seconds=60)
+        second = SharedSnapshots(tmp_path, ("tel_aviv_coast",), poll_seconds=60)
+        assert first._try_lock()
+        assert not second._try_lock()
+        first.close()
+        assert second._try_lock()
+        second.close()
+
+    async def test_leader_writes_and_follower_serves_without_firestore(
+        self, tmp_path: Path, fake_client: FakeFirestoreClient
+    ) -> None:
+        leader = SharedSnapshots(tmp_path, ("tel_aviv_coast",), poll_seconds=60)
+        leader.start()
+        try:
+            assert leader.leader
+            await get_store().get("tel_aviv_coast")
+            await leader.flush()
+            assert snapshot_path(tmp_path, "tel_aviv_coast").exists()
+
+            fake_client.reads.clear()
+            follower = FollowerStore(SnapshotFiles(tmp_path, poll_seconds=60))
+            snapshot = await follower.get("tel_aviv_coast")
+            assert snapshot is not None
+            assert (
+                snapshot.version
+                == fake_client._collections["forecasts"]["tel_aviv_coast"]["updated_at_utc"]
+            )
+            assert fake_client.reads == []
+        finally:
+            leader.close()
+
+    async def test_leader_writes_off_the_event_loop(
+        self, tmp_path: Path, fake_client: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        threads: list[str] = []
+
+        def _write(directory: Path, snapshot: ForecastSnapshot) -> Path:
+            threads.append(threading.current_thread().name)
+            return write_snapshot_file(directory, snapshot)
+
+        monkeypatch.setattr(shared_module, "write_snapshot_file", _write)
+        leader = SharedSnapshots(tmp_path, ("tel_aviv_coast",), poll_seconds=60)
+        leader.start()
+        try:
+            await get_store().get("tel_aviv_coast")
+            await leader.flush()
+        finally:
+            leader.close()
+        assert len(threads) == 1
+        assert threads[0] != threading.current_thread().name
+
+    async def test_follower_health_reads_the_index_only(
+        self, tmp_path: Path, fake_client: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        doc = make_current_doc()
+        write_snapshot_file(tmp_path, build_snapshot("tel_aviv_coast", doc))
+        set_store(FollowerStore(SnapshotFiles(tmp_path, poll_seconds=60)))
+        built: list[str] = []
+        monkeypatch.setattr(MappedSnapshot, "snapshot", lambda self: built.append(self.area_id))
+        try:
+            summary = await HealthCache().get("tel_aviv_coast")
+        finally:
+            set_store(None)
+        assert summary == HealthSummary(
+            updated_at_utc=doc["updated_at_utc"],
+            ingest_status=doc["ingest_status"],
+            hours_count=len(doc["hours"]),
+        )
+        assert built == []
+        assert fake_client.reads == []
+
+
+class TestSharedApp:
+    @pytest.fixture
+    def client(
+        self, tmp_path: Path, fake_client: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> Iterator[TestClient]:
+        monkeypatch.setattr(Config, "SNAPSHOT_DIR", str(tmp_path))
+        with TestClient(app) as client:
+            yield client
+
+    def test_default_bodies_match_unshared(self, client: TestClient) -> None:
+        params = {"area_id": "tel_aviv_coast", "days": 1}
+        shared = get_shared()
+        assert shared is not None and shared.files.get("tel_aviv_coast") is not None
+        for path in ("/v1/public/scores", "/v1/public/forecast"):
+            resp = client.get(path, params=params)
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == "application/json"
+            set_shared(None)
+            try:
+                unshared = client.get(path, params=params)
+            finally:
+                set_shared(shared)
+            assert resp.json() == unshared.json()
+
+    def test_other_endpoints_still_work(self, client: TestClient) -> None:
+        resp = client.get("/v1/public/daily", params={"area_id": "tel_aviv_coast"})
+        assert resp.status_code == 200
@@ -0,0 +1,90 @@
+"""Tests for the Firestore storage layer."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Config
+from main import app
+from storage.firestore import FirestoreTimeoutError, get_forecast_doc
+from tests.conftest import FakeFirestoreClient, install_fake_client, make_forecast_doc
+
+
+@pytest.fixture
+def slow_firestore():  # type: ignore[no-untyped-def]
+    fake = FakeFirestoreClient({"forecasts": {"tel_aviv_coast": make_forecast_doc()}})
+    install_fake_client(fake)
+    yield fake
+    install_fake_client(None)
+
+
+class TestNonBlockingReads:
+    async def test_read_returns_document(self, slow_firestore: FakeFirestoreClient) -> None:
+        doc = await get_forecast_doc("tel_aviv_coast")
+        assert doc is not None
+        assert doc["area_id"] == "tel_aviv_coast"
+
+    async def test_missing_document_returns_none(
+        self, slow_firestore: FakeFirestoreClient
+    ) -> None:
+        assert await get_forecast_doc("haifa") is None
+
+    async def test_slow_read_does_not_block_event_loop(
+        self, slow_firestore: FakeFirestoreClient
+    ) -> None:
+        slow_firestore.latency_s = 0.2
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await get_forecast_doc("tel_aviv_coast")
+        task.cancel()
+        # A blocking read would starve the ticker for the full 200ms.
+        assert ticks >= 10
+
+    async def test_concurrent_reads_overlap(self, slow_firestore: FakeFirestoreClient) -> None:
+        slow_firestore.latency_s = 0.1
+        started = time.perf_counter()
+        await asyncio.gather(*(get_forecast_doc("tel_aviv_coast") for _ in range(8)))
+        assert time.perf_counter() - started < 0.5
+
+    async def test_deadline_exceeded_raises(
+        self, slow_firestore: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "FIRESTORE_TIMEOUT_SECONDS", 0.05)
+        slow_firestore.latency_s = 0.3
+        with pytest.raises(FirestoreTimeoutError):
+            await get_forecast_doc("tel_aviv_coast")
+
+
+class TestDeadlineResponse:
+    def test_timeout_returns_503_envelope(
+        self, slow_firestore: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "FIRESTORE_TIMEOUT_SECONDS", 0.05)
+        slow_firestore.latency_s = 0.3
+        resp = TestClient(app).get("/v1/public/scores?area_id=tel_aviv_coast")
+        assert resp.status_code == 503
+        data = resp.json()
+        assert data["error"]["code"] == "UPSTREAM_TIMEOUT"
+        assert data["request_id"] == resp.headers["x-request-id"]
+
+
+class TestLazySdkImport:
+    def test_app_import_does_not_load_firestore_sdk(self) -> None:
+        code = "import sys, main; print('google.cloud.firestore' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
@@ -0,0 +1,149 @@
+"""Tests for the Server-Sent Events score stream."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Config
+from main import app
+from routers.public import _score_events
+from serving.snapshot import build_snapshot
+from serving.store import ForecastStore, get_store, set_store
+from tests.conftest import (
+    FakeFirestoreClient,
+    install_fake_client,
+    make_current_doc,
+    make_forecast_doc,
+)
+
+
+def _parse(chunk: bytes) -> dict[str, str]:
+    fields = {}
+    for line in chunk.decode().strip().splitlines():
+        key, _, value = line.partition(": ")
+        fields[key] = value
+    return fields
+
+
+@pytest.fixture
+def fake_client() -> Iterator[FakeFirestoreClient]:
+    fake = FakeFirestoreClient({"forecasts": {"tel_aviv_coast": make_current_doc(hours_back=0)}})
+    install_fake_client(fake)
+    set_store(ForecastStore(ttl_seconds=60))
+    get_store().subscribe("tel_aviv_coast")
+    yield fake
+    get_store().close()
+    install_fake_client(None)
+
+
+class TestScoreEventStream:
+    async def test_initial_full_event_then_delta_on_new_version(
+        self, fake_client: FakeFirestoreClient
+    ) -> None:
+        snapshot = await get_store().get("tel_aviv_coast")
+        assert snapshot is not None
+        events = _score_events(snapshot, "full", None)
+
+        assert (await anext(events)).startswith(b"retry:")
+        first = _parse(await anext(events))
+        assert first["event"] == "scores"
+        assert first["id"] == snapshot.version
+        assert len(json.loads(first["data"])["hours"]) > 0
+
+        new_doc = make_current_doc(hours_back=0, age_minutes=0)
+        new_doc["hours"][30]["wave_height_m"] = 1.4
+        new_doc["hours"] = new_doc["hours"][1:]
+        next_event = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0)
+        fake_client.push("forecasts", "tel_aviv_coast", new_doc)
+
+        delta = _parse(await asyncio.wait_for(next_event, timeout=2))
+        assert delta["event"] == "delta"
+        assert delta["id"] == new_doc["updated_at_utc"]
+        body = json.loads(delta["data"])
+        assert body["since_updated_at_utc"] == snapshot.version
+        assert [h["hour_utc"] for h in body["hours"]] == [new_doc["hours"][29]["hour_utc"]]
+        assert body["dropped_hours"] == [snapshot.hours[0]["hour_utc"]]
+        await events.aclose()
+        assert get_store().updates.subscriber_count() == 0
+
+    async def test_resume_with_current_version_skips_initial_event(
+        self, fake_client: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "SSE_HEARTBEAT_SECONDS", 0.01)
+        snapshot = await get_store().get("tel_aviv_coast")
+        assert snapshot is not None
+        events = _score_events(snapshot, "full", snapshot.version)
+        await anext(events)  # retry hint
+        assert await anext(events) == b": keepalive\n\n"
+        await events.aclose()
+
+    async def test_version_marker_initial_event(self, fake_client: FakeFirestoreClient) -> None:
+        snapshot = await get_store().get("tel_aviv_coast")
+        assert snapshot is not None
+        events = _score_events(snapshot, "version", None)
+        await anext(events)
+        marker = _parse(await anext(events))
+        assert marker["event"] == "version"
+        assert json.loads(marker["data"])["updated_at_utc"] == snapshot.version
+        await events.aclose()
+
+    async def test_delta_encoded_once_for_all_subscribers(
+        self, fake_client: FakeFirestoreClient
+    ) -> None:
+        snapshot = await get_store().get("tel_aviv_coast")
+        assert snapshot is not None
+        streams = [_score_events(snapshot, "version", None) for _ in range(50)]
+        for stream in streams:
+            await anext(stream)
+            await anext(stream)
+        pending = [asyncio.ensure_future(anext(s)) for s in streams]
+        await asyncio.sleep(0)
+        assert get_store().updates.subscriber_count("tel_aviv_coast") == 50
+
+        fake_client.push(
+            "forecasts", "tel_aviv_coast", make_current_doc(hours_back=0, age_minutes=0)
+        )
+        deltas = await asyncio.wait_for(asyncio.gather(*pending), timeout=2)
+        assert all(d is deltas[0] for d in deltas)
+        for stream in streams:
+            await stream.aclose()
+
+
+class TestStreamEndpoint:
+    def test_stream_headers_and_first_event(
+        self, fake_client: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "SSE_MAX_STREAM_SECONDS", 0.05)
+        resp = TestClient(app).get("/v1/public/scores/stream?area_id=tel_aviv_coast")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        assert resp.headers["cache-control"] == "no-cache"
+        assert "event: scores" in resp.text
+
+    def test_stream_unknown_area(self, fake_client: FakeFirestoreClient) -> None:
+        resp = TestClient(app).get("/v1/public/scores/stream?area_id=haifa")
+        assert resp.status_code == 404
+
+    def test_stream_rejects_bad_initial(self, fake_client: FakeFirestoreClient) -> None:
+        resp = TestClient(app).get(
+            "/v1/public/scores/stream?area_id=tel_aviv_coast&initial=everything"
+        )
+        assert resp.status_code == 422
+
+
+async def test_subscription_buffer_is_bounded() -> None:
+    store = ForecastStore()
+    sub = store.updates.subscribe("tel_aviv_coast", buffer_size=2)
+    for minutes in range(5):
+        doc = make_forecast_doc(age_minutes=minutes, hours_count=2)
+        sub.offer(build_snapshot("tel_aviv_coast", doc))
+    assert sub.dropped == 3
+    assert (await sub.next(timeout=0)) is not None
+    assert (await sub.next(timeout=0)) is not None
+    assert (await sub.next(timeout=0.01)) is None
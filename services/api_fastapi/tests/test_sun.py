@@ -0,0 +1,85 @@
+"""Tests for the per-area sunrise/sunset tables used when ``daily`` is missing."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from scoring_engine.solar import Location
+
+from config import Config
+from serving.snapshot import build_snapshot
+from serving.sun import SunTables, get_sun_tables, parse_locations, set_sun_tables
+from tests.conftest import make_forecast_doc
+
+TEL_AVIV = Location(32.08, 34.77)
+EILAT = Location(29.56, 34.95)
+
+
+@pytest.fixture
+def tables() -> Iterator[SunTables]:
+    tables = SunTables({"tel_aviv_coast": TEL_AVIV, "eilat": EILAT}, date(2026, 1, 1), days=366)
+    set_sun_tables(tables)
+    yield tables
+    set_sun_tables(None)
+
+
+class TestParseLocations:
+    def test_entries(self) -> None:
+        assert parse_locations("a:32.08:34.77, b:29.56:34.95") == {
+            "a": Location(32.08, 34.77),
+            "b": Location(29.56, 34.95),
+        }
+
+    def test_malformed_entries_skipped(self) -> None:
+        assert parse_locations("a:32.08,b:x:1,c:1:2,") == {"c": Location(1.0, 2.0)}
+
+
+class TestSunTables:
+    def test_per_area_times(self, tables: SunTables) -> None:
+        # Eilat is ~280 km south of Tel Aviv, so its day is measurably shorter in June.
+        tlv_rise, tlv_set = tables.times("tel_aviv_coast", date(2026, 6, 21))
+        eilat_rise, eilat_set = tables.times("eilat", date(2026, 6, 21))
+        assert eilat_set - eilat_rise < tlv_set - tlv_rise
+        assert tlv_rise.tzinfo is UTC
+
+    def test_unknown_area_uses_default(self, tables: SunTables) -> None:
+        d = date(2026, 3, 1)
+        assert tables.times("nowhere", d) == tables.times(Config.AREA_ID, d)
+
+    def test_polar_days_count_as_daylight(self) -> None:
+        tables = SunTables({Config.AREA_ID: Location(78.2, 15.6)}, date(2026, 6, 21), days=1)
+        rise, sset = tables.times(Config.AREA_ID, date(2026, 6, 21))
+        assert sset - rise == timedelta(days=1)
+
+    def test_default_tables_cover_today(self) -> None:
+        set_sun_tables(None)
+        try:
+            table = get_sun_tables().table(Config.AREA_ID)
+            assert table.start <= datetime.now(UTC).date() < table.start + timedelta(len(table))
+        finally:
+            set_sun_tables(None)
+
+
+class TestSnapshotFallback:
+    def test_missing_daily_uses_area_table(self, tables: SunTables) -> None:
+        doc = make_forecast_doc(base_time=datetime(2026, 6, 21, tzinfo=UTC))
+        doc.pop("daily", None)
+        snapshot = build_snapshot("eilat", doc)
+        expected = tables.times("eilat", date(2026, 6, 21))
+        hd = snapshot.hour_inputs[0]
+        assert (hd.sunrise_utc, hd.sunset_utc) == expected
+
+    def test_daily_block_still_wins(self, tables: SunTables) -> None:
+        doc = make_forecast_doc(base_time=datetime(2026, 6, 21, tzinfo=UTC))
+        doc["daily"] = [
+            {
+                "date": "2026-06-21",
+                "sunrise_utc": "2026-06-21T02:30:00Z",
+                "sunset_utc": "2026-06-21T16:50:00Z",
+            }
+        ]
+        hd = build_snapshot("eilat", doc).hour_inputs[0]
+        assert hd.sunrise_utc == datetime(2026, 6, 21, 2, 30, tzinfo=UTC)
+        assert hd.sunset_utc == datetime(2026, 6, 21, 16, 50, tzinfo=UTC)
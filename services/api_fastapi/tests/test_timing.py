@@ -0,0 +1,101 @@
+"""Tests for the opt-in Server-Timing header and request-correlated logs."""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Config
+from telemetry import context as request_context
+from telemetry.logs import JsonFormatter, RequestIdFilter
+
+SCORES = "/v1/public/scores?area_id=tel_aviv_coast"
+DEBUG = {"X-Server-Timing": "1"}
+
+
+def _stages(header: str) -> dict[str, float]:
+    out = {}
+    for part in header.split(", "):
+        name, _, dur = part.partition(";dur=")
+        out[name] = float(dur)
+    return out
+
+
+@pytest.fixture(autouse=True)
+def allow_header(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Config, "SERVER_TIMING_ALLOW_HEADER", True)
+
+
+class TestServerTiming:
+    def test_off_by_default(self, client: TestClient) -> None:
+        assert "server-timing" not in client.get(SCORES).headers
+
+    def test_debug_header_reports_cold_load_stages(self, client: TestClient) -> None:
+        resp = client.get(SCORES, headers=DEBUG)
+        stages = _stages(resp.headers["server-timing"])
+        assert {"firestore", "parse", "score", "models", "cache", "encode", "total"} <= set(stages)
+        assert stages["cache"] >= stages["firestore"]
+        assert stages["total"] >= stages["cache"]
+
+    def test_cached_request_skips_load_stages(self, client: TestClient) -> None:
+        client.get(SCORES)
+        stages = _stages(client.get(SCORES, headers=DEBUG).headers["server-timing"])
+        assert set(stages) == {"cache", "encode", "total"}
+
+    def test_config_enables_for_every_request(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "SERVER_TIMING_ENABLED", True)
+        assert "total" in _stages(client.get("/").headers["server-timing"])
+
+    def test_debug_header_can_be_disallowed(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "SERVER_TIMING_ALLOW_HEADER", False)
+        assert "server-timing" not in client.get(SCORES, headers=DEBUG).headers
+
+
+class TestRequestLogs:
+    def test_api_request_log_matches_header(
+        self, client: TestClient, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        caplog.handler.addFilter(RequestIdFilter())
+        with caplog.at_level(logging.INFO, logger="main"):
+            resp = client.get(SCORES, headers=DEBUG)
+        records = [r for r in caplog.records if r.getMessage() == "api_request"]
+        assert len(records) == 1
+        record = records[0]
+        assert record.request_id == resp.headers["x-request-id"]
+        assert record.endpoint == "/v1/public/scores"
+        header = _stages(resp.headers["server-timing"])
+        assert record.stages_ms == {k: v for k, v in header.items() if k != "total"}
+
+    def test_logs_inside_a_request_carry_its_id(
+        self, client: TestClient, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        caplog.handler.addFilter(RequestIdFilter())
+        with caplog.at_level(logging.INFO, logger="serving.store"):
+            resp = client.get(SCORES)
+        built = [r for r in caplog.records if r.getMessage() == "snapshot_built"]
+        assert built[0].request_id == resp.headers["x-request-id"]
+
+
+class TestJsonFormatter:
+    def test_one_json_object_with_extras(self) -> None:
+        record = logging.LogRecord("serving.store", logging.INFO, __file__, 1, "evt", (), None)
+        record.area_id = "tel_aviv_coast"
+
+        def _in_request() -> None:
+            request_context.begin("req-1")
+            RequestIdFilter().filter(record)
+
+        contextvars.copy_context().run(_in_request)
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "evt"
+        assert entry["severity"] == "INFO"
+        assert entry["area_id"] == "tel_aviv_coast"
+        assert entry["request_id"] == "req-1"
@@ -0,0 +1,78 @@
+"""Tests for the cold-start warm-up run by the app lifespan."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from config import Config
+from main import app
+from serving.admission import get_admission
+from serving.store import get_store
+from serving.warmup import warm_up
+from tests.conftest import FakeFirestoreClient, install_fake_client, make_forecast_doc
+
+
+@pytest.fixture
+def fake_client(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeFirestoreClient]:
+    monkeypatch.setattr(Config, "FORECAST_PUSH_UPDATES", False)
+    fake = FakeFirestoreClient({"forecasts": {"tel_aviv_coast": make_forecast_doc()}})
+    install_fake_client(fake)
+    yield fake
+    install_fake_client(None)
+
+
+class TestWarmUp:
+    async def test_default_requests_succeed(self, fake_client: FakeFirestoreClient) -> None:
+        statuses = await warm_up(app, ["tel_aviv_coast"])
+        assert statuses
+        assert set(statuses.values()) == {200}
+        assert "/v1/public/scores?area_id=tel_aviv_coast" in statuses
+
+    async def test_loads_each_area_once(self, fake_client: FakeFirestoreClient) -> None:
+        await warm_up(app, ["tel_aviv_coast"])
+        assert fake_client.reads.count(("forecasts", "tel_aviv_coast")) == 1
+        assert get_store()._entries["tel_aviv_coast"].snapshot is not None
+
+    async def test_not_counted_as_traffic(self, fake_client: FakeFirestoreClient) -> None:
+        labels = {"endpoint": "/v1/public/scores", "method": "GET", "status_code": "200"}
+        before = REGISTRY.get_sample_value("api_request_count_total", labels) or 0.0
+        await warm_up(app, ["tel_aviv_coast"])
+        assert (REGISTRY.get_sample_value("api_request_count_total", labels) or 0.0) == before
+
+    async def test_responses_not_kept_by_admission(self, fake_client: FakeFirestoreClient) -> None:
+        await warm_up(app, ["tel_aviv_coast"])
+        assert not get_admission().cache._entries
+
+    async def test_timeout_does_not_raise(
+        self,
+        fake_client: FakeFirestoreClient,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        monkeypatch.setattr(Config, "WARMUP_TIMEOUT_SECONDS", 0.01)
+        fake_client.latency_s = 0.2
+        with caplog.at_level(logging.ERROR, logger="serving.warmup"):
+            await warm_up(app, ["tel_aviv_coast"])
+        assert any(r.message == "warmup_failed" for r in caplog.records)
+
+
+class TestLifespanWarmUp:
+    def test_first_request_is_served_warm(self, fake_client: FakeFirestoreClient) -> None:
+        with TestClient(app) as client:
+            assert ("forecasts", "tel_aviv_coast") in fake_client.reads
+            fake_client.reads.clear()
+            resp = client.get("/v1/public/scores", params={"area_id": "tel_aviv_coast"})
+            assert resp.status_code == 200
+            assert fake_client.reads == []
+
+    def test_disabled(
+        self, fake_client: FakeFirestoreClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Config, "WARMUP_ENABLED", False)
+        with TestClient(app):
+            assert fake_client.reads == []
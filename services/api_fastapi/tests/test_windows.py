@@ -0,0 +1,116 @@
+"""Tests for good-window detection and the /windows endpoint."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Config
+from serving.snapshot import build_snapshot
+from serving.windows import Window, best_per_day, find_windows, mode_windows
+from tests.conftest import (
+    make_current_doc,
+)
+
+WINDOWS = "/v1/public/windows?area_id=tel_aviv_coast"
+JERUSALEM = ZoneInfo("Asia/Jerusalem")
+T0 = int(datetime(2026, 7, 1, 3, tzinfo=UTC).timestamp())
+
+
+def _epochs(n: int, start: int = T0) -> list[int]:
+    return [start + 3600 * i for i in range(n)]
+
+
+class TestFindWindows:
+    def test_runs_above_threshold(self) -> None:
+        scores = [50, 80, 90, 60, 75, 71, 72, 10]
+        windows = find_windows(_epochs(len(scores)), scores, 70, 1)
+        assert [(w.start, w.hours) for w in windows] == [(T0 + 3600, 2), (T0 + 4 * 3600, 3)]
+        assert windows[0].avg_score == 85
+        assert windows[1].peak_score == 75
+
+    def test_min_hours(self) -> None:
+        scores = [80, 40, 80, 80, 40]
+        windows = find_windows(_epochs(len(scores)), scores, 70, 2)
+        assert [(w.start, w.hours) for w in windows] == [(T0 + 2 * 3600, 2)]
+
+    def test_gap_in_hours_splits_a_run(self) -> None:
+        epochs = _epochs(4)
+        epochs[2:] = [e + 3600 for e in epochs[2:]]  # one missing hour
+        windows = find_windows(epochs, [80, 80, 80, 80], 70, 1)
+        assert [w.hours for w in windows] == [2, 2]
+
+    def test_run_to_end_of_horizon(self) -> None:
+        windows = find_windows(_epochs(3), [10, 90, 95], 70, 1)
+        assert windows[-1].end == T0 + 3 * 3600
+
+
+class TestBestPerDay:
+    def test_ranked_by_average_then_earliest(self) -> None:
+        windows = [
+            Window(T0, 1, 75, 75),
+            Window(T0 + 3 * 3600, 2, 90, 92),
+            Window(T0 + 6 * 3600, 1, 90, 90),
+        ]
+        days = best_per_day(windows, JERUSALEM)
+        assert list(days) == ["2026-07-01"]
+        assert days["2026-07-01"] == [windows[1], windows[2]]
+
+    def test_days_are_local(self) -> None:
+        # 22:00 UTC in July is 01:00 the next day in Jerusalem (UTC+3).
+        late = Window(int(datetime(2026, 7, 1, 22, tzinfo=UTC).timestamp()), 1, 80, 80)
+        assert list(best_per_day([late], JERUSALEM)) == ["2026-07-02"]
+        # In January the offset is +2: 21:00 UTC is 23:00 the same day.
+        winter = Window(int(datetime(2026, 1, 5, 21, tzinfo=UTC).timestamp()), 1, 80, 80)
+        assert list(best_per_day([winter], JERUSALEM)) == ["2026-01-05"]
+
+    def test_memoized_per_version(self) -> None:
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        first = mode_windows(snapshot, "run_solo", 70, 1, 0, JERUSALEM)
+        assert mode_windows(snapshot, "run_solo", 70, 1, 0, JERUSALEM) is first
+
+    def test_rules_share_the_bounded_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(Config, "PROJECTION_CACHE_SIZE", 5)
+        snapshot = build_snapshot("tel_aviv_coast", make_current_doc())
+        for min_score in range(50, 100):
+            mode_windows(snapshot, "run_solo", min_score, 1, 0, JERUSALEM)
+        assert len(snapshot.variants) == 5
+
+
+class TestWindowsEndpoint:
+    def test_windows_match_scores(self, client: TestClient) -> None:
+        body = client.get(f"{WINDOWS}&modes=run_solo&min_score=0").json()
+        hours = client.get("/v1/public/scores?area_id=tel_aviv_coast").json()["hours"]
+        windows = body["modes"]["run_solo"]["windows"]
+        assert body["min_score"] == 0 and body["min_minutes"] == 60
+        # With min_score=0 the whole future horizon is one window.
+        assert len(windows) == 1
+        assert windows[0]["start_utc"] == hours[0]["hour_utc"]
+        assert windows[0]["duration_minutes"] == 60 * len(hours)
+        avg = sum(h["scores"]["run_solo"]["score"] for h in hours) / len(hours)
+        assert windows[0]["avg_score"] == round(avg)
+
+    def test_best_and_backup_per_day(self, client: TestClient) -> None:
+        body = client.get(f"{WINDOWS}&min_score=0").json()
+        assert set(body["modes"]) == {"swim_solo", "swim_dog", "run_solo", "run_dog"}
+        for mode in body["modes"].values():
+            for day in mode["days"]:
+                assert day["best"]["avg_score"] >= (day["backup"] or day["best"])["avg_score"]
+
+    def test_min_minutes_rounds_up_to_hours(self, client: TestClient) -> None:
+        body = client.get(f"{WINDOWS}&min_score=0&min_minutes=90").json()
+        for mode in body["modes"].values():
+            assert all(w["duration_minutes"] >= 120 for w in mode["windows"])
+
+    def test_response_is_small(self, client: TestClient) -> None:
+        resp = client.get(f"{WINDOWS}&modes=swim_solo")
+        assert len(resp.content) < 4096
+
+    def test_validation(self, client: TestClient) -> None:
+        assert client.get("/v1/public/windows").status_code == 400
+        assert client.get(f"{WINDOWS}&modes=kite").status_code == 400
+        assert client.get(f"{WINDOWS}&min_minutes=30").status_code == 422
+        assert client.get("/v1/public/windows?area_id=haifa").status_code == 404
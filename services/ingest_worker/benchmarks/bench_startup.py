@@ -0,0 +1,102 @@
+"""Startup benchmark for the ingest worker: spawn to first probe response.
+
+Launches ``python main.py`` on a free port ``--runs`` times and reports how
+long it takes until ``GET /`` (the liveness probe) answers 200. Nothing here
+needs GCP credentials: the BigQuery, Cloud Storage and Firestore SDKs are only
+imported when an ingest run uses them.
+
+``--imports`` runs ``python -X importtime -c "import main"`` and prints the
+slowest modules by cumulative time and the self time per top-level package.
+
+Usage (from services/ingest_worker):
+
+    uv run python -m benchmarks.bench_startup
+    uv run python -m benchmarks.bench_startup --imports
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def time_to_probe(timeout_s: float) -> float:
+    """Seconds from spawning the worker until its probe returns 200."""
+    port = _free_port()
+    env = {**os.environ, "PORT": str(port), "LOG_LEVEL": "ERROR"}
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "main.py"], env=env)
+    try:
+        while time.perf_counter() - started < timeout_s:
+            if proc.poll() is not None:
+                raise RuntimeError(f"worker exited with {proc.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                pass
+            time.sleep(0.005)
+        raise TimeoutError(f"probe not ready after {timeout_s}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def print_import_profile(top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    packages: Counter[str] = Counter()
+    for name, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    print(f"import main: {sum(r[1] for r in rows) / 1000:.1f} ms total")
+    print(f"\nslowest modules (cumulative), top {top}:")
+    for name, _, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+    print(f"\nself time per top-level package, top {top}:")
+    for name, self_us in packages.most_common(top):
+        print(f"  {self_us / 1000:>8.1f} ms  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--imports", action="store_true", help="profile import-time cost")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    if args.imports:
+        print_import_profile(args.top)
+        return
+
+    ms = sorted(time_to_probe(args.timeout) * 1000 for _ in range(args.runs))
+    print(f"process start -> first 200 on / ({args.runs} runs)")
+    print(f"  min {ms[0]:.0f} ms, median {statistics.median(ms):.0f} ms, max {ms[-1]:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
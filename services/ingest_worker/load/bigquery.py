@@ -1,12 +1,14 @@
-"""Load normalized rows and ingest run records to BigQuery."""
+"""Load normalized rows and ingest run records to BigQuery.
+
+The Google Cloud SDKs are imported inside the functions that use them, so the
+worker starts (and answers its startup probe) without paying for them.
+"""
 
 from __future__ import annotations
 
 import logging
 from datetime import datetime
 
-from google.cloud import bigquery
-
 from provider.base import NormalizedHourlyRow
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,8 @@ def load_hourly_to_bq(
     provider: str = "open_meteo",
 ) -> None:
     """Insert normalized hourly rows into hourly_forecast_v1."""
+    from google.cloud import bigquery
+
     client = bigquery.Client()
     table_id = f"{client.project}.{dataset}.hourly_forecast_v1"
 
@@ -74,6 +78,8 @@ def write_ingest_run(
     provider: str = "open_meteo",
 ) -> None:
     """Write a row to ingest_runs_v1."""
+    from google.cloud import bigquery
+
     client = bigquery.Client()
     table_id = f"{client.project}.{dataset}.ingest_runs_v1"
 
@@ -109,6 +115,8 @@ def check_idempotency(dataset: str, area_id: str, hour_bucket_utc: str) -> bool:
 
     Returns True if a successful run exists (should skip).
     """
+    from google.cloud import bigquery
+
     client = bigquery.Client()
     query = f"""
         SELECT COUNT(*) as cnt
@@ -1,12 +1,15 @@
-"""Update Firestore serving doc for fast app reads."""
+"""Update Firestore serving docs for fast app reads.
+
+``forecasts/{area_id}`` holds the full horizon. ``health/{area_id}`` is a
+small summary of the same write, so health checks need not read every hour.
+The two documents are written in one batch, so they always agree.
+"""
 
 from __future__ import annotations
 
 import logging
 from datetime import datetime
 
-from google.cloud import firestore
-
 from provider.base import DailySunRow, NormalizedHourlyRow
 
 logger = logging.getLogger(__name__)
@@ -21,7 +24,7 @@ def update_serving_doc(
     horizon_days: int = 7,
     daily_sun: list[DailySunRow] | None = None,
 ) -> None:
-    """Overwrite the forecasts/{area_id} doc in Firestore with latest data."""
+    """Overwrite the forecasts/{area_id} and health/{area_id} docs with latest data."""
     if not rows:
         logger.warning(
             "storage_skip_empty",
@@ -29,6 +32,8 @@ def update_serving_doc(
         )
         return
 
+    from google.cloud import firestore
+
     client = firestore.Client()
 
     hours = [
@@ -59,18 +64,30 @@ def update_serving_doc(
         for row in (daily_sun or [])
     ]
 
-    doc_ref = client.collection("forecasts").document(area_id)
-    doc_ref.set(
+    updated_at_utc = fetched_at_utc.isoformat()
+    batch = client.batch()
+    batch.set(
+        client.collection("forecasts").document(area_id),
         {
             "area_id": area_id,
-            "updated_at_utc": fetched_at_utc.isoformat(),
+            "updated_at_utc": updated_at_utc,
             "provider": provider,
             "horizon_days": horizon_days,
             "ingest_status": ingest_status,
             "hours": hours,
             "daily": daily,
-        }
+        },
+    )
+    batch.set(
+        client.collection("health").document(area_id),
+        {
+            "area_id": area_id,
+            "updated_at_utc": updated_at_utc,
+            "ingest_status": ingest_status,
+            "hours_count": len(hours),
+        },
     )
+    batch.commit()
 
     logger.info(
         "storage_write_success",
@@ -6,8 +6,6 @@ import json
 import logging
 from datetime import datetime
 
-from google.cloud import storage
-
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +20,8 @@ def write_raw_to_gcs(
 
     Path pattern: raw/openmeteo/{endpoint}/area_id={area_id}/{YYYY}/{MM}/{DD}/{HH}/{run_id}.json
     """
+    from google.cloud import storage
+
     client = storage.Client()
     bucket = client.bucket(bucket_name)
 
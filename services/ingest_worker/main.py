@@ -184,6 +184,13 @@ async def run_ingest(area_id: str, horizon_days: int, force: bool = False) -> di
 class PubSubHandler(BaseHTTPRequestHandler):
     """HTTP handler for Pub/Sub push subscription messages."""
 
+    def do_GET(self) -> None:
+        """Liveness/startup probe; answers without touching any GCP service."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"status":"ok"}')
+
     def do_POST(self) -> None:
         content_length = int(self.headers.get("Content-Length", 0))
         body = self.rfile.read(content_length)
@@ -0,0 +1,86 @@
+"""Tests for the Firestore serving doc writer."""
+
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from google.cloud import firestore
+
+from load.firestore_serving import update_serving_doc
+from tests.conftest import make_hourly_row
+
+
+class FakeDocumentRef:
+    def __init__(self, client: "FakeClient", path: str) -> None:
+        self._client = client
+        self.path = path
+
+    def set(self, data: dict[str, Any], **kwargs: Any) -> None:
+        self._client.direct_writes.append(self.path)
+
+
+class FakeCollection:
+    def __init__(self, client: "FakeClient", name: str) -> None:
+        self._client = client
+        self._name = name
+
+    def document(self, doc_id: str) -> FakeDocumentRef:
+        return FakeDocumentRef(self._client, f"{self._name}/{doc_id}")
+
+
+class FakeBatch:
+    def __init__(self) -> None:
+        self.writes: dict[str, dict[str, Any]] = {}
+        self.commits = 0
+
+    def set(self, ref: FakeDocumentRef, data: dict[str, Any], **kwargs: Any) -> None:
+        self.writes[ref.path] = data
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+class FakeClient:
+    """Records batched and direct document writes."""
+
+    def __init__(self) -> None:
+        self.batches: list[FakeBatch] = []
+        self.direct_writes: list[str] = []
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def batch(self) -> FakeBatch:
+        self.batches.append(FakeBatch())
+        return self.batches[-1]
+
+
+@pytest.fixture
+def fake_client(monkeypatch: pytest.MonkeyPatch) -> FakeClient:
+    client = FakeClient()
+    monkeypatch.setattr(firestore, "Client", lambda: client)
+    return client
+
+
+class TestUpdateServingDoc:
+    def test_serving_and_health_docs_in_one_batch(self, fake_client: FakeClient) -> None:
+        fetched_at = datetime(2025, 6, 1, 0, 5, tzinfo=UTC)
+        rows = [make_hourly_row(hour=h) for h in range(3)]
+
+        update_serving_doc("tel_aviv_coast", rows, fetched_at, ingest_status="success")
+
+        assert fake_client.direct_writes == []
+        assert len(fake_client.batches) == 1
+        batch = fake_client.batches[0]
+        assert batch.commits == 1
+        assert set(batch.writes) == {"forecasts/tel_aviv_coast", "health/tel_aviv_coast"}
+        forecast = batch.writes["forecasts/tel_aviv_coast"]
+        health = batch.writes["health/tel_aviv_coast"]
+        assert forecast["updated_at_utc"] == health["updated_at_utc"] == fetched_at.isoformat()
+        assert health["ingest_status"] == forecast["ingest_status"] == "success"
+        assert health["hours_count"] == len(forecast["hours"]) == 3
+
+    def test_no_rows_writes_nothing(self, fake_client: FakeClient) -> None:
+        update_serving_doc("tel_aviv_coast", [], datetime.now(UTC), ingest_status="failed")
+        assert fake_client.batches == []
+        assert fake_client.direct_writes == []
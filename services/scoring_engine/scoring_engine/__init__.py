@@ -1,6 +1,16 @@
 """Go Now scoring engine - computes activity scores from forecast data."""
 
-from scoring_engine.engine import score_hour
+from scoring_engine.engine import MODES, score_hour, score_modes
+from scoring_engine.solar import Location, SolarTable, solar_tables
 from scoring_engine.thresholds import BALANCED_THRESHOLDS, Thresholds
 
-__all__ = ["score_hour", "BALANCED_THRESHOLDS", "Thresholds"]
+__all__ = [
+    "score_hour",
+    "score_modes",
+    "MODES",
+    "BALANCED_THRESHOLDS",
+    "Thresholds",
+    "Location",
+    "SolarTable",
+    "solar_tables",
+]
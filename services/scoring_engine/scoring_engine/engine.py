@@ -16,6 +16,9 @@ from scoring_engine.thresholds import BALANCED_THRESHOLDS, Thresholds
 # Factor priority for tie-breaking (higher index = lower priority)
 FACTOR_PRIORITY = ["rain", "heat", "waves", "uv", "aqi", "wind", "cold"]
 
+MODES = ("swim_solo", "swim_dog", "run_solo", "run_dog")
+MAX_CHIPS = 5
+
 
 @dataclass
 class ReasonChip:
@@ -224,7 +227,7 @@ def _build_reason_chips(
             if not any(c.factor == factor for c in chips):
                 chips.append(ReasonChip(factor=factor, text=text, emoji="check", penalty=0))
 
-    return chips[:5]
+    return chips[:MAX_CHIPS]
 
 
 def _select_positive_chip(
@@ -532,6 +535,23 @@ def _score_run_dog(hour: HourData, t: Thresholds) -> ModeScore:
     return ModeScore(score=score, label=label, reasons=reasons, hard_gated=False)
 
 
+_MODE_SCORERS = {
+    "swim_solo": _score_swim_solo,
+    "swim_dog": _score_swim_dog,
+    "run_solo": _score_run_solo,
+    "run_dog": _score_run_dog,
+}
+
+
+def score_modes(
+    hour: HourData,
+    thresholds: Thresholds | None = None,
+) -> dict[str, ModeScore]:
+    """Score a single hour for all 4 activity modes, keyed by mode name."""
+    t = thresholds or BALANCED_THRESHOLDS
+    return {mode: scorer(hour, t) for mode, scorer in _MODE_SCORERS.items()}
+
+
 def score_hour(
     hour: HourData,
     thresholds: Thresholds | None = None,
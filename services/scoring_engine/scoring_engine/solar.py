@@ -0,0 +1,167 @@
+"""Sunrise and sunset times from the NOAA solar calculator equations.
+
+Implements the equations of the NOAA Global Monitoring Laboratory solar
+calculator (after Meeus, "Astronomical Algorithms"). Sunrise and sunset are
+the moments the sun's upper limb crosses the horizon, with standard
+refraction (zenith 90.833 degrees). This is the same definition Open-Meteo
+uses for its daily ``sunrise``/``sunset``, and the two agree to within a
+minute or so at our latitudes.
+
+Tables are computed for many dates and locations at once. The date-dependent
+solar terms (declination, equation of time) are evaluated once per date and
+shared by every location. Each event is then refined once with the terms at
+its own time. A ``SolarTable`` holds a contiguous range of dates for one
+location and answers lookups by array index.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+
+# Zenith of the sun's centre at sunrise/sunset: 90 deg + 50 arcmin of refraction and radius.
+SUNRISE_ZENITH_DEG = 90.833
+
+_J2000 = 2451545.0
+_UNIX_EPOCH_JD = 2440587.5
+
+SunTimes = tuple[datetime | None, datetime | None]
+
+
+@dataclass(frozen=True)
+class Location:
+    lat: float
+    lon: float  # degrees east
+
+
+def _julian_day(d: date, minutes_utc: float) -> float:
+    epoch_days = (d - date(1970, 1, 1)).days
+    return _UNIX_EPOCH_JD + epoch_days + minutes_utc / 1440.0
+
+
+def _solar_terms(jd: float) -> tuple[float, float]:
+    """(declination in radians, equation of time in minutes) at Julian day ``jd``."""
+    t = (jd - _J2000) / 36525.0
+    mean_long = math.radians((280.46646 + t * (36000.76983 + t * 0.0003032)) % 360.0)
+    mean_anom = math.radians(357.52911 + t * (35999.05029 - 0.0001537 * t))
+    ecc = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+    center = (
+        math.sin(mean_anom) * (1.914602 - t * (0.004817 + 0.000014 * t))
+        + math.sin(2 * mean_anom) * (0.019993 - 0.000101 * t)
+        + math.sin(3 * mean_anom) * 0.000289
+    )
+    omega = math.radians(125.04 - 1934.136 * t)
+    app_long = math.radians(
+        math.degrees(mean_long) + center - 0.00569 - 0.00478 * math.sin(omega)
+    )
+    mean_obliq = (
+        23.0
+        + (26.0 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60.0) / 60.0
+    )
+    obliq = math.radians(mean_obliq + 0.00256 * math.cos(omega))
+    declination = math.asin(math.sin(obliq) * math.sin(app_long))
+    y = math.tan(obliq / 2) ** 2
+    eq_time = 4.0 * math.degrees(
+        y * math.sin(2 * mean_long)
+        - 2 * ecc * math.sin(mean_anom)
+        + 4 * ecc * y * math.sin(mean_anom) * math.cos(2 * mean_long)
+        - 0.5 * y * y * math.sin(4 * mean_long)
+        - 1.25 * ecc * ecc * math.sin(2 * mean_anom)
+    )
+    return declination, eq_time
+
+
+def _event_minutes(
+    lat_rad: float, lon: float, declination: float, eq_time: float, sign: int
+) -> float | None:
+    """Minutes after 00:00 UTC of sunrise (``sign=-1``) or sunset (``+1``); None if none."""
+    cos_ha = math.cos(math.radians(SUNRISE_ZENITH_DEG)) / (
+        math.cos(lat_rad) * math.cos(declination)
+    ) - math.tan(lat_rad) * math.tan(declination)
+    if not -1.0 <= cos_ha <= 1.0:
+        return None  # polar day or night
+    hour_angle = math.degrees(math.acos(cos_ha))
+    return 720.0 - 4.0 * lon - eq_time + sign * 4.0 * hour_angle
+
+
+def _to_datetime(d: date, minutes: float | None) -> datetime | None:
+    if minutes is None:
+        return None
+    midnight = datetime(d.year, d.month, d.day, tzinfo=UTC)
+    return midnight + timedelta(seconds=round(minutes * 60))
+
+
+def sun_times(
+    locations: Mapping[str, Location], dates: Sequence[date]
+) -> dict[str, list[SunTimes]]:
+    """(sunrise, sunset) in UTC for every location and date, as parallel lists per key."""
+    noon_terms = [_solar_terms(_julian_day(d, 720.0)) for d in dates]
+    result: dict[str, list[SunTimes]] = {}
+    for key, loc in locations.items():
+        lat_rad = math.radians(loc.lat)
+        times: list[SunTimes] = []
+        for d, (declination, eq_time) in zip(dates, noon_terms):
+            events = []
+            for sign in (-1, 1):
+                minutes = _event_minutes(lat_rad, loc.lon, declination, eq_time, sign)
+                if minutes is not None:
+                    # Refine with the solar terms at the estimated event time.
+                    refined = _solar_terms(_julian_day(d, minutes))
+                    minutes = _event_minutes(lat_rad, loc.lon, *refined, sign)
+                events.append(_to_datetime(d, minutes))
+            times.append((events[0], events[1]))
+        result[key] = times
+    return result
+
+
+class SolarTable:
+    """Sunrise and sunset for one location over ``days`` consecutive dates from ``start``.
+
+    Dates outside the table are computed on demand, so a lookup never fails.
+    """
+
+    def __init__(
+        self,
+        location: Location,
+        start: date,
+        days: int,
+        times: list[SunTimes] | None = None,
+    ) -> None:
+        self.location = location
+        self.start = start
+        self._times = (
+            times
+            if times is not None
+            else sun_times({"": location}, _dates(start, days))[""]
+        )
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def get(self, d: date) -> SunTimes:
+        i = (d - self.start).days
+        if 0 <= i < len(self._times):
+            return self._times[i]
+        return sun_times({"": self.location}, [d])[""][0]
+
+    def sunrise(self, d: date) -> datetime | None:
+        return self.get(d)[0]
+
+    def sunset(self, d: date) -> datetime | None:
+        return self.get(d)[1]
+
+
+def _dates(start: date, days: int) -> list[date]:
+    return [start + timedelta(days=i) for i in range(days)]
+
+
+def solar_tables(
+    locations: Mapping[str, Location], start: date, days: int = 366
+) -> dict[str, SolarTable]:
+    """One ``SolarTable`` per location, all computed in a single pass over the dates."""
+    times = sun_times(locations, _dates(start, days))
+    return {
+        key: SolarTable(loc, start, days, times[key]) for key, loc in locations.items()
+    }
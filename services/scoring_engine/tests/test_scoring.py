@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 
 import pytest
 
-from scoring_engine.engine import HourData, score_hour, _linear_penalty
+from scoring_engine.engine import HourData, score_hour, score_modes, _linear_penalty
 from scoring_engine.thresholds import BALANCED_THRESHOLDS
 
 
@@ -374,3 +374,16 @@ class TestScoringVersion:
         assert result.scoring_version == "score_v2"
 
 
+class TestScoreModes:
+    """score_modes() returns the same mode scores as score_hour(), keyed by mode."""
+
+    def test_matches_score_hour(self) -> None:
+        for h in (
+            _perfect_hour(wave_height_m=0.8, feelslike_c=31.0, uv_index=7.0, eu_aqi=120),
+            _perfect_hour(precip_mm=5.0),
+        ):
+            full = score_hour(h)
+            result = score_modes(h)
+            assert list(result) == ["swim_solo", "swim_dog", "run_solo", "run_dog"]
+            for mode, ms in result.items():
+                assert ms == getattr(full, mode)